@@ -46,26 +46,31 @@ class NoneAI(object):
     calls when prompted.
 
     """
-    def __init__(self, gameScreen, playerID):
-        """ Create a new AI, attached to the game playing on gameScreen.
-        Constructor: NoneAI(MenuScreen, int)
+    def __init__(self, game, playerID, rng=None):
+        """ Create a new AI, attached to the given game.
+        Constructor: NoneAI(GameEngine, int, Random)
 
-        gameScreen is the screen containing this AI.
+        game is the GameEngine running the game this AI is playing in.
         playerID is the ID of the player who this AI represents.
+        rng is the random.Random this AI makes its random choices with. If not
+        given, a new one is made with a random seed.
 
         """
-        self._gameScreen = gameScreen
+        if rng is None:
+            rng = random.Random()
+        self._rng = rng
+        self._game = game
         self._playerID = playerID
         self._updatePlayer()
 
     def _updatePlayer(self):
-        """ Reload the player info from the screen. Should be run before every
+        """ Reload the player info from the game. Should be run before every
         new check.
 
         _updatePlayer() -> None
 
         """
-        self._player = self._gameScreen.getPlayer(self._playerID)
+        self._player = self._game.getPlayer(self._playerID)
 
     def checkDiscard(self):
         """ Asks which tile should be discarded from the AI player's hand.
@@ -156,15 +161,16 @@ class GeoffAI(NoneAI):
     its hand. Essentially, imitates a blind idiot player.
 
     """
-    def __init__(self, gameScreen, playerID):
-        """ Create a new GeoffAI, attached to the game playing on gameScreen.
-        Constructor: GeoffAI(MenuScreen, int)
+    def __init__(self, game, playerID, rng=None):
+        """ Create a new GeoffAI, attached to the given game.
+        Constructor: GeoffAI(GameEngine, int, Random)
 
-        gameScreen is the screen containing this AI.
+        game is the GameEngine running the game this AI is playing in.
         playerID is the ID of the player who this AI represents.
+        rng is the random.Random this AI makes its random choices with.
 
         """
-        NoneAI.__init__(self, gameScreen, playerID)
+        NoneAI.__init__(self, game, playerID, rng)
 
     def checkDiscard(self):
         """ Asks which tile should be discarded from the AI player's hand.
@@ -175,7 +181,7 @@ class GeoffAI(NoneAI):
         """
         self._updatePlayer()
         num = len(self._player.getMutable())
-        dis = random.randint(0, num - 1)
+        dis = self._rng.randint(0, num - 1)
         return dis
 
     def checkPon(self, tile):
@@ -251,7 +257,7 @@ class GeoffAI(NoneAI):
         The returned integer refers to the index of the tile in the hand.
 
         """
-        dis = random.choice(poss)
+        dis = self._rng.choice(poss)
         return dis
 
 class HighHandAI(NoneAI):
@@ -261,15 +267,16 @@ class HighHandAI(NoneAI):
     many turns remaining.
 
     """
-    def __init__(self, gameScreen, playerID):
+    def __init__(self, game, playerID, rng=None):
         """ Create a new HighHandAI.
-        Constructor: HighHandAI(MenuScreen, int)
+        Constructor: HighHandAI(GameEngine, int, Random)
 
-        gameScreen is the screen containing this AI.
+        game is the GameEngine running the game this AI is playing in.
         playerID is the ID of the player who this AI represents.
+        rng is the random.Random this AI makes its random choices with.
 
         """
-        NoneAI.__init__(self, gameScreen, playerID)
+        NoneAI.__init__(self, game, playerID, rng)
 
     def _updateGoal(self):
         """ Updates the current goal suit that this AI is heading for, as well
@@ -284,7 +291,7 @@ class HighHandAI(NoneAI):
             if thisCount > self._curCount:
                 self._curSuit = x+1
                 self._curCount = thisCount
-        if self._gameScreen.getTilesRemaining() < 15:
+        if self._game.getTilesRemaining() < 15:
             self._allowCalling = True
         else:
             self._allowCalling = False
@@ -322,7 +329,7 @@ class HighHandAI(NoneAI):
         if choice == -1: #If there /still/ is no tile to discard
             #Discard whatever
             num = len(self._player.getMutable()) - len(honourTiles) - 1
-            dis = random.randint(0, num - 1)
+            dis = self._rng.randint(0, num - 1)
         else: #Otherwise, discard it
             dis = choice
         return dis
@@ -426,7 +433,7 @@ class HighHandAI(NoneAI):
             tile = self._player.getTileFromIndex(index)
             if tile.getSuitID() != self._curSuit:
                 return index
-        return random.choice(poss)
+        return self._rng.choice(poss)
 
 class AttackAI(NoneAI):
     """ AttackAI AI object. This AI always attempts to go for quick, cheap hands
@@ -434,15 +441,16 @@ class AttackAI(NoneAI):
     not check to see whether other player's discards.
 
     """
-    def __init__(self, gameScreen, playerID):
+    def __init__(self, game, playerID, rng=None):
         """ Create a new AttackAI.
-        Constructor: AttackAI(MenuScreen, int)
+        Constructor: AttackAI(GameEngine, int, Random)
 
-        gameScreen is the screen containing this AI.
+        game is the GameEngine running the game this AI is playing in.
         playerID is the ID of the player who this AI represents.
+        rng is the random.Random this AI makes its random choices with.
 
         """
-        NoneAI.__init__(self, gameScreen, playerID)
+        NoneAI.__init__(self, game, playerID, rng)
 
     def _updateGoal(self):
         """ Determines whether we're trying to go for toitoi or pinfu.
@@ -483,7 +491,7 @@ class AttackAI(NoneAI):
                 curSetItem = setItem
                 break
         if curSetItem: #If there is a straggler tile
-            curTile = random.choice(curSetItem)
+            curTile = self._rng.choice(curSetItem)
             choice = self._player.getIndexFromTile(curTile)[0]
         elif self._curGoal == 'toitoi': #If toitoi, get rid of the first single
             for i, tile in enumerate(playerMutable):
@@ -494,7 +502,7 @@ class AttackAI(NoneAI):
         #If there /still/ is no tile to discard
         if choice == -1: #Just discard anything
             num = len(playerMutable) - 1
-            dis = random.randint(0, num - 1)
+            dis = self._rng.randint(0, num - 1)
         else: #Otherwise, discard our choice
             dis = choice
         return dis
@@ -582,15 +590,16 @@ class DefendAI(NoneAI):
     circumstances.
 
     """
-    def __init__(self, gameScreen, playerID):
+    def __init__(self, game, playerID, rng=None):
         """ Create a new DefendAI.
-        Constructor: DefendAI(MenuScreen, int)
+        Constructor: DefendAI(GameEngine, int, Random)
 
-        gameScreen is the screen containing this AI.
+        game is the GameEngine running the game this AI is playing in.
         playerID is the ID of the player who this AI represents.
+        rng is the random.Random this AI makes its random choices with.
 
         """
-        NoneAI.__init__(self, gameScreen, playerID)
+        NoneAI.__init__(self, game, playerID, rng)
 
     def _updateGoodList(self):
         """ Determines a list of what tiles we can discard, from most to least
@@ -605,18 +614,19 @@ class DefendAI(NoneAI):
         goodList5 = []
         goodList6 = []
 
-        #First, get a collection of all discard piles and called melds.
-        allDiscards = self._gameScreen.getAllDiscards()
-        allMelds = self._gameScreen.getAllMelds()
-        allVisible = allDiscards + allMelds
-        safeWinds = self._gameScreen.getNonRoundWinds()
-        roundWind = self._gameScreen.getRoundWind()
+        #First, get the counts of the tiles in the discard piles and called
+        #melds, and which tiles are in someone's discard pile.
+        visibleTiles = self._game.getVisibleTiles()
+        discardsMask = self._game.getAllDiscardsMask()
+        safeWinds = self._game.getNonRoundWinds()
+        roundWind = self._game.getRoundWind()
 
         for i, tile in enumerate(self._player.getMutable()):
+            index = tile.getIndex()
             #This is done in the order which saves the most processing time.
             #A tile in our hand is good if:
             #Best - There are 3 of it in the discard pile and called melds.
-            if allVisible.count(tile) >= 3:
+            if visibleTiles.getTableCount(index) >= 3:
                 goodList1.append(i)
                 continue
             #Second Best - It is a non-round wind.
@@ -624,7 +634,7 @@ class DefendAI(NoneAI):
                 goodList2.append(i)
                 continue
             #Third Best- It is in someone's discard pile.
-            if tile in allDiscards:
+            if discardsMask >> index & 1:
                 goodList3.append(i)
                 continue
             #Fourth Best - It is a terminal.
@@ -638,7 +648,7 @@ class DefendAI(NoneAI):
             #Second Worst - It is anything else.
             goodList5.append(i)
 
-        random.shuffle(goodList5) #Shuffle this to do it randomly.
+        self._rng.shuffle(goodList5) #Shuffle this to do it randomly.
 
         self._goodList = (goodList1 + goodList2 + goodList3 + goodList4 +
                           goodList5 + goodList6)
@@ -0,0 +1,1630 @@
+################################################################################
+# Copyright (c) 2013, Sean Manson.
+# Part of CSSE1001 Major Project (Assignment 3).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met: 
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer. 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution. 
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" gameEngine.py:
+Contains the GameEngine, which runs a game of mahjong by the rules without
+drawing anything or waiting on anything but the user. It goes through the same
+stages as a game on the GameScreen: starting rounds, breaking the wall, calls,
+riichi, kans, ron/tsumo, ending rounds and scoring. It can either be stepped
+through one stage at a time by a screen showing the game, or run through as
+fast as possible.
+
+"""
+
+#Import major libraries
+import os.path
+import random
+
+#Import other mahjong modules
+import mahjongGlobals
+import AI
+from mahjong_rulebase import *
+
+#Options that the user can be offered on another player's discard
+CALLOPTIONS = ['ron', 'kan', 'pon', 'chi']
+ROUNDSEEDBITS = 32 #Size of the seed each round is played from
+
+class GameEngine(object):
+    """ A whole game of mahjong, played by the rules.
+    Everything that happens in the game is sent on to any listeners as an
+    event, so that a screen can show it as it likes.
+
+    Events are given as listener(eventType, eventInfo), with eventType being
+    one of:
+        'roundname' - The name of a round about to start.
+        'dice' - The two dice, after they have been rolled.
+        'dealer' - The ID of the dealer, once picked.
+        'wallbreak' - The wall, after it has been broken.
+        'drawtiles' - None, after each lot of starting tiles are drawn.
+        'draw' - (playerID, Tile) for a draw from the wall.
+        'deadwalldraw' - (playerID, Tile) for a draw from the dead wall.
+        'discardchoice' - (playerID, tile index) for a tile an AI is about
+                          to discard.
+        'discard' - (playerID, Tile) for a discarded tile.
+        'pon', 'chi', 'kan', 'kan_cl', 'kan_la' - (playerID, Tile) for a
+                                                  call.
+        'riichi' - The ID of a player declaring riichi.
+        'tsumo' - The ID of the winning player.
+        'ron' - (playerID, stolenID) for a ron.
+        'drawgame' - The type of draw the round ended in.
+        'options' - (playerID, list of strings) for options offered to the
+                    user.
+        'response' - (name of a user response function, tuple of the
+                     arguments it was given) for each response from the user.
+        'roundseed' - The seed of the round about to start, once everything
+                      random has been seeded from it.
+        'roundend' - The round info, as given to the round end dialog.
+        'gameend' - (winning player, list of players, score table).
+
+    """
+    def __init__(self, playerNames, aiNames, startingScore, isJustEastRound,
+            loadData=False, seed=None):
+        """ Create a new GameEngine.
+        Constructor: GameEngine(list, list, int, Boolean, Boolean, int)
+
+        playerNames is a list of the names of the four players.
+        aiNames is a list of which AI from AILIST plays each player, with None
+        for the user. There can be at most one user.
+        startingScore is the score that each player starts with.
+        isJustEastRound is whether the game is just the East round or both
+        East and South.
+        loadData is whether to load the saved game instead, or a snapshot
+        string to load the game from, in which case the other values are
+        ignored.
+        seed is the seed for everything random in the game: the dice, the walls
+        and the AI. Games with the same seed and players play out the same.
+
+        """
+        self._rng = random.Random(seed)
+        self._loadSettings()
+        self._listeners = []
+        self._viewInfo = {} #Extra info saved on behalf of the screen
+        self._userOptions = [] #Options the user is being offered
+        self._chiChoices = [] #Possible chi that the user could call
+        self._chiTiles = [] #Which tiles the user chose to chi with
+        self._pendingDiscard = None #AI discard waiting to be finished
+
+        if isinstance(loadData, str):
+            self.loadSnapshot(loadData)
+        elif loadData:
+            self.loadGame()
+        else:
+            self._playerNames = list(playerNames)
+            self._aiNames = list(aiNames)
+            self._startingScore = startingScore
+            self._isJustEastRound = isJustEastRound
+
+            #Other starting values
+            self._curStage = 'roundstart1'
+            self._curRound = ('East', 1, 0)
+            self._riichiStore = 0 #Holds leftover riichi from previous rounds
+            self._bonusStore = 0 #Holds leftover bonus sticks from prev. rounds
+            self._curDealer = 0 #Current dealer
+            self._winTable = [[], [], [], [], []]
+                #Table of scores for the game over screen
+
+            #Players
+                #The index here goes anticlockwise around the game board
+            self._players = []
+            for name in self._playerNames:
+                self._players.append(PlayerScore(self._handsize,
+                    self._suitnum, self._totalsuitnum, name,
+                    self._startingScore))
+            self._callIndex = CallIndex(self._players)
+            self._loadAI()
+
+            #Setup the round begin variables
+            self._resetVars()
+            self._newRoundSeed()
+
+    def _loadSettings(self):
+        """ Load the game settings and special yaku.
+
+        _loadSettings() -> None
+
+        """
+        settingsLoad = IOHelper(mahjongGlobals.GAMESETTINGSLOC,
+            mahjongGlobals.DELIMITER, mahjongGlobals.COMMENTIND)
+        self._handsize = int(settingsLoad.getRowByOneID('handsize')[1])
+        self._suitnum = int(settingsLoad.getRowByOneID('suitnum')[1])
+        self._totalsuitnum = int(settingsLoad.getRowByOneID('totalsuitnum')[1])
+        self._repeat = int(settingsLoad.getRowByOneID('repeat')[1])
+        self._tileFile = settingsLoad.getRowByOneID('tilefile')[1]
+        self._yakuFile = settingsLoad.getRowByOneID('yakufile')[1]
+
+        #Load all yaku
+        self._yakuRinshan = Yaku('rinshan', self._yakuFile)
+        self._yakuHaitei = Yaku('haitei', self._yakuFile)
+        self._yakuHoutei = Yaku('houtei', self._yakuFile)
+
+    def _loadAI(self):
+        """ Make the AI for every player not played by the user.
+
+        _loadAI() -> None
+
+        """
+        self._ai = []
+        self._aiRngs = [] #Reseeded at the start of every round
+        self._userID = None
+        for playerID, aiName in enumerate(self._aiNames):
+            if aiName is None:
+                if self._userID is not None:
+                    raise GameRunningException('Only one user can play')
+                self._userID = playerID
+                self._ai.append(None)
+            elif aiName in mahjongGlobals.AILIST:
+                aiRng = random.Random(self._rng.getrandbits(32))
+                self._ai.append(getattr(AI, aiName)(self, playerID, aiRng))
+                self._aiRngs.append(aiRng)
+            else:
+                raise GameRunningException('Unknown AI ' + repr(aiName))
+
+    #EVENT FUNCTIONS
+    def addListener(self, listener):
+        """ Adds a function to be told about every event in the game.
+
+        addListener(function) -> None
+
+        listener is called as listener(eventType, eventInfo).
+
+        """
+        self._listeners.append(listener)
+
+    def removeListener(self, listener):
+        """ Stops telling the given function about events. """
+        self._listeners.remove(listener)
+
+    def _sendEvent(self, eventType, eventInfo=None):
+        """ Tells every listener about an event.
+
+        _sendEvent(string, object) -> None
+
+        """
+        for listener in list(self._listeners):
+            #A copy, as listeners can remove themselves when told something
+            listener(eventType, eventInfo)
+
+    #ROUND LOGIC METHODS:
+    def step(self):
+        """ Runs the current stage of the game, moving on to the next one.
+        Does nothing while waiting on the user or once the game is over.
+
+        step() -> None
+
+        """
+        if self._curStage == 'roundstart1':
+            #Very first stage, roll dice and display name
+            self._sendEvent('roundname', self.getRoundName())
+            self._rollDice()
+            self._curStage = 'roundstart2'
+        elif self._curStage == 'roundstart2':
+            #Get dealer and player seating
+            self._roundStart2()
+            self._curStage = 'roundstart3'
+        elif self._curStage == 'roundstart3':
+            #Roll dice again
+            self._rollDice()
+            self._curStage = 'roundstart4'
+        elif self._curStage == 'roundstart4':
+            #Break the wall and set up the dora and dead wall
+            self._roundStart4()
+            self._curStage = 'drawtiles'
+        elif self._curStage == 'drawtiles':
+            #Do the beginning draw of 4 tiles each for all players
+            self._drawTiles()
+        elif self._curStage == 'turnstartcheck':
+            #Check to see whether the user can call on the last tile
+            self._curStage = 'turnstartcheck2'
+            self._turnStartCheck()
+        elif self._curStage == 'turnstartcheck2':
+            #Check to see who actually gets the tile, assuming that a player
+            #has called on it
+            self._turnStartCheck2('none')
+        elif self._curStage == 'turnstart':
+            #If it's in a drawing condition, draw; end the game
+            #Else, let the current player take a tile from the wall
+            self._turnStart()
+        elif self._curStage == 'turnmid':
+            #Check to see if they can tsumo/kan/riichi, or make them discard
+            self._turnMid()
+        elif self._curStage == 'discard':
+            #Finish off the discard an AI chose
+            self._discardEnd()
+            self._curStage = 'turnend'
+        elif self._curStage == 'turnend':
+            #Reset all the current turn flags, then rotate the players
+            self._turnEndReset()
+            self._curStage = 'turnstartcheck'
+        elif self._curStage == 'roundend':
+            #Work out the scores and get them ready to change
+            self._curStage = 'scorechange'
+            self._roundEnd()
+        elif self._curStage == 'scorechange':
+            #Apply whatever is left of the score changes
+            for player in self._players:
+                player.finScoreDiff()
+            self._curStage = 'roundfinalise'
+        elif self._curStage == 'roundfinalise':
+            #Go on to the next round, or end the game
+            self._roundFinalise()
+
+    def run(self):
+        """ Steps through the game until it is over or waiting on the user.
+
+        run() -> None
+
+        """
+        while not (self.isWaiting() or self.isGameOver()):
+            self.step()
+
+    def _newRoundSeed(self):
+        """ Picks the seed for the round about to start and seeds everything
+        random with it. Everything random in a round comes from its seed, so
+        a round can be played again from a snapshot taken at its start.
+
+        _newRoundSeed() -> None
+
+        """
+        self._roundSeed = self._rng.getrandbits(ROUNDSEEDBITS)
+        self._seedRound()
+        self._sendEvent('roundseed', self._roundSeed)
+
+    def _seedRound(self):
+        """ Seeds the game and AI random generators with the round seed.
+
+        _seedRound() -> None
+
+        """
+        self._rng.seed(self._roundSeed)
+        for aiRng in self._aiRngs:
+            aiRng.seed(self._rng.getrandbits(ROUNDSEEDBITS))
+
+    def restartRound(self, roundSeed, stage):
+        """ Puts a game loaded from a snapshot taken at the start of a round
+        back at that start, as it was when the given seed was picked.
+
+        restartRound(int, string) -> None
+
+        roundSeed is the seed of the round, as given by getRoundSeed().
+        stage is the stage the game was at when the snapshot was taken.
+
+        """
+        self._roundSeed = roundSeed
+        self._seedRound()
+        self._userOptions = []
+        self._curStage = stage
+
+    def _rollDice(self):
+        """ Rolls the two dice.
+
+        _rollDice() -> None
+
+        """
+        self._die1 = self._rng.randint(1, 6)
+        self._die2 = self._rng.randint(1, 6)
+        self._sendEvent('dice', (self._die1, self._die2))
+
+    def _roundStart2(self):
+        """ Find the dealer from the dice and allocate the seat winds.
+
+        _roundStart2() -> None
+
+        """
+        dealer = self._rng.randint(0, 3)
+        dealer = (dealer + self._die1 + self._die2)%4
+        self._curDealer = dealer
+        for i, player in enumerate(self._players):
+            player.setDealer(self._curDealer == i)
+        self._allocateSeatWinds(dealer)
+        self._sendEvent('dealer', dealer)
+
+    def _roundStart4(self):
+        """ Break the wall and set up the dora using the dice.
+
+        _roundStart4() -> None
+
+        """
+        diedist = self._die1 + self._die2
+        breakdist = (diedist)%4
+        self._curWall.setDealerBreak(diedist, breakdist)
+        self._visibleTiles.addIndicator(self._curWall.getDoraIndList()[-1])
+        self._sendEvent('wallbreak', self._curWall)
+
+    def _drawTiles(self):
+        """ Step-by-step function for drawing 4 tiles at a time at the beginning
+        of a round for each player.
+
+        _drawTiles() -> None
+
+        """
+        for x in range(4):
+            self._playerDraw(x)
+        self._sendEvent('drawtiles')
+        if self._handsize - self._players[3].getTileNum() < 3:
+            for y in range(4):
+                self._playerDraw(y)
+            self._playerTurn = self._curDealer
+            self._curStage = 'turnstart'
+
+    def _turnStartCheck(self):
+        """ Check to see whether the user can call on the last tile discarded in
+        any way, and if they can, wait for them to choose.
+
+        _turnStartCheck() -> None
+
+        """
+        userID = self._userID
+        if userID is None or userID == self._playerOrder(self._playerTurn)[-1]:
+            return #User can't call on the tile they just discarded
+        user = self._players[userID]
+        userBit = 1 << userID
+        ronners, kanners, ponners, chiers = self._callIndex.getCallers(
+            self._lastTile)
+        options = []
+        if (ronners & userBit and user.canRon(self._lastTile,
+                self.getRoundWind(), self._yakuFile,
+                self.getGameYaku(userID, 'ron'))): #If they can ron
+            options.append('ron')
+            if user.isRiichi():
+                #Needed, as they can't call chi/pon etc. after declaring riichi
+                self._waitForUser(options)
+                return
+        elif user.isRiichi(): #Riichi locks out other options
+            return
+        if kanners & userBit: #If they can kan
+            options.append('kan')
+        if ponners & userBit: #If they can pon
+            options.append('pon')
+        if self._playerTurn == userID:
+            #This is done to not waste processing time for the other players
+            self._chiChoices = []
+            if chiers & userBit:
+                self._chiChoices = user.canChi(self._lastTile)
+            if self._chiChoices: #If they can chi
+                options.append('chi')
+        if options:
+            self._waitForUser(options)
+
+    def _turnStartCheck2(self, playerChoice):
+        """ Goes through each non-discarding player in an anti-clockwise
+        direction and sees whether they want to call on the last tile, letting
+        pon override chi and similar; all the while taking into account the
+        choice of the user.
+
+        _turnStartCheck2(string) -> None
+
+        playerChoice is a string ('pon', or 'chi' etc) with what the user chose
+        to call, or 'none'.
+
+        """
+        orderedPlayers = self._playerOrder(self._playerTurn)
+        prevPlayer = orderedPlayers[-1]
+        curOrder = orderedPlayers[:-1]
+            #This is three elements long, ignoring the player that just went
+        if self._checkRon(curOrder, playerChoice, prevPlayer):
+            self._players[prevPlayer].removeDiscard()
+            return #If someone rons, don't bother about the rest anymore
+        elif self._checkKan(curOrder, playerChoice):
+            self._curStage = 'turnmid'
+        elif self._checkPon(curOrder, playerChoice):
+            self._curStage = 'turnmid'
+        elif self._checkChi(playerChoice):
+            self._curStage = 'turnmid'
+        else:
+            self._curStage = 'turnstart'
+        if self._curStage == 'turnmid':
+            self._players[prevPlayer].removeDiscard()
+
+    def _turnStart(self):
+        """ First checks to see whether the game is going to end in a draw. If
+        not, then makes the current player draw a tile.
+
+        _turnStart() -> None
+
+        """
+        allRiichi = True
+        for player in self._players:
+            if not player.isRiichi():
+                allRiichi = False
+        if self._curWall.getTilesRemaining() <= 0:
+            self._endRoundType = 'nomoretiles'
+        elif len(self._curWall.getDoraList()) >= 5:
+            self._endRoundType = 'fourkans'
+        elif allRiichi:
+            self._endRoundType = 'allriichi'
+        else:
+            self._playerDraw(self._playerTurn)
+            self._curStage = 'turnmid'
+            return
+        self._curStage = 'roundend'
+        self._sendEvent('drawgame', self._endRoundType)
+
+    def _turnMid(self):
+        """ Depending on what state the current player is in:
+            Check to see if they can tsumo/kan/riichi
+            If they decline or can't, make them discard if in riichi
+            Otherwise, if it's the user, wait for them to discard
+            Otherwise, get the AI's discard
+
+        _turnMid() -> None
+
+        """
+        if (self._tsumoCheck() or
+            self._lateKanCheck() or
+            self._closedKanCheck() or
+            self._riichiCheck()):
+            pass #Wait for next step
+        elif self._players[self._playerTurn].isRiichi():
+            self._riichiWaitCheck()
+        elif self._playerTurn == self._userID:
+            self._waitForUser(['discard'])
+        else:
+            toDiscard = self._ai[self._playerTurn].checkDiscard()
+            self._startDiscard(self._playerTurn, toDiscard, False)
+
+    def _riichiWaitCheck(self):
+        """ If a player is in riichi, there's no need to give them options to
+        discard or anything anymore. Either the tile they draw is part of their
+        waiting tiles list and they tsumo, or it's not and they discard it.
+
+        _riichiWaitCheck() -> None
+
+        """
+        curWait = self._players[self._playerTurn].getRiichiWait()
+        curMutable = self._players[self._playerTurn].getMutable()
+        curLen = len(self._players[self._playerTurn].returnTiles())
+        if (curLen == self._handsize) and (curMutable[-1] in curWait):
+            #curMutable[-1] should be their last drawn tile
+            self._tsumo(self._playerTurn)
+        else:
+            self._startDiscard(self._playerTurn, -1, False)
+
+    def _turnEndReset(self):
+        """ Resets some of the starting turn flags, increments the turn counter
+        and then moves the players around anticlockwise.
+
+        _turnEndReset() -> None
+
+        """
+        self._optionsDeny = False
+        self._lastDrawWasDead = False
+        self._curTurn += 1
+        for player in self._players:
+            player.addRiichiTurns(1)
+        self._playerTurn += 1
+        if self._playerTurn > 3:
+            self._playerTurn = 0
+
+    def _roundEnd(self):
+        """ First, sees how exactly the current game is ending, and forms a
+        list of data to pass on about this. Then, find the scores for each
+        player and get ready to apply them, taking into account factors such as
+        dora, riichi, bonus sticks etc.
+
+        _roundEnd() -> None
+
+        """
+        roundInfo = [self._endRoundType]
+        if self._endRoundType == 'ron' or self._endRoundType == 'tsumo':
+            #If a player has won by ron or tsumo
+            winningPlayer = self._players[self._playerWon]
+            winningPlayer.addWin()
+            otherPlayers = self._playerOrder(self._playerWon)[1:]
+            winningPlayer.showHand()
+            if self._endRoundType == 'ron':
+                selfDrawn = False
+            else:
+                selfDrawn = True
+            gameYaku = self.getGameYaku(self._playerWon, self._endRoundType)
+            doraList = self.getDoraList(self._playerWon)
+            if winningPlayer.isRiichi():
+                uraList = self.getUraList(self._playerWon)
+            else:
+                uraList = []
+            bestArrange = winningPlayer.getBestArrange(self.getRoundWind(),
+                selfDrawn, self._yakuFile, gameYaku,
+                len(doraList) + len(uraList))
+            (handArrange, handFu, totalYaku, handResult) = bestArrange
+            (handScore, scoreWord) = handResult
+
+            #Append info about the scores and the round
+            if winningPlayer.isRiichi():
+                totalUraList = self._curWall.getUraList()
+            else:
+                totalUraList = []
+            roundInfo += [winningPlayer, handFu, totalYaku, len(doraList)
+                + len(uraList), self._curWall.getDoraList(), totalUraList,
+                handScore, scoreWord]
+
+            #Prepare the changes in scores
+            if self._endRoundType == 'ron':
+                if (self._playerWon == self._curDealer or
+                        self._playerLost == self._curDealer):
+                    curAmount = int(round(handScore*6,-2))
+                else:
+                    curAmount = int(round(handScore*4,-2))
+                winningPlayer.setScoreDiff(curAmount)
+                self._players[self._playerLost].setScoreDiff(-curAmount)
+            elif self._playerWon == self._curDealer:
+                for playerID in otherPlayers:
+                    player = self._players[playerID]
+                    player.setScoreDiff(int(round(-handScore*2,-2)))
+                winningPlayer.setScoreDiff(int(round(handScore*6,-2)))
+            else:
+                for playerID in otherPlayers:
+                    player = self._players[playerID]
+                    if playerID == self._playerWon:
+                        curAmount = int(round(-handScore*2,-2))
+                        self._players[playerID].setScoreDiff(curAmount)
+                    else:
+                        curAmount = int(round(-handScore,-2))
+                        self._players[playerID].setScoreDiff(curAmount)
+                winningPlayer.setScoreDiff(int(round(handScore*4,-2)))
+
+            #Riichi sticks
+            riichiBonus = self._riichiStore*1000
+            for player in self._players:
+                if player.isRiichi():
+                    riichiBonus += 1000
+            winningPlayer.addScoreDiff(riichiBonus)
+            self._riichiStore = 0
+
+            #Bonus Dealer ante
+            if self._playerWon == self._curDealer:
+                anteAmount = self._bonusStore + self._curRound[2]
+                for i, player in enumerate(self._players):
+                    if i != self._curDealer:
+                        player.addScoreDiff(-anteAmount*100)
+                    else:
+                        player.addScoreDiff(anteAmount*300)
+                self._bonusStore = 0
+            else:
+                self._players[self._curDealer].addScoreDiff(
+                    100*self._curRound[2])
+        else:
+            #Scores for the no more tiles draw
+            if self._endRoundType == 'nomoretiles':
+                tenpaiList = []
+                notList = []
+                for i, player in enumerate(self._players):
+                    uniqueTiles = self._curWall.getUnique()
+                    if player.isTenpai(uniqueTiles):
+                        player.showHand()
+                        tenpaiList.append(i)
+                    else:
+                        notList.append(i)
+                if tenpaiList and notList: #Nobody pays if everyone's tenpai
+                    curAmount1 = 3000/len(tenpaiList)
+                    curAmount2 = 3000/len(notList)
+                    for i in tenpaiList:
+                        self._players[i].setScoreDiff(curAmount1)
+                    for i in notList:
+                        self._players[i].setScoreDiff(-curAmount2)
+            riichiCount = 0
+            for player in self._players:
+                if player.isRiichi():
+                    riichiCount += 1
+            self._riichiStore += riichiCount
+            self._bonusStore += self._curRound[2]
+
+        #Update the winning table scores
+        self._winTable[0].append(self.getRoundName())
+        self._winTable[0].append('(+- change)')
+        for i, player in enumerate(self._players):
+            self._winTable[i+1].append(player.getScore())
+            self._winTable[i+1].append(player.getScoreDiff())
+        self._sendEvent('roundend', roundInfo)
+
+    def _roundFinalise(self):
+        """ Increments the rounds, and checks to see whether the game should end
+        yet. If not, resets all the variables necessary and gets it all ready
+        to rumble. If so, runs _gameEnd().
+
+        _roundFinalise() -> None
+
+        """
+        for player in self._players: #If a player goes below 0, end the game
+            if player.getScore() < 0:
+                self._gameEnd()
+                return
+        if self._playerWon != self._curDealer:
+            if not self._incrRound(): #If we can't go to the next round, end
+                self._gameEnd()
+                return
+            self._curDealer += 1
+            if self._curDealer > 3:
+                self._curDealer = 0
+        else:
+            self._incrBonusRound() #Bonus rounds for dealers
+        for player in self._players:
+            player.resetPlayer() #Reset the player hands
+        for i, player in enumerate(self._players):
+            player.setDealer(self._curDealer == i)
+        self._allocateSeatWinds(self._curDealer)
+        self._resetVars()
+        self._sendEvent('roundname', self.getRoundName())
+        self._curStage = 'roundstart3'
+        self._newRoundSeed()
+
+    def _gameEnd(self):
+        """ Determines which player won, and ends the game.
+
+        _gameEnd() -> None
+
+        """
+        winningPlayer = None
+        winningScore = 0
+        self._winTable[0].append('Final Total')
+        for i, player in enumerate(self._players):
+            self._winTable[i+1].append(player.getScore())
+            if player.getScore() > winningScore:
+                winningPlayer = player
+                winningScore = player.getScore()
+        self._curStage = 'gameover'
+        self._sendEvent('gameend', (winningPlayer, self._players,
+            self._winTable))
+
+    #BEFORE TURN CHECKERS
+    def _checkRon(self, curOrder, playerChoice, prevPlayer):
+        """ Goes through each player in an anticlockwise direction and sees if
+        they want to ron the last tile, lets them do so and returns True if yes,
+        returning False if no.
+
+        _checkRon(list of integers, string, integer) -> Boolean
+
+        curOrder is a list containing the three playersID's to check in order.
+        playerChoice is a string containing what the user chose.
+        prevPlayer is the ID of the player who discarded the tile
+
+        """
+        ronners = self._callIndex.getCallers(self._lastTile)[0]
+        for playerID in curOrder: #RON CHECK
+            if not ronners & (1 << playerID):
+                continue #Only those waiting on the tile need asking
+            if self._players[playerID].canRon(self._lastTile,
+                    self.getRoundWind(), self._yakuFile,
+                    self.getGameYaku(self._playerTurn, 'ron')):
+                if playerID == self._userID:
+                    if playerChoice == 'ron':
+                        self._ron(playerID, prevPlayer)
+                        return True
+                elif self._ai[playerID].checkRon(self._lastTile):
+                    self._ron(playerID, prevPlayer)
+                    return True
+        return False
+
+    def _checkKan(self, curOrder, playerChoice):
+        """ Goes through each player in an anticlockwise direction and sees if
+        they want to kan the last tile, lets them do so and returns True if yes,
+        returning False if no.
+
+        _checkKan(list of integers, string) -> Boolean
+
+        curOrder is a list containing the three playersID's to check in order.
+        playerChoice is a string containing what the user chose.
+
+        """
+        kanners = self._callIndex.getCallers(self._lastTile)[1]
+        for playerID in curOrder: #KAN CHECK
+            if self._players[playerID].isRiichi():
+                return False
+            if kanners & (1 << playerID):
+                if playerID == self._userID:
+                    if playerChoice == 'kan':
+                        self._kan(playerID)
+                        return True
+                elif self._ai[playerID].checkKanOpen(self._lastTile):
+                    self._kan(playerID)
+                    return True
+        return False
+
+    def _checkPon(self, curOrder, playerChoice):
+        """ Goes through each player in an anticlockwise direction and sees if
+        they want to pon the last tile, lets them do so and returns True if yes,
+        returning False if no.
+
+        _checkPon(list of integers, string) -> Boolean
+
+        curOrder is a list containing the three playersID's to check in order.
+        playerChoice is a string containing what the user chose.
+
+        """
+        ponners = self._callIndex.getCallers(self._lastTile)[2]
+        for playerID in curOrder: #PON CHECK
+            if self._players[playerID].isRiichi():
+                return False
+            if ponners & (1 << playerID):
+                if playerID == self._userID:
+                    if playerChoice == 'pon':
+                        self._pon(playerID)
+                        return True
+                elif self._ai[playerID].checkPon(self._lastTile):
+                    self._pon(playerID)
+                    return True
+        return False
+
+    def _checkChi(self, playerChoice):
+        """ Asks the current player if they want to chi the last tile, lets them
+        do so and returns True if yes, returning False if no.
+        If the user is the current player, then it takes their choice of tiles
+        into account.
+
+        _checkChi(string) -> Boolean
+
+        playerChoice is a string containing what the user chose.
+
+        """
+        playerID = self._playerTurn
+        if self._players[playerID].isRiichi():
+            return False
+        if playerID == self._userID:
+            if playerChoice == 'chi':
+                self._chi(playerID, self._chiTiles)
+                return True
+        elif self._callIndex.canCall(self._lastTile, playerID, 'chi'):
+            choices = self._players[playerID].canChi(self._lastTile)
+            if choices: #If they can call chi
+                aiChoices = self._ai[playerID].checkChi(self._lastTile,
+                    choices)
+                if aiChoices: #If they will call chi
+                    self._chi(playerID, aiChoices)
+                    return True
+        return False
+
+    #DURING TURN CHECKERS
+    def _tsumoCheck(self):
+        """ Asks the current player if they want to tsumo, lets them do so and
+        returns True if yes, returning False if no.
+
+        _tsumoCheck() -> Boolean
+
+        """
+        if self._optionsDeny: #If they chose 'cancel' this turn
+            return False
+        if self._players[self._playerTurn].canTsumo(self.getRoundWind(),
+                self._yakuFile, self.getGameYaku(self._playerTurn, 'tsumo')):
+            if self._playerTurn == self._userID:
+                self._waitForUser(['tsumo'])
+            else: #If this is an AI player
+                if self._ai[self._playerTurn].checkTsumo():
+                    self._tsumo(self._playerTurn)
+                else:
+                    return False
+            return True
+        else:
+            return False
+
+    def _lateKanCheck(self):
+        """ Asks the current player if they want to late kan, lets them do so
+        and returns True if yes, returning False if no.
+
+        _lateKanCheck() -> Boolean
+
+        """
+        if self._players[self._playerTurn].isRiichi(): #Can't kan with riichi
+            return False
+        if self._optionsDeny: #If they chose 'cancel' this turn
+            return False
+        kanTile = self._players[self._playerTurn].canKan_la()
+        if kanTile: #If we can late kan
+            if self._playerTurn == self._userID:
+                self._waitForUser(['kan_la'])
+            else: #If this is an AI player
+                if self._ai[self._playerTurn].checkKanLate(kanTile):
+                    self._kan_la(self._playerTurn)
+                else:
+                    return False
+            return True
+        else:
+            return False
+
+    def _closedKanCheck(self):
+        """ Asks the current player if they want to closed kan, lets them do so
+        and returns True if yes, returning False if no.
+
+        _closedKanCheck() -> Boolean
+
+        """
+        if self._players[self._playerTurn].isRiichi(): #Can't kan with riichi
+            return False
+        if self._optionsDeny: #If they chose 'cancel' this turn
+            return False
+        kanTile = self._players[self._playerTurn].canKan_cl()
+        if kanTile: #If we can closed kan
+            if self._playerTurn == self._userID:
+                self._waitForUser(['kan_cl'])
+            else: #If this is an AI player
+                if self._ai[self._playerTurn].checkKanClosed(kanTile):
+                    self._kan_cl(self._playerTurn)
+                else:
+                    return False
+            return True
+        else:
+            return False
+
+    def _riichiCheck(self):
+        """ Asks the current player if they want to riichi, lets them do so
+        and returns True if yes, returning False if no.
+
+        _riichiCheck() -> Boolean
+
+        """
+        if self._players[self._playerTurn].isRiichi(): #Obviously, can't riichi
+            return False
+        if self._optionsDeny: #If they chose 'cancel' this turn
+            return False
+        if not self._players[self._playerTurn].isClosed():
+            return False
+        uniqueTiles = self._curWall.getUnique()
+        if self._players[self._playerTurn].isTenpaiFull(uniqueTiles):
+            if self._playerTurn == self._userID:
+                self._waitForUser(['riichi'])
+            else: #If this is an AI player
+                curAI = self._ai[self._playerTurn]
+                if curAI.checkRiichi():
+                    self._riichiAI(self._playerTurn, curAI)
+                else:
+                    return False
+            return True
+        else:
+            return False
+
+    #GAMEPLAY FUNCTIONS
+    def _playerDraw(self, playerID):
+        """ Lets the given player draw from the wall.
+
+        _playerDraw(int) -> None
+
+        playerID is the ID of the player who should draw.
+
+        """
+        drawnTile = self._curWall.drawFromWall()
+        self._players[playerID].draw(drawnTile)
+        self._sendEvent('draw', (playerID, drawnTile))
+
+    def _startDiscard(self, playerID, tileID, isRiichi):
+        """ Gets ready to discard a tile an AI has chosen, which happens on the
+        next step. This gives a screen the chance to show which tile it is
+        first.
+
+        _startDiscard(int, int, Boolean) -> None
+
+        playerID is the ID of the player who should discard.
+        tileID is the index of the tile in the player's hand which should be
+        discarded.
+        isRiichi is whether the player declares riichi with this discard.
+
+        """
+        self._pendingDiscard = (playerID, tileID, isRiichi)
+        self._curStage = 'discard'
+        self._sendEvent('discardchoice', (playerID, tileID))
+
+    def _discardEnd(self):
+        """ Discards the tile chosen in _startDiscard, declaring riichi
+        afterwards if needed.
+
+        _discardEnd() -> None
+
+        """
+        (playerID, tileID, isRiichi) = self._pendingDiscard
+        self._pendingDiscard = None
+        self._playerDiscard(playerID, tileID)
+        if isRiichi:
+            uniqueTiles = self._curWall.getUnique()
+            self._players[playerID].riichi(uniqueTiles, self._isDouble())
+
+    def _playerDiscard(self, playerID, tileID):
+        """ Discards a given tile index from a given player's hand.
+
+        _playerDiscard(int, int) -> None
+
+        playerID is the ID of the player who should discard.
+        tileID is the index of the tile in the player's hand which should be
+        discarded.
+
+        """
+        curPlayer = self._players[playerID]
+        self._lastTile = curPlayer.discard(tileID)
+        self._visibleTiles.addTile(self._lastTile)
+        self._sendEvent('discard', (playerID, self._lastTile))
+
+    def _waitForUser(self, options):
+        """ Offers the user the given options, and waits for their response.
+
+        _waitForUser(list of strings) -> None
+
+        """
+        self._userOptions = options
+        self._curStage = 'playerresponse'
+        self._sendEvent('options', (self._userID, options))
+
+    #USER RESPONSES
+    def callLastTile(self, choice, chosenTiles=[]):
+        """ The user's response to being offered calls on the last discard.
+
+        callLastTile(string, list of tile indexes) -> None
+
+        choice is one of 'ron', 'kan', 'pon' or 'chi'.
+        chosenTiles is the tile indexes in the user's hand to chi with.
+
+        """
+        self._sendEvent('response', ('callLastTile', (choice, chosenTiles)))
+        self._userOptions = []
+        self._chiTiles = chosenTiles
+        self._turnStartCheck2(choice)
+
+    def takeOption(self, choice, tileID=None):
+        """ The user's response to being offered something on their turn.
+
+        takeOption(string, int) -> None
+
+        choice is one of 'tsumo', 'kan_cl', 'kan_la' or 'riichi'.
+        tileID is the index of the tile to discard when declaring riichi.
+
+        """
+        self._sendEvent('response', ('takeOption', (choice, tileID)))
+        self._userOptions = []
+        if choice == 'tsumo':
+            self._tsumo(self._userID)
+        elif choice == 'kan_cl':
+            self._kan_cl(self._userID)
+            self._curStage = 'turnmid'
+        elif choice == 'kan_la':
+            self._kan_la(self._userID)
+            self._curStage = 'turnmid'
+        elif choice == 'riichi':
+            self._riichi(self._userID, tileID)
+
+    def declineOption(self):
+        """ The user turns down what they were being offered. Turning down
+        something on their turn turns down anything else for the rest of it.
+
+        declineOption() -> None
+
+        """
+        self._sendEvent('response', ('declineOption', ()))
+        options = self._userOptions
+        self._userOptions = []
+        for option in options:
+            if option in CALLOPTIONS: #Other players can still call
+                self._turnStartCheck2('none')
+                return
+        self._curStage = 'turnmid'
+        self._optionsDeny = True
+
+    def discardTile(self, tileID):
+        """ The user discards the tile at the given index in their hand.
+
+        discardTile(int) -> None
+
+        """
+        self._sendEvent('response', ('discardTile', (tileID,)))
+        self._userOptions = []
+        self._playerDiscard(self._userID, tileID)
+        self._curStage = 'turnend'
+
+    #SUPPORT FUNCTIONS
+    def _resetVars(self):
+        """ Reset all round-based variables to their initial values.
+
+        _resetVars() -> None
+
+        """
+        self._die1 = 1
+        self._die2 = 6
+        self._curTurn = 1
+        self._playerTurn = -1
+        self._lastTile = None
+        self._playerWon = None #Which player just won
+        self._playerLost = None #Which player just lost
+        self._endRoundType = 'none'
+        self._canDouble = True #Is it possible to double riichi?
+        self._optionsDeny = False #Used for cancelling riichi and closed kans
+        self._lastDrawWasDead = False
+        self._userOptions = []
+        self._pendingDiscard = None
+        self._curWall = Wall(self._repeat, self._suitnum, self._tileFile,
+            rng=self._rng)
+        self._visibleTiles = VisibleTiles(self._repeat)
+            #Every tile on the table that all players can see
+
+    def _playerOrder(self, startingID):
+        """ Given a playerID to start with, returns a list containing the other
+        playerID's in anticlockwise order after it.
+
+        _playerOrder(int) -> list of integers
+
+        startingID is the playerID to start this list off with.
+
+        """
+        idList = [0,1,2,3]
+        return idList[startingID:] + idList[:startingID]
+
+    def _allocateSeatWinds(self, dealerNum):
+        """ Given the current dealerID, sets the correct seat winds for all
+        players in an anticlockwise direction.
+
+        _allocateSeatWinds(int) -> None
+
+        dealerNum is the ID of the player who is the current dealer.
+
+        """
+        windList = [Tile(52), Tile(51), Tile(54), Tile(53)]
+        for i, playerID in enumerate(self._playerOrder(dealerNum)):
+            self._players[playerID].setSeatWind(windList[i])
+
+    def _determineSide(self, testPlayer):
+        """ Given a playerID, finds which side the last player who discarded is
+        on around the table, relative to this player. This side is given as 0
+        for 'on the left', 1 for 'in the middle' and 2 for 'on the right'.
+
+        _determineSide(int) -> int
+
+        testPlayer is the playerID from whose perspective we're looking at.
+
+        """
+        playerList = self._playerOrder(self._playerTurn)
+        lastPlayer = playerList[-1]
+        if testPlayer < lastPlayer:
+            testPlayer += 4
+        return testPlayer - lastPlayer - 1
+
+    def _deadWallDraw(self, playerID):
+        """ Lets the given player draw from the dead wall.
+
+        _deadWallDraw(int) -> None
+
+        """
+        self._lastDrawWasDead = True
+        deadTile = self._curWall.deadWallDraw()
+        self._visibleTiles.addIndicator(self._curWall.getDoraIndList()[-1])
+        self._players[playerID].draw(deadTile)
+        self._sendEvent('deadwalldraw', (playerID, deadTile))
+
+    def _isDouble(self):
+        """ Returns whether or not the player can double riichi.
+
+        _isDouble() -> Boolean
+
+        """
+        return (self._curTurn <= 4) and self._canDouble
+
+    def _deactSpecialYaku(self):
+        """ Deactivates ippatsu and double riichi for all players.
+
+        _deactSpecialYaku() -> None
+
+        """
+        self._canDouble = False
+        for player in self._players:
+            player.addRiichiTurns(10) #Should be enough to ensure no ippatsu
+
+    def _incrRound(self):
+        """ Increments the current round, returning False if this is the last
+        round and true otherwise.
+
+        _incrRound() -> Boolean
+
+        """
+        if self._curRound[1] == 4:
+            if self._curRound[0] == 'East':
+                if self._isJustEastRound:
+                    return False
+                else:
+                    nextName = 'South'
+            else:
+                return False
+            nextNum = 1
+        else:
+            nextName = self._curRound[0]
+            nextNum = self._curRound[1] + 1
+        self._curRound = (nextName, nextNum, 0)
+        return True
+
+    def _incrBonusRound(self):
+        """ Increments the current bonus round, taking the dealer ante score
+        with it.
+
+        _incrBonusRound() -> None
+
+        """
+        nextBonus = self._curRound[2] + 1
+        self._curRound = (self._curRound[0], self._curRound[1], nextBonus)
+        self._players[self._curDealer].addScore(-100)
+
+    def _pon(self, playerID):
+        """ Declares pon on the last tile for the given playerID.
+
+        _pon(int) -> None
+
+        playerID is the ID of the player who is declaring pon.
+
+        """
+        self._deactSpecialYaku()
+        side = self._determineSide(playerID)
+        self._players[playerID].pon(self._lastTile, side)
+        self._visibleTiles.addTiles([self._lastTile]*2)
+            #The called tile was already visible in the discards
+        self._playerTurn = playerID
+        self._sendEvent('pon', (playerID, self._lastTile))
+
+    def _chi(self, playerID, chosenTiles):
+        """ Declares chi on the last tile for the given playerID.
+
+        _chi(int, list of tile indexes) -> None
+
+        playerID is the ID of the player who is declaring chi.
+        chosenTiles is a list of the tile indexes in the hand which will be
+        used for declaring the sequence.
+
+        """
+        self._deactSpecialYaku()
+        curPlayer = self._players[playerID]
+        self._visibleTiles.addTiles([curPlayer.getTileFromIndex(tileInd)
+            for tileInd in chosenTiles])
+        curPlayer.chi(self._lastTile, chosenTiles)
+        self._playerTurn = playerID
+        self._sendEvent('chi', (playerID, self._lastTile))
+
+    def _kan(self, playerID):
+        """ Declares an open kan on the last tile for the given playerID.
+
+        _kan(int) -> None
+
+        playerID is the ID of the player who is declaring kan.
+
+        """
+        self._deactSpecialYaku()
+        side = self._determineSide(playerID)
+        self._players[playerID].kan_op(self._lastTile, side)
+        self._visibleTiles.addTiles([self._lastTile]*3)
+        self._sendEvent('kan', (playerID, self._lastTile))
+        self._deadWallDraw(playerID)
+        self._playerTurn = playerID
+
+    def _kan_cl(self, playerID):
+        """ Declares a closed kan for the given playerID.
+
+        _kan_cl(int) -> None
+
+        playerID is the ID of the player who is declaring kan.
+
+        """
+        self._deactSpecialYaku()
+        kanTile = self._players[playerID].canKan_cl()
+        self._visibleTiles.addTiles([kanTile]*4)
+        self._players[playerID].kan_cl()
+        self._sendEvent('kan_cl', (playerID, kanTile))
+        self._deadWallDraw(playerID)
+
+    def _kan_la(self, playerID):
+        """ Declares a late kan for the given playerID.
+
+        _kan_la(int) -> None
+
+        playerID is the ID of the player who is declaring kan.
+
+        """
+        self._deactSpecialYaku()
+        kanTile = self._players[playerID].canKan_la()
+        self._visibleTiles.addTile(kanTile)
+        self._players[playerID].kan_la()
+        self._sendEvent('kan_la', (playerID, kanTile))
+        self._deadWallDraw(playerID)
+
+    def _riichi(self, playerID, toDiscard):
+        """ Declares riichi for the given playerID, discarding the given tile.
+        This function is used for the user.
+
+        _riichi(int, int) -> None
+
+        playerID is the ID of the player who is declaring riichi.
+        toDiscard is the index of which tile should be discarded in the riichi
+        player's hand.
+
+        """
+        self._sendEvent('riichi', playerID)
+        uniqueTiles = self._curWall.getUnique()
+        self._playerDiscard(playerID, toDiscard)
+        self._players[playerID].riichi(uniqueTiles, self._isDouble())
+        self._curStage = 'turnend'
+
+    def _riichiAI(self, playerID, curAI):
+        """ Declares riichi for the given playerID, asking the AI which tile to
+        discard. This function is used for AI.
+
+        _riichiAI(int, NoneAI) -> None
+
+        playerID is the ID of the player who is declaring riichi.
+        curAI is the AI who should be asked which tile they want to discard.
+
+        """
+        self._sendEvent('riichi', playerID)
+        uniqueTiles = self._curWall.getUnique()
+        possTiles = self._players[playerID].isTenpaiFullPoss(uniqueTiles)
+        toDiscard = curAI.checkRiichiDiscard(possTiles)
+        self._startDiscard(playerID, toDiscard, True)
+
+    def _tsumo(self, playerID):
+        """ Declares tsumo on the last tile for the given playerID.
+
+        _tsumo(int) -> None
+
+        playerID is the ID of the player who is declaring tsumo.
+
+        """
+        self._playerWon = playerID
+        self._curStage = 'roundend'
+        self._endRoundType = 'tsumo'
+        self._sendEvent('tsumo', playerID)
+
+    def _ron(self, playerID, stolenID):
+        """ Declares ron on the last tile for the given playerID.
+
+        _ron(int, int) -> None
+
+        playerID is the ID of the player who is declaring ron.
+        stolenID is the ID of the player who the tile is being taken from.
+
+        """
+        self._players[playerID].draw(self._lastTile)
+        self._playerWon = playerID
+        self._playerLost = stolenID
+        self._curStage = 'roundend'
+        self._endRoundType = 'ron'
+        self._sendEvent('ron', (playerID, stolenID))
+
+    #SAVE/LOAD GAME FUNCTIONS
+    def saveGame(self):
+        """ Saves the current game in progress as a snapshot in SAVEGAMELOC.
+        This can only be run on the user's turn, during the 'choose a discard'
+        phase.
+
+        saveGame() -> None
+
+        """
+        saveFile = open(mahjongGlobals.SAVEGAMELOC, "wb")
+        saveFile.write(self.getSnapshot())
+        saveFile.close()
+
+    def getSnapshot(self):
+        """ Gets the whole game as a snapshot: the main data, then each
+        player's data, then the wall's data.
+
+        getSnapshot() -> string
+
+        """
+        writer = SnapshotWriter()
+
+        #Main data
+        writer.addString(self._curRound[0])
+        writer.addInt(self._curRound[1])
+        writer.addInt(self._curRound[2])
+        writer.addInt(self._riichiStore)
+        writer.addInt(self._bonusStore)
+        writer.addInt(self._curDealer)
+        writer.addStrings(self._winTable[0])
+        for scores in self._winTable[1:]:
+            writer.addInts(scores)
+        writer.addStrings(self._aiNames) #The user is saved as ''
+        writer.addBool(self._isJustEastRound)
+        viewKeys = sorted(self._viewInfo.keys())
+        writer.addStrings(viewKeys)
+        writer.addStrings([self._viewInfo[key] for key in viewKeys])
+        writer.addInt(self._die1)
+        writer.addInt(self._die2)
+        writer.addInt(self._curTurn)
+        writer.addInt(self._playerTurn)
+        writer.addTile(self._lastTile)
+        writer.addBool(self._canDouble)
+        writer.addBool(self._optionsDeny)
+        writer.addBool(self._lastDrawWasDead)
+
+        #Each player's data, then the wall's
+        for player in self._players:
+            player.saveData(writer)
+        self._curWall.saveData(writer)
+        return writer.getData()
+
+    def loadGame(self):
+        """ Loads a previously saved game from the snapshot in SAVEGAMELOC.
+
+        loadGame() -> None
+
+        """
+        if (not os.path.isfile(mahjongGlobals.SAVEGAMELOC) and
+                os.path.isfile(mahjongGlobals.OLDSAVEGAMELOC)):
+            raise GameRunningException('The saved game is in the old text ' +
+                'format, which can no longer be loaded')
+        saveFile = open(mahjongGlobals.SAVEGAMELOC, "rb")
+        data = saveFile.read()
+        saveFile.close()
+        self.loadSnapshot(data)
+
+    def loadSnapshot(self, data):
+        """ Loads a game from a snapshot, as given by getSnapshot().
+
+        loadSnapshot(string) -> None
+
+        """
+        reader = SnapshotReader(data)
+
+        #Main data
+        self._curRound = (reader.getString(), reader.getInt(),
+            reader.getInt())
+        self._riichiStore = reader.getInt()
+        self._bonusStore = reader.getInt()
+        self._curDealer = reader.getInt()
+        self._winTable = [reader.getStrings()]
+        for i in range(4):
+            self._winTable.append(reader.getInts())
+        self._aiNames = [aiName or None for aiName in reader.getStrings()]
+        self._isJustEastRound = reader.getBool()
+        viewKeys = reader.getStrings()
+        self._viewInfo = dict(zip(viewKeys, reader.getStrings()))
+        self._die1 = reader.getInt()
+        self._die2 = reader.getInt()
+        self._curTurn = reader.getInt()
+        self._playerTurn = reader.getInt()
+        self._lastTile = reader.getTile()
+        self._canDouble = reader.getBool()
+        self._optionsDeny = reader.getBool()
+        self._lastDrawWasDead = reader.getBool()
+
+        #Set some required default starting variables
+        self._playerWon = None
+        self._playerLost = None
+        self._endRoundType = 'none'
+        self._roundSeed = None #Unknown, as the round has already started
+
+        #Load each player's data, then the wall's
+            #(The None values are ignored when loadData is given)
+        self._players = []
+        for i in range(4):
+            self._players.append(PlayerScore(None, None, None, None, None,
+                None, reader))
+        self._playerNames = [player.getName() for player in self._players]
+        self._callIndex = CallIndex(self._players)
+        self._curWall = Wall(None, None, None, reader)
+        if not reader.isFinished():
+            raise GameRunningException('Snapshot has data left over')
+        self._loadAI()
+        self._visibleTiles = VisibleTiles(self._repeat, self.getAllDiscards()
+            + self.getAllMelds(), self._curWall.getDoraIndList())
+
+        #Games are only saved while the user is choosing a discard
+        self._userOptions = ['discard']
+        self._curStage = 'playerresponse'
+
+    #GETTER FUNCTIONS
+    def getStage(self):
+        return self._curStage
+
+    def isWaiting(self):
+        """ Is the game waiting on a response from the user? """
+        return self._curStage == 'playerresponse'
+
+    def isGameOver(self):
+        return self._curStage == 'gameover'
+
+    def getRoundSeed(self):
+        """ Returns the seed the current round was started with, or None if
+        this game was loaded partway through it.
+
+        """
+        return self._roundSeed
+
+    def getUserID(self):
+        """ Returns the ID of the player played by the user, or None. """
+        return self._userID
+
+    def getUserOptions(self):
+        """ Returns a list of what the user is currently being offered. """
+        return list(self._userOptions)
+
+    def getChiChoices(self):
+        """ Returns the pairs of tile indexes the user could chi with. """
+        return self._chiChoices
+
+    def getRiichiChoices(self):
+        """ Returns the tile indexes the user could discard for riichi. """
+        uniqueTiles = self._curWall.getUnique()
+        return self._players[self._userID].isTenpaiFullPoss(uniqueTiles)
+
+    def getPlayer(self, playerID):
+        """ Returns the player at playerID. """
+        return self._players[playerID]
+
+    def getPlayers(self):
+        return self._players
+
+    def getAIName(self, playerID):
+        """ Returns the name of the AI playing playerID, or None. """
+        return self._aiNames[playerID]
+
+    def getWall(self):
+        return self._curWall
+
+    def getDice(self):
+        return (self._die1, self._die2)
+
+    def getRiichiStore(self):
+        return self._riichiStore
+
+    def getBonusStore(self):
+        return self._bonusStore
+
+    def getDealer(self):
+        return self._curDealer
+
+    def getPlayerTurn(self):
+        return self._playerTurn
+
+    def getCurrentRound(self):
+        """ Returns the current round, as a tuple of its wind name, its number
+        and its bonus number. """
+        return self._curRound
+
+    def getWinTable(self):
+        return self._winTable
+
+    def getRoundName(self):
+        """ Gets the name of the current round, as text.
+
+        getRoundName() -> string
+
+        """
+        roundText = self._curRound[0]
+        if self._curRound[1] == 1: roundText += " First Round"
+        if self._curRound[1] == 2: roundText += " Second Round"
+        if self._curRound[1] == 3: roundText += " Third Round"
+        if self._curRound[1] == 4: roundText += " Fourth Round"
+        if self._curRound[2] > 0:
+            roundText += " -- Bonus " + str(self._curRound[2])
+        return roundText
+
+    def getViewInfo(self, key, default=None):
+        """ Returns a piece of info saved with the game for the screen. """
+        return self._viewInfo.get(key, default)
+
+    def setViewInfo(self, key, value):
+        """ Sets a piece of info to be saved with the game for the screen. """
+        self._viewInfo[key] = value
+
+    def getRoundWind(self):
+        """ Returns the current round wind, as a Tile. """
+        textWind = self._curRound[0]
+        if textWind == 'East':
+            return Tile(52)
+        else:
+            return Tile(53)
+
+    def getTilesRemaining(self):
+        """ Returns the amount of tiles remaining in the wall. """
+        return self._curWall.getTilesRemaining()
+
+    def getGameYaku(self, playerID, typeDraw):
+        """ Returns the relevant special game yaku.
+
+        getGameYaku(int, string) -> list of Yaku
+
+        playerID is the ID of which player to check.
+        typeDraw is whether they won by tsumo or not.
+
+        """
+        temp = []
+        if (self._lastDrawWasDead and playerID == self._playerTurn and
+            typeDraw == 'tsumo'):
+            temp.append(self._yakuRinshan)
+        if self._curWall.getTilesRemaining() <= 0:
+            if typeDraw == 'tsumo':
+                temp.append(self._yakuHaitei)
+            else:
+                temp.append(self._yakuHoutei)
+        return temp
+
+    def getDoraList(self, playerID):
+        """ Returns the list of dora a player has, given their ID. A tile is in
+        the list once for every indicator that makes it dora. """
+        return self._getDoraTiles(playerID, self._curWall.getDoraCounts())
+
+    def getUraList(self, playerID):
+        """ Returns the list of ura dora a player has, given their ID. """
+        return self._getDoraTiles(playerID, self._curWall.getUraCounts())
+
+    def _getDoraTiles(self, playerID, counts):
+        """ Returns the tiles in a player's hand, repeated for each time they
+        are dora in the given dora counts. """
+        doraList = []
+        for tile in self._players[playerID].returnTiles():
+            if tile.getIndex() is not None:
+                doraList += [tile]*counts[tile.getIndex()]
+        return doraList
+
+    def getAllDiscards(self):
+        """ Returns a list of all tiles in the discard piles for all players."""
+        temp = []
+        for player in self._players:
+            temp += player.getDiscardPile()
+        return temp
+
+    def getAllMelds(self):
+        """ Returns a list of the tiles in all melds that have been declared."""
+        temp = []
+        for player in self._players:
+            for tileColl in player.getImmutable():
+                temp += tileColl.getTileList()
+        return temp
+
+    def getVisibleTiles(self):
+        """ Returns the VisibleTiles counting every discard, meld and dora
+        indicator on the table. """
+        return self._visibleTiles
+
+    def getAllDiscardsMask(self):
+        """ Returns which tiles are in the discard piles of any player, as a
+        bitmask of their positions in a count list. """
+        mask = 0
+        for player in self._players:
+            mask |= player.getDiscardMask()
+        return mask
+
+    def getGenbutsuMask(self, playerID):
+        """ Returns the tiles which are completely safe to discard against
+        the given player, as a bitmask of their positions in a count list.
+        These are the tiles in their own discard pile, as a player can't ron
+        while waiting on any of them.
+
+        getGenbutsuMask(int) -> int
+
+        """
+        return self._players[playerID].getDiscardMask()
+
+    def getSujiMask(self, playerID):
+        """ Returns the numbered tiles which the given player can't be
+        waiting on with a two-sided wait because of their discards, as a
+        bitmask of their positions in a count list.
+
+        getSujiMask(int) -> int
+
+        """
+        return getSujiMask(self.getGenbutsuMask(playerID), self._suitnum)
+
+    def getKabeMask(self, playerID):
+        """ Returns the numbered tiles which, as far as the given player can
+        see, no one can be waiting on with a two-sided wait, as a bitmask of
+        their positions in a count list.
+
+        getKabeMask(int) -> int
+
+        """
+        return self._visibleTiles.getKabeMask(
+            self._players[playerID].getHandCounts(), self._suitnum)
+
+    def getNonRoundWinds(self):
+        """ Returns a list of all wind tiles that aren't the round wind. """
+        windList = [Tile(51), Tile(52), Tile(53), Tile(54)]
+        windList.remove(self.getRoundWind())
+        return windList
@@ -0,0 +1,300 @@
+################################################################################
+# Copyright (c) 2013, Sean Manson.
+# Part of CSSE1001 Major Project (Assignment 3).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met: 
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer. 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution. 
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" gameJournal.py:
+Contains the GameJournal, which keeps an append-only record of everything that
+happens in a GameEngine's game, so that it can be rebuilt after a crash.
+
+At the start of every round a checkpoint is written, holding a snapshot of the
+game and the seed the round is played from. After that, one small record is
+written for every draw, dora flip, discard, call, riichi and win, as well as
+every response from the user. As everything random in a round comes from its
+seed, the game can be rebuilt by loading the last checkpoint and playing the
+game on from there, giving it the user's responses as they come up.
+
+The journal is written with buffered I/O, and is only synced to disk every
+SYNCINTERVAL seconds and at each checkpoint; a crash can lose the last few
+records, but never more than that, and a record cut off partway is ignored.
+
+"""
+
+#Import major libraries
+import os
+import time
+import struct
+
+#Import other mahjong modules
+from gameEngine import *
+
+#Journal settings
+JOURNALBUFFERSIZE = 65536 #Bytes buffered before they are written out
+SYNCINTERVAL = 1.0 #Most seconds between syncs to the disk
+
+#Each record is its type, then three small numbers depending on the type
+RECORD = struct.Struct('<Bbbb')
+RECORDTYPES = ['checkpoint', 'draw', 'deadwalldraw', 'dora', 'discard', 'pon',
+    'chi', 'kan', 'kan_cl', 'kan_la', 'riichi', 'tsumo', 'ron',
+    'callLastTile', 'takeOption', 'declineOption', 'discardTile']
+    #The last four are the user's responses
+RESPONSETYPES = RECORDTYPES[-4:]
+CHOICES = ['none', 'ron', 'kan', 'pon', 'chi', 'tsumo', 'kan_cl', 'kan_la',
+    'riichi']
+    #Everything the user can choose in a response
+
+#A checkpoint record is followed by the round seed and the snapshot length,
+#then the snapshot itself
+CHECKPOINT = struct.Struct('<QI')
+CHECKPOINTSTAGES = ['roundstart1', 'roundstart3']
+    #The stages a round can start at
+
+class GameJournal(object):
+    """ Writes a journal of a GameEngine's game to a file as it is played. """
+    def __init__(self, engine, journalLoc, isResuming=False):
+        """ Create a new GameJournal, listening to the given engine.
+        Constructor: GameJournal(GameEngine, string, Boolean)
+
+        engine is the GameEngine to keep a journal of. Unless the journal is
+        being resumed, the engine must be at the start of a round, such as a
+        game that has just been made.
+        journalLoc is the location of the journal file.
+        isResuming is whether to carry on writing a journal that the engine
+        has been rebuilt from, rather than starting a new one.
+
+        """
+        self._engine = engine
+        if isResuming:
+            self._journalFile = open(journalLoc, 'ab', JOURNALBUFFERSIZE)
+        else:
+            if (engine.getRoundSeed() is None or
+                    engine.getStage() not in CHECKPOINTSTAGES):
+                raise GameRunningException('Journals must start with a round')
+            self._journalFile = open(journalLoc, 'wb', JOURNALBUFFERSIZE)
+            self._writeCheckpoint()
+        self._lastSync = time.time()
+        engine.addListener(self._gameEvent)
+
+    def getEngine(self):
+        return self._engine
+
+    def _gameEvent(self, eventType, eventInfo):
+        """ Writes a record for each event worth replaying. """
+        if eventType == 'roundseed':
+            self._writeCheckpoint()
+        else:
+            self.writeRecords(getEventRecords(self._engine, eventType,
+                eventInfo))
+
+    def writeRecords(self, records):
+        """ Writes the given records, syncing the journal if it is time to.
+
+        writeRecords(list of tuples) -> None
+
+        """
+        for record in records:
+            self._journalFile.write(RECORD.pack(*record))
+        if time.time() - self._lastSync >= SYNCINTERVAL:
+            self.sync()
+
+    def _writeCheckpoint(self):
+        """ Writes a checkpoint for the round that is about to start, and
+        syncs the journal.
+
+        _writeCheckpoint() -> None
+
+        """
+        snapshot = self._engine.getSnapshot()
+        stageID = CHECKPOINTSTAGES.index(self._engine.getStage())
+        self._journalFile.write(RECORD.pack(RECORDTYPES.index('checkpoint'),
+            stageID, 0, 0))
+        self._journalFile.write(CHECKPOINT.pack(self._engine.getRoundSeed(),
+            len(snapshot)))
+        self._journalFile.write(snapshot)
+        self.sync()
+
+    def sync(self):
+        """ Makes sure everything written so far is on the disk.
+
+        sync() -> None
+
+        """
+        self._journalFile.flush()
+        os.fsync(self._journalFile.fileno())
+        self._lastSync = time.time()
+
+    def close(self):
+        """ Stops writing the journal, syncing whatever is left.
+
+        close() -> None
+
+        """
+        self._engine.removeListener(self._gameEvent)
+        self.sync()
+        self._journalFile.close()
+
+def getEventRecords(engine, eventType, eventInfo):
+    """ Returns the records for the given GameEngine event, if any.
+
+    getEventRecords(GameEngine, string, object) -> list of tuples
+
+    """
+    if eventType in ['draw', 'discard', 'pon', 'chi', 'kan', 'kan_cl',
+            'kan_la']:
+        (playerID, tile) = eventInfo
+        return [(RECORDTYPES.index(eventType), playerID, tile.getUniqueID(),
+            0)]
+    elif eventType == 'deadwalldraw':
+        #Drawing from the dead wall flips over a new dora indicator
+        (playerID, tile) = eventInfo
+        return [(RECORDTYPES.index(eventType), playerID, tile.getUniqueID(),
+            0), _getDoraRecord(engine)]
+    elif eventType == 'wallbreak':
+        return [_getDoraRecord(engine)]
+    elif eventType in ['riichi', 'tsumo']:
+        return [(RECORDTYPES.index(eventType), eventInfo, 0, 0)]
+    elif eventType == 'ron':
+        return [(RECORDTYPES.index(eventType), eventInfo[0], eventInfo[1],
+            0)]
+    elif eventType == 'response':
+        (response, args) = eventInfo
+        recordType = RECORDTYPES.index(response)
+        if response == 'callLastTile':
+            (choice, chosenTiles) = args
+            chosenTiles = (list(chosenTiles) + [-1, -1])[:2]
+            return [(recordType, CHOICES.index(choice), chosenTiles[0],
+                chosenTiles[1])]
+        elif response == 'takeOption':
+            (choice, tileID) = args
+            if tileID is None:
+                tileID = -1
+            return [(recordType, CHOICES.index(choice), tileID, 0)]
+        elif response == 'discardTile':
+            return [(recordType, args[0], 0, 0)]
+        return [(recordType, 0, 0, 0)]
+    return []
+
+def _getDoraRecord(engine):
+    """ Returns the record for the dora indicator that was just flipped. """
+    doraTile = engine.getWall().getDoraIndList()[-1]
+    return (RECORDTYPES.index('dora'), 0, doraTile.getUniqueID(), 0)
+
+def _respond(engine, record):
+    """ Gives the engine the user's response from the given record. """
+    response = RECORDTYPES[record[0]]
+    if response == 'callLastTile':
+        chosenTiles = [tileID for tileID in record[2:] if tileID >= 0]
+        engine.callLastTile(CHOICES[record[1]], chosenTiles)
+    elif response == 'takeOption':
+        tileID = record[2]
+        if tileID < 0:
+            tileID = None
+        engine.takeOption(CHOICES[record[1]], tileID)
+    elif response == 'declineOption':
+        engine.declineOption()
+    else:
+        engine.discardTile(record[1])
+
+def readJournal(journalLoc):
+    """ Reads the last checkpoint in a journal, and every record after it.
+    Anything cut off at the end of the journal is left out.
+
+    readJournal(string) -> (int, string, string, list of tuples, int)
+    Gives the round seed, stage and snapshot of the checkpoint, the records
+    after it and the length of the journal that could be read.
+
+    """
+    journalFile = open(journalLoc, 'rb')
+    data = journalFile.read()
+    journalFile.close()
+
+    checkpoint = None
+    records = []
+    pos = 0
+    while pos + RECORD.size <= len(data):
+        record = RECORD.unpack_from(data, pos)
+        if not 0 <= record[0] < len(RECORDTYPES):
+            break
+        if RECORDTYPES[record[0]] == 'checkpoint':
+            infoPos = pos + RECORD.size
+            if infoPos + CHECKPOINT.size > len(data):
+                break
+            (roundSeed, length) = CHECKPOINT.unpack_from(data, infoPos)
+            snapshotPos = infoPos + CHECKPOINT.size
+            if snapshotPos + length > len(data):
+                break
+            checkpoint = (roundSeed, CHECKPOINTSTAGES[record[1]],
+                data[snapshotPos:snapshotPos + length])
+            records = []
+            pos = snapshotPos + length
+        else:
+            records.append(record)
+            pos += RECORD.size
+    if checkpoint is None:
+        raise GameRunningException('Journal has no checkpoint')
+    return checkpoint + (records, pos)
+
+def replayJournal(journalLoc):
+    """ Rebuilds the game kept in a journal, as it was at its last record.
+
+    replayJournal(string) -> (GameEngine, list of tuples)
+    Also gives the records the game has played past the end of the journal,
+    as the last step replayed may go further than what was written.
+
+    """
+    (roundSeed, stage, snapshot, records, length) = readJournal(journalLoc)
+    engine = GameEngine(None, None, None, None, snapshot)
+    engine.restartRound(roundSeed, stage)
+    played = []
+    listener = lambda eventType, eventInfo: played.extend(
+        getEventRecords(engine, eventType, eventInfo))
+    engine.addListener(listener)
+    for record in records:
+        while not played:
+            if RECORDTYPES[record[0]] in RESPONSETYPES and engine.isWaiting():
+                _respond(engine, record)
+            elif engine.isWaiting() or engine.isGameOver():
+                raise GameRunningException('Journal does not match the game')
+            else:
+                engine.step()
+        if played.pop(0) != record:
+            raise GameRunningException('Journal does not match the game')
+    engine.removeListener(listener)
+    return (engine, played)
+
+def resumeJournal(journalLoc):
+    """ Rebuilds the game kept in a journal and carries on writing it, cutting
+    off anything at the end of the journal that couldn't be read.
+
+    resumeJournal(string) -> GameJournal
+
+    """
+    length = readJournal(journalLoc)[-1]
+    journalFile = open(journalLoc, 'r+b')
+    journalFile.truncate(length)
+    journalFile.close()
+    (engine, played) = replayJournal(journalLoc)
+    journal = GameJournal(engine, journalLoc, True)
+    journal.writeRecords(played)
+    journal.sync()
+    return journal
@@ -0,0 +1,356 @@
+################################################################################
+# Copyright (c) 2013, Sean Manson.
+# Part of CSSE1001 Major Project (Assignment 3).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met: 
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer. 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution. 
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" gameRecord.py:
+Contains the writer and readers for game records, a line based log of every
+game played, for looking over games afterwards.
+
+A record file holds any number of games, one after the other. Each line is a
+type, then its values, separated by DELIMITER; tiles are given as their unique
+IDs and players as their IDs. A game is given as:
+    game;name;ai;name;ai;name;ai;name;ai
+        (The AI is left empty for the user)
+followed by each round, given as:
+    round;wind;number;bonus;dealer;die1;die2;round seed;score x4
+followed by every action in the round:
+    draw;player;tile          deadwalldraw;player;tile     dora;tile
+    discard;player;tile       pon;player;tile              chi;player;tile
+    kan;player;tile           kan_cl;player;tile           kan_la;player;tile
+    riichi;player             tsumo;player                 ron;player;from
+    drawgame;type             roundend;type;score change x4
+and after the last round:
+    gameend;score x4
+
+Records are read back a line at a time, so files of any size can be read
+without loading them whole. To skip to a given round, an index of where each
+round starts is kept next to the record file, made the first time it is
+needed.
+
+"""
+
+#Import major libraries
+import os
+import re
+import struct
+import bisect
+
+#Import other mahjong modules
+import mahjongGlobals
+
+#Record settings
+INDEXEXTENSION = '.idx' #Added to a record file's location for its index
+INDEXHEADER = struct.Struct('<4sQ') #Marker and size of the indexed file
+INDEXMAGIC = 'RMRI'
+SCANCHUNKSIZE = 1 << 20 #Bytes read at a time when making an index
+TILEACTIONS = ['draw', 'deadwalldraw', 'discard', 'pon', 'chi', 'kan',
+    'kan_cl', 'kan_la'] #Actions given as (player, tile)
+TEXTLINES = set(['game', 'round', 'drawgame', 'roundend'])
+    #Lines with values that aren't all ints
+GAMESTART = 'game' + mahjongGlobals.DELIMITER
+ROUNDSTART = 'round' + mahjongGlobals.DELIMITER
+FINISHLINES = ('roundend' + mahjongGlobals.DELIMITER,
+    'gameend' + mahjongGlobals.DELIMITER) #Lines that end a round
+BLOCKSTART = re.compile('\n(?=' + GAMESTART + '|' + ROUNDSTART + ')')
+    #Matches the end of the line before each game or round line
+
+class GameRecordWriter(object):
+    """ Listens to a GameEngine, writing a record of its game to a file. """
+    def __init__(self, engine, recordFile):
+        """ Create a new GameRecordWriter, writing the game of the given engine
+        to the given open file.
+        Constructor: GameRecordWriter(GameEngine, file)
+
+        Rounds are only written from their start, so a game loaded partway
+        through a round is written from the round after.
+
+        """
+        self._engine = engine
+        self._recordFile = recordFile
+        self._inRound = False #Have we written the start of this round?
+        line = ['game']
+        for playerID, player in enumerate(engine.getPlayers()):
+            line += [player.getName(), engine.getAIName(playerID) or '']
+        self._writeLine(line)
+        engine.addListener(self._gameEvent)
+
+    def _writeLine(self, values):
+        """ Writes the given values as one line. """
+        self._recordFile.write(mahjongGlobals.DELIMITER.join(
+            [str(value) for value in values]) + '\n')
+
+    def _gameEvent(self, eventType, eventInfo):
+        """ Writes a line for each event worth recording. """
+        engine = self._engine
+        if eventType == 'wallbreak':
+            self._inRound = True
+            line = ['round'] + list(engine.getCurrentRound())
+            line += [engine.getDealer()] + list(engine.getDice())
+            roundSeed = engine.getRoundSeed()
+            if roundSeed is None:
+                roundSeed = ''
+            line.append(roundSeed)
+            line += [player.getScore() for player in engine.getPlayers()]
+            self._writeLine(line)
+            self._writeDora()
+        elif eventType == 'gameend':
+            self._writeLine(['gameend'] + [player.getScore()
+                for player in engine.getPlayers()])
+            self._recordFile.flush()
+        elif not self._inRound:
+            return
+        elif eventType in TILEACTIONS:
+            (playerID, tile) = eventInfo
+            self._writeLine([eventType, playerID, tile.getUniqueID()])
+            if eventType == 'deadwalldraw':
+                self._writeDora() #A new dora indicator is flipped
+        elif eventType in ['riichi', 'tsumo', 'drawgame']:
+            self._writeLine([eventType, eventInfo])
+        elif eventType == 'ron':
+            self._writeLine(['ron'] + list(eventInfo))
+        elif eventType == 'roundend':
+            self._inRound = False
+            self._writeLine(['roundend', eventInfo[0]] + [player.getScoreDiff()
+                for player in engine.getPlayers()])
+            self._recordFile.flush()
+
+    def _writeDora(self):
+        """ Writes the dora indicator that was just flipped. """
+        doraTile = self._engine.getWall().getDoraIndList()[-1]
+        self._writeLine(['dora', doraTile.getUniqueID()])
+
+    def close(self):
+        """ Stops writing the game. The file is left open. """
+        self._engine.removeListener(self._gameEvent)
+        self._recordFile.flush()
+
+class RoundRecord(object):
+    """ A single round read from a record file. """
+    def __init__(self, game, header, actionText):
+        """ Create a new RoundRecord.
+        Constructor: RoundRecord(list, list, string)
+
+        game is the values of the game line this round belongs to.
+        header is the values of this round's line.
+        actionText is the lines of every action in the round, which are only
+        read once they are asked for.
+
+        """
+        self._game = game
+        self._header = header
+        self._actionText = actionText
+        self._actions = None
+
+    def getPlayerNames(self):
+        return self._game[0::2]
+
+    def getAINames(self):
+        """ Returns the AI of each player, with None for the user. """
+        return [aiName or None for aiName in self._game[1::2]]
+
+    def getRound(self):
+        """ Returns the round, as a tuple of its wind name, its number and its
+        bonus number. """
+        return tuple(self._header[0:3])
+
+    def getDealer(self):
+        return self._header[3]
+
+    def getDice(self):
+        return tuple(self._header[4:6])
+
+    def getRoundSeed(self):
+        """ Returns the seed the round was played from, or None. """
+        if self._header[6] == '':
+            return None
+        return self._header[6]
+
+    def getScores(self):
+        """ Returns each player's score at the start of the round. """
+        return self._header[7:11]
+
+    def getActions(self):
+        """ Returns each action in the round, as (type, list of values). """
+        if self._actions is None:
+            self._actions = list(readRecordLines(
+                self._actionText.splitlines()))
+        return self._actions
+
+def _parseValue(value):
+    """ Converts a value from a record line back into an int if it is one.
+
+    _parseValue(string) -> object
+
+    """
+    if value.isdigit() or (value[:1] == '-' and value[1:].isdigit()):
+        return int(value)
+    return value
+
+def readRecordLines(recordFile):
+    """ Reads the lines of an open record file, or any other lines, one at a
+    time, giving each as (type, list of values).
+
+    readRecordLines(file) -> generator of tuples
+
+    """
+    for line in recordFile:
+        line = line.rstrip('\r\n')
+        if not line or line.startswith(mahjongGlobals.COMMENTIND):
+            continue
+        values = line.split(mahjongGlobals.DELIMITER)
+        lineType = values[0]
+        if lineType in TEXTLINES: #Only these have values that aren't ints
+            yield (lineType, [_parseValue(value) for value in values[1:]])
+        else:
+            yield (lineType, map(int, values[1:]))
+
+def _readBlocks(recordFile):
+    """ Reads an open record file a chunk at a time, splitting it up into
+    blocks that each start with a game or round line.
+
+    _readBlocks(file) -> generator of strings
+
+    """
+    rest = ''
+    while True:
+        chunk = recordFile.read(SCANCHUNKSIZE)
+        if not chunk:
+            break
+        data = rest + chunk
+        start = 0
+        for match in BLOCKSTART.finditer(data):
+            yield data[start:match.end()]
+            start = match.end()
+        rest = data[start:]
+    if rest:
+        yield rest
+
+def _parseLine(line):
+    """ Gives the values of a single game or round line. """
+    return readRecordLines([line]).next()[1]
+
+def readRounds(recordLoc, startRound=0):
+    """ Reads the rounds in a record file one at a time, starting at the given
+    round of the whole file. Rounds cut off partway through are left out.
+    Only the game and round lines are read as the file is gone through, so
+    the actions of rounds that aren't looked at cost next to nothing.
+
+    readRounds(string, int) -> generator of RoundRecords
+
+    startRound is which round to start at, counting from 0 at the first round
+    of the first game. Rounds before it are skipped using the file's index.
+
+    """
+    recordFile = open(recordLoc, 'rb')
+    try:
+        game = None
+        if startRound:
+            (gameStarts, roundStarts) = getRecordIndex(recordLoc)
+            if startRound >= len(roundStarts):
+                return
+            gameNum = bisect.bisect(gameStarts, roundStarts[startRound]) - 1
+            recordFile.seek(gameStarts[gameNum])
+            game = _parseLine(recordFile.readline())
+            recordFile.seek(roundStarts[startRound])
+        for block in _readBlocks(recordFile):
+            if block.startswith(GAMESTART):
+                game = _parseLine(block[:block.find('\n')])
+            elif block.startswith(ROUNDSTART):
+                headerEnd = block.find('\n') + 1
+                if not headerEnd:
+                    continue #Cut off before any actions
+                lastLine = block[block.rfind('\n', 0, -1) + 1:]
+                if lastLine.startswith(FINISHLINES) and block.endswith('\n'):
+                    yield RoundRecord(game, _parseLine(block[:headerEnd]),
+                        block[headerEnd:])
+    finally:
+        recordFile.close()
+
+def buildRecordIndex(recordLoc):
+    """ Finds where each game and round in a record file starts, and writes
+    these to the file's index.
+
+    buildRecordIndex(string) -> (list of ints, list of ints)
+    Gives the offset of each game and each round in the file.
+
+    """
+    gameStarts = []
+    roundStarts = []
+    patterns = [('\n' + GAMESTART, gameStarts),
+        ('\n' + ROUNDSTART, roundStarts)]
+    overlap = max([len(pattern) for (pattern, starts) in patterns]) - 1
+
+    recordFile = open(recordLoc, 'rb')
+    carry = '\n' #The start of the file counts as the start of a line
+    pos = -1 #Offset of the start of carry in the file
+    while True:
+        chunk = recordFile.read(SCANCHUNKSIZE)
+        if not chunk:
+            break
+        data = carry + chunk
+        for (pattern, starts) in patterns:
+            found = data.find(pattern)
+            while found != -1:
+                if found + len(pattern) > len(carry): #Not found last chunk
+                    starts.append(pos + found + 1)
+                found = data.find(pattern, found + 1)
+        carry = data[-overlap:]
+        pos += len(data) - len(carry)
+    recordSize = recordFile.tell()
+    recordFile.close()
+
+    indexFile = open(recordLoc + INDEXEXTENSION, 'wb')
+    indexFile.write(INDEXHEADER.pack(INDEXMAGIC, recordSize))
+    indexFile.write(struct.pack('<QQ', len(gameStarts), len(roundStarts)))
+    indexFile.write(struct.pack('<%dQ' % len(gameStarts), *gameStarts))
+    indexFile.write(struct.pack('<%dQ' % len(roundStarts), *roundStarts))
+    indexFile.close()
+    return (gameStarts, roundStarts)
+
+def getRecordIndex(recordLoc):
+    """ Gets where each game and round in a record file starts, from the
+    file's index, making the index first if it is missing or out of date.
+
+    getRecordIndex(string) -> (list of ints, list of ints)
+
+    """
+    indexLoc = recordLoc + INDEXEXTENSION
+    if os.path.isfile(indexLoc):
+        indexFile = open(indexLoc, 'rb')
+        try:
+            (magic, recordSize) = INDEXHEADER.unpack(
+                indexFile.read(INDEXHEADER.size))
+            if (magic == INDEXMAGIC and
+                    recordSize == os.path.getsize(recordLoc)):
+                (gameNum, roundNum) = struct.unpack('<QQ', indexFile.read(16))
+                gameStarts = list(struct.unpack('<%dQ' % gameNum,
+                    indexFile.read(8*gameNum)))
+                roundStarts = list(struct.unpack('<%dQ' % roundNum,
+                    indexFile.read(8*roundNum)))
+                return (gameStarts, roundStarts)
+        except struct.error:
+            pass #Remake a broken index
+        finally:
+            indexFile.close()
+    return buildRecordIndex(recordLoc)
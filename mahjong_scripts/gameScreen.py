@@ -24,16 +24,20 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 ################################################################################
 
+
 """ gameScreen.py:
-Contains the main game screen, which is made up of three parts:
-    - The backend rules and functions relating to gameplay.
-    - The constantly running update function, which reloads the game constantly.
+Contains the main game screen, which is made up of two parts:
+    - The constantly running update function, which steps the GameEngine
+      along, animating and waiting on the user in between.
     - The surface portion, which draws all the game elements to the screen.
-This is effectively the main part of the game.
+The actual rules and gameplay are all handled by the GameEngine, in
+gameEngine.py; this screen just shows what it does and passes on what the user
+chooses.
 
 """
 
 #Import major libraries
+import random
 import pygame
 from pygame.locals import *
 from os import listdir
@@ -41,12 +45,13 @@ from os.path import isfile, join
 
 #Import other mahjong modules
 import mahjongGlobals
-from AI import *
+from gameEngine import *
+from gameRecord import *
 from mahjong_rulebase import *
 from menuItems import *
 
 class GameScreen(MenuScreen):
-    """ The GameScreen object, a subclass of MenuScreen. Is made up of three
+    """ The GameScreen object, a subclass of MenuScreen. Is made up of two
     main parts, described at the top of this file.
 
     """
@@ -74,16 +79,12 @@ class GameScreen(MenuScreen):
         
         if startingValues[0] == True: #If they chose to load a game
             self.loadGame()
-            bgImg = pygame.image.load(self._bgImgLoc).convert()
-            MenuScreen.__init__(self, master, bgImg)
         else: #If this is a new game
             #Get starting values from the options they gave
-            self._playerName = startingValues[1]
-            self._startingScore = startingValues[2]
-            self._p1ai = startingValues[3]
-            self._p2ai = startingValues[4]
-            self._p3ai = startingValues[5]
-            self._isJustEastRound = startingValues[6]
+            playerNames = [startingValues[1], 'CPU Player 1', 'CPU Player 2',
+                'CPU Player 3']
+            aiNames = [None, startingValues[3], startingValues[4],
+                startingValues[5]] #The user is always player 0
             self._backColour = startingValues[7]
             if self._backColour == 'Blue':
                 self._bgImgLoc = mahjongGlobals.MAINBACKBLUEIMG
@@ -91,39 +92,49 @@ class GameScreen(MenuScreen):
                 self._bgImgLoc = mahjongGlobals.MAINBACKREDIMG
             else:
                 self._bgImgLoc = mahjongGlobals.MAINBACKGREENIMG
-            bgImg = pygame.image.load(self._bgImgLoc).convert()
-            MenuScreen.__init__(self, master, bgImg)
-
-            #Other starting values
-            self._curStage = 'roundstart1'
-            self._curRound = ('East', 1, 0)
-            self._riichiStore = 0 #Holds leftover riichi from previous rounds
-            self._bonusStore = 0 #Holds leftover bonus sticks from prev. rounds
-            self._curDealer = 0 #Current dealer
-            self._winTable = [[], [], [], [], []]
-                #Table of scores for the game over screen
-            
-            #Players
-                #Note that [0] is the user, and the others are the AI players
-                #The index here goes anticlockwise around the game board
-            self._players = []
-            self._players.append(PlayerScore(self._handsize, self._suitnum,
-                self._totalsuitnum, self._playerName, self._startingScore))
-            self._players.append(PlayerScore(self._handsize, self._suitnum,
-                self._totalsuitnum, 'CPU Player 1', self._startingScore))
-            self._players.append(PlayerScore(self._handsize, self._suitnum,
-                self._totalsuitnum, 'CPU Player 2', self._startingScore))
-            self._players.append(PlayerScore(self._handsize, self._suitnum,
-                self._totalsuitnum, 'CPU Player 3', self._startingScore))
-
-            #AI
-            exec('ai1 = ' + self._p1ai + '(self, 1)')
-            exec('ai2 = ' + self._p2ai + '(self, 2)')
-            exec('ai3 = ' + self._p3ai + '(self, 3)')
-            self._ai = [ai1, ai2, ai3]
-
-            #Setup the round begin variables
-            self._resetVars()
+            self._engine = GameEngine(playerNames, aiNames, startingValues[2],
+                startingValues[6])
+        self._recordFile = None
+        self._recordWriter = None
+        if self._isRecordingOn():
+            self._recordFile = open(mahjongGlobals.GAMERECORDLOC, 'ab')
+            self._recordWriter = GameRecordWriter(self._engine,
+                self._recordFile)
+                #Added first, so the game is recorded before the screen shows it
+        self._engine.addListener(self._gameEvent)
+        bgImg = pygame.image.load(self._bgImgLoc).convert()
+        MenuScreen.__init__(self, master, bgImg)
+
+    def _isRecordingOn(self):
+        """ Returns whether the gameplay settings ask for every game to be
+        recorded to GAMERECORDLOC. This is off unless turned on.
+
+        _isRecordingOn() -> Boolean
+
+        """
+        settingsLoad = IOHelper(mahjongGlobals.GAMESETTINGSLOC,
+            mahjongGlobals.DELIMITER, mahjongGlobals.COMMENTIND)
+        row = settingsLoad.getRowByOneID('recordgames')
+        return bool(row) and row[1].strip() == '1'
+
+    def _stopRecording(self):
+        """ Stops recording the game, if it is being recorded, and closes
+        the record file.
+
+        _stopRecording() -> None
+
+        """
+        if self._recordWriter is not None:
+            self._recordWriter.close()
+            self._recordWriter = None
+        if self._recordFile is not None:
+            self._recordFile.close()
+            self._recordFile = None
+
+    def leaveScreen(self):
+        """ Stops recording the game when the screen is left, whether the
+        game is over, saved, quit or the program is closed. """
+        self._stopRecording()
 
     def _loadStandardInfo(self, master):
         """ Setup the default variables and load all sprite images and buttons.
@@ -136,16 +147,11 @@ class GameScreen(MenuScreen):
         self._noDraw = (-1,-1) #Which tile should be flashing
         self._animation = False #Are we waiting on some animation?
         self._curStageTimer = 0 #Timer, used for animation counting
-        
-        #Load game settings from file
-        settingsLoad = IOHelper(mahjongGlobals.GAMESETTINGSLOC,
-            mahjongGlobals.DELIMITER, mahjongGlobals.COMMENTIND)
-        self._handsize = int(settingsLoad.getRowByOneID('handsize')[1])
-        self._suitnum = int(settingsLoad.getRowByOneID('suitnum')[1])
-        self._totalsuitnum = int(settingsLoad.getRowByOneID('totalsuitnum')[1])
-        self._repeat = int(settingsLoad.getRowByOneID('repeat')[1])
-        self._tileFile = settingsLoad.getRowByOneID('tilefile')[1]
-        self._yakuFile = settingsLoad.getRowByOneID('yakufile')[1]
+        self._scoreChanging = False #Are the scores moving after a round?
+        self._waitContinue = False #Are we waiting for them to click continue?
+        self._userCanDiscard = False #Can only discard when waiting for input
+        self._die1 = 1 #The dice as shown on screen
+        self._die2 = 6
 
         #Sprites and surfaces
         #Remember to call convert() to get them all in the fastest blitting
@@ -246,14 +252,8 @@ class GameScreen(MenuScreen):
         self._aniText = []
         self._aniBack = []
 
-        #Load all yaku
-        self._yakuRinshan = Yaku('rinshan', self._yakuFile)
-        self._yakuHaitei = Yaku('haitei', self._yakuFile)
-        self._yakuHoutei = Yaku('houtei', self._yakuFile)
-        self._yakuTenhou = Yaku('itsuu', self._yakuFile)
-        self._yakuChiihou = Yaku('chanta', self._yakuFile)
 
-    #ROUND LOGIC METHODS:
+    #GAME LOGIC METHODS:
     def update(self):
         """ Updates the current logic status of the game. Should be run before
         redrawing the surface of this screen, once per frame.
@@ -264,387 +264,123 @@ class GameScreen(MenuScreen):
         self._curStageTimer += 1
         if self._animation: #If animating, do that instead of game logic
             self._animate(self._animation)
-        else: #Do something based off which stage we're at
-            if self._curStage == 'roundstart1':
-                #Very first stage, roll dice and display name
-                self._roundStart1()
-                self._curStage = 'roundstart2'
-            elif self._curStage == 'roundstart2':
-                #Get dealer and player seating, pause for a bit
-                self._roundStart2()
-                self._curStage = 'roundstart3'
-            elif self._curStage == 'roundstart3':
-                #Finished pausing, roll dice again
-                self._startAnimate('dice', None)
-                self._curStage = 'roundstart4'
-            elif self._curStage == 'roundstart4':
-                #Break the wall and set up the dora and dead wall
-                self._roundStart4()
-                self._curStage = 'drawtiles'
-            elif self._curStage == 'drawtiles':
-                #Do the beginning draw of 4 tiles each for all players
-                self._drawTiles()
-            elif self._curStage == 'turnstartcheck':
-                #Check to see whether the player can call on the last tile
-                self._curStage = 'turnstartcheck2'
-                self._turnStartCheck()
-            elif self._curStage == 'turnstartcheck2':
-                #After getting the player's response, check to see who actually
-                #gets the tile, assuming that a player has called on it
-                self._turnStartCheck2('none')
-            elif self._curStage == 'turnstart':
-                #If it's in a drawing condition, draw; end the game
-                #Else, let the current player take a tile from the wall
-                self._turnStart()
-            elif self._curStage == 'turnmid':
-                #Depending on what state the player's in:
-                    #Check to see if they can tsumo/kan/riichi
-                    #If they decline or can't, make them discard if in riichi
-                    #Otherwise, if it's the user, wait for them to respond
-                    #Otherwise, get the AI's response
-                if (self._tsumoCheck() or
-                    self._lateKanCheck() or
-                    self._closedKanCheck() or
-                    self._riichiCheck()):
-                    pass #Wait for next loop
-                elif self._players[self._playerTurn].isRiichi():
-                    self._riichiWaitCheck()
-                elif self._playerTurn == 0:
-                    self._userCanDiscard = True
-                    self._hudMenuButton.enable()
-                    self._curStage = 'playerresponse'
-                else:
-                    toDiscard = self._ai[self._playerTurn-1].checkDiscard()
-                    self._playerDiscardAni(self._playerTurn, toDiscard)
-                    self._curStage = 'turnend'
-            elif self._curStage == 'turnend':
-                #Reset all the current turn flags, then rotate the players
-                self._turnEndReset()
-                self._curStage = 'turnstartcheck'
-            elif self._curStage == 'roundend':
-                #Popup the round end dialog, get the scores ready to change
-                self._curStage = 'scorechange'
-                self._roundEnd()
-            elif self._curStage == 'scorechange':
-                #Repeatedly move the scores into position
-                self._scoreChange()
-            elif self._curStage == 'playerresponse':
-                pass #Do nothing while waiting for the user to click/press
-
-    def _roundStart1(self):
-        """ Very start of a round. Popup the round name and roll the dice.
-
-        _roundStart1() -> None
-
-        """
-        self._drawTextMid(self._getRoundName())
-        self._startAnimate('dice', None)
-
-    def _roundStart2(self):
-        """ Find the dealer from the dice, allocate the seat winds and then
-        pause for 30 frames.
-
-        _roundStart2() -> None
-
-        """
-        dealer = random.randint(0, 3)
-        dealer = (dealer + self._die1 + self._die2)%4
-        self._curDealer = dealer
-        for i, player in enumerate(self._players):
-            player.setDealer(self._curDealer == i)
-        self._allocateSeatWinds(dealer)
-        self._startAnimate('pause', 30)
-
-    def _roundStart4(self):
-        """ Break the wall and set up the dora using the dice.
-
-        _roundStart4() -> None
-
-        """
-        diedist = self._die1 + self._die2
-        breakdist = (diedist)%4
-        self._curWall.setDealerBreak(diedist, breakdist)
-
-    def _drawTiles(self):
-        """ Step-by-step function for drawing 4 tiles at a time at the beginning
-        of a round for each player.
-
-        _drawTiles() -> None
-
-        """
-        for x in range(4):
-            self._playerDraw(x)
-        self._startAnimate('pause', 5)
-        if self._handsize - self._players[3].getTileNum() < 3:
-            for y in range(4):
-                self._playerDraw(y)
-            self._playerTurn = self._curDealer
-            self._curStage = 'turnstart'
-                    
-    def _turnStartCheck(self):
-        """ Check to see whether the user can call on the last tile discarded in
-        any way, and if they can, enable the buttons to do so.
-
-        _turnStartCheck() -> None
-
-        """
-        if self._playerTurn == 1:
-            return False #User can't call on the tile they just discarded
-        if self._players[0].canRon(self._lastTile, self.getRoundWind(),
-                self._yakuFile, self.getGameYaku(0, 'ron')): #If they can ron
-            self._hudCallButton.enable()
-            self._hudCallButton.changeText("Ron")
-            self._curStage = 'playerresponse'
-            if self._players[0].isRiichi():
-                #Needed, as they can't call chi/pon etc. after declaring riichi
-                self._enableCancelButtons()
-                return
-        elif self._players[0].isRiichi(): #Riichi locks out other options
-            return
-        if self._players[0].canKan(self._lastTile): #If they can kan
-            self._hudKanButton.enable()
-            self._curStage = 'playerresponse'
-        if self._players[0].canPon(self._lastTile): #If they can pon
-            self._hudPonButton.enable()
-            self._curStage = 'playerresponse'
-        if self._playerTurn == 0: 
-            #This is done to not waste processing time for the other players
-            self._curChiChoices = self._players[0].canChi(self._lastTile)
-            if self._curChiChoices: #If they can chi
-                self._hudChiButton.enable()
-                self._curStage = 'playerresponse'
-        if self._curStage == 'playerresponse': #If a button is enabled
-            self._enableCancelButtons()
-
-    def _turnStartCheck2(self, playerChoice):
-        """ Goes through each non-discarding player in an anti-clockwise
-        direction and sees whether they want to call on the last tile, letting
-        pon override chi and similar; all the while taking into account the
-        choice of the user.
-
-        _turnStartCheck2(string) -> None
-
-        playerChoice is a string ('pon', or 'chi' etc) which is passed to this
-        function when clicking one of the buttons enabled through
-        _turnStartCheck above.
-
-        """
-        orderedPlayers = self._playerOrder(self._playerTurn)
-        prevPlayer = orderedPlayers[-1]
-        curOrder = orderedPlayers[:-1]
-            #This is three elements long, ignoring the player that just went
-        if self._checkRon(curOrder, playerChoice, prevPlayer):
-            self._players[prevPlayer].removeDiscard()
-            return #If someone rons, don't bother about the rest anymore
-        elif self._checkKan(curOrder, playerChoice):
-            self._curStage = 'turnmid'
-        elif self._checkPon(curOrder, playerChoice):
-            self._curStage = 'turnmid'
-        elif self._checkChi(playerChoice): 
-            self._curStage = 'turnmid'
-        else:
-            self._curStage = 'turnstart'
-        if self._curStage == 'turnmid':
-            self._highlightTiles = []
-                #Reset this in the case that they called chi
-            self._players[prevPlayer].removeDiscard()
-
-    def _riichiWaitCheck(self):
-        """ If a player is in riichi, there's no need to give them options to
-        discard or anything anymore. Either the tile they draw is part of their
-        waiting tiles list and they tsumo, or it's not and they discard it.
-
-        _riichiWaitCheck() -> None
-
-        """
-        curWait = self._players[self._playerTurn].getRiichiWait()
-        curMutable = self._players[self._playerTurn].getMutable()
-        curLen = len(self._players[self._playerTurn].returnTiles())
-        if (curLen == self._handsize) and (curMutable[-1] in curWait):
-            #curMutable[-1] should be their last drawn tile
-            self._tsumo(self._playerTurn)
-        else:
-            toDiscard = -1
-            self._playerDiscardAni(self._playerTurn, toDiscard)
-            self._curStage = 'turnend'
-
-    def _turnStart(self):
-        """ First checks to see whether the game is going to end in a draw. If
-        not, then makes the current player draw a tile. Damn, that terminology
-        is confusing.
-
-        _turnStart() -> None
-
-        """
-        allRiichi = True
-        for player in self._players:
-            if not player.isRiichi():
-                allRiichi = False
-        if self._curWall.getTilesRemaining() <= 0:
-            self._drawTextFinal('Draw -- No More Tiles')
+        elif self._scoreChanging: #Repeatedly move the scores into position
+            self._scoreChange()
+        elif self._waitContinue or self._engine.isWaiting():
+            pass #Do nothing while waiting for the user to click/press
+        else: #Let the game move on to its next stage
+            self._engine.step()
+
+    def _gameEvent(self, eventType, eventInfo):
+        """ Shows something that has just happened in the game, as told by the
+        GameEngine.
+
+        _gameEvent(string, object) -> None
+
+        eventType is which event happened.
+        eventInfo is an object with info about the event; see GameEngine.
+
+        """
+        if eventType == 'roundname':
+            self._drawTextMid(eventInfo)
+        elif eventType == 'dice':
+            self._startAnimate('dice', eventInfo)
+        elif eventType == 'dealer':
+            self._startAnimate('pause', 30)
+        elif eventType == 'drawtiles':
+            self._startAnimate('pause', 5)
+        elif eventType == 'draw':
+            self._master.playButtonSound('drawSound')
+        elif eventType == 'deadwalldraw':
+            self._hudTileButtons = [] #Force this to update
+            self._master.playButtonSound('drawSound')
+        elif eventType == 'discardchoice':
+            self._startAnimate('flashTile', eventInfo)
+        elif eventType == 'discard':
+            self._master.playButtonSound('discardSound')
+        elif eventType == 'pon':
+            self._drawTextShort('Pon')
+            self._master.playVoiceSound('ponSound')
+            self._startAnimate('pause', 10)
+        elif eventType == 'chi':
+            self._drawTextShort('Chi')
+            self._master.playVoiceSound('chiSound')
+            self._startAnimate('pause', 10)
+        elif eventType in ('kan', 'kan_cl', 'kan_la'):
+            self._drawTextShort('Kan')
+            self._master.playVoiceSound('kanSound')
+            self._startAnimate('pause', 15)
+        elif eventType == 'riichi':
+            self._drawTextShort('Riichi')
+            self._master.playVoiceSound('riichiSound')
+        elif eventType == 'tsumo':
+            self._drawTextFinal('Tsumo')
+            self._master.playVoiceSound('tsumoSound')
             self._startAnimate('pause', 100)
-            self._curStage = 'roundend'
-            self._endRoundType = 'nomoretiles'
-        elif len(self._curWall.getDoraList()) >= 5:
-            self._drawTextFinal('Draw -- Four Kans Declared')
+        elif eventType == 'ron':
+            self._drawTextFinal('Ron')
+            self._master.playVoiceSound('ronSound')
             self._startAnimate('pause', 100)
-            self._curStage = 'roundend'
-            self._endRoundType = 'fourkans'
-        elif allRiichi:
-            self._drawTextFinal('Draw -- All Players Riichi')
-            self._startAnimate('pause', 100)
-            self._curStage = 'roundend'
-            self._endRoundType = 'allriichi'
-        else:
-            self._playerDraw(self._playerTurn)
-            self._curStage = 'turnmid'
-
-    def _turnEndReset(self):
-        """ Resets some of the starting turn flags, increments the turn counter
-        and then moves the players around anticlockwise.
-
-        _turnEndReset() -> None
-
-        """
-        self._optionsDeny = False
-        self._lastDrawWasDead = False
-        self._hudMenuButton.disable()
-        self._curTurn += 1
-        for player in self._players:
-            player.addRiichiTurns(1)
-        self._playerTurn += 1
-        if self._playerTurn > 3:
-            self._playerTurn = 0
-
-    def _roundEnd(self):
-        """ First, sees how exactly the current game is ending, and forms a
-        list of data to pass to the popup dialog explaining this. Then, find
-        the scores for each player and get ready to apply them, taking into
-        account factors such as dora, riichi, bonus sticks etc. Finally, popup
-        the window for a round ending.
-
-        _roundEnd() -> None
-
-        """
-        roundInfo = [self._endRoundType]
-        if self._endRoundType == 'ron' or self._endRoundType == 'tsumo':
-            #If a player has won by ron or tsumo
-            winningPlayer = self._players[self._playerWon]
-            winningPlayer.addWin()
-            otherPlayers = self._playerOrder(self._playerWon)[1:]
-            winningPlayer.showHand()
-            if self._endRoundType == 'ron':
-                selfDrawn = False
+        elif eventType == 'drawgame':
+            if eventInfo == 'nomoretiles':
+                self._drawTextFinal('Draw -- No More Tiles')
+            elif eventInfo == 'fourkans':
+                self._drawTextFinal('Draw -- Four Kans Declared')
             else:
-                selfDrawn = True
-            handArrange = winningPlayer.isValid()
-            handFu = winningPlayer.getFu(self.getRoundWind(), handArrange,
-                selfDrawn)
-            handYaku = winningPlayer.getHandYaku(self.getRoundWind(),
-                handArrange, handFu, selfDrawn, self._yakuFile)
-            gameYaku = self.getGameYaku(self._playerWon, self._endRoundType)
-            totalYaku = handYaku + gameYaku
-            doraList = self.getDoraList(self._playerWon)
-            if winningPlayer.isRiichi():
-                uraList = self.getUraList(self._playerWon)
-            else:
-                uraList = []
-            (handScore, scoreWord) = winningPlayer.scoreHand(totalYaku, handFu,
-                    len(doraList) + len(uraList))
+                self._drawTextFinal('Draw -- All Players Riichi')
+            self._startAnimate('pause', 100)
+        elif eventType == 'options':
+            self._showOptions(eventInfo[1])
+        elif eventType == 'roundend':
+            #Popup the winning dialog, then get the scores moving
+            self.popupDialog('WindowRoundEnd', eventInfo)
+            self._skipScoreButton.enable()
+            self._curStageTimer = 0
+            self._scoreChanging = True
+        elif eventType == 'gameend':
+            #Stop recording the game
+            self._stopRecording()
+            #Congratulate the winner, then go back to the main menu
+            self.popupDialog('WindowGameEnd', list(eventInfo))
+            self.changeScreen('MainMenu',None)
+
+    def _showOptions(self, options):
+        """ Enables the buttons for whatever the user is being offered.
+
+        _showOptions(list of strings) -> None
+
+        options is a list of options, as given by GameEngine.getUserOptions().
+
+        """
+        if options == ['discard']:
+            self._userCanDiscard = True
+            self._hudMenuButton.enable()
+            return
+        for option in options:
+            if option == 'ron':
+                self._hudCallButton.enable()
+                self._hudCallButton.changeText("Ron")
+            elif option == 'tsumo':
+                self._hudCallButton.enable()
+                self._hudCallButton.changeText("Tsumo")
+            elif option == 'kan':
+                self._hudKanButton.enable()
+            elif option == 'kan_la':
+                self._hudKanButton.enable()
+                self._hudKanButton.changeText("Late Kan")
+            elif option == 'kan_cl':
+                self._hudKanButton.enable()
+                self._hudKanButton.changeText("Clos. Kan")
+            elif option == 'pon':
+                self._hudPonButton.enable()
+            elif option == 'chi':
+                self._curChiChoices = self._engine.getChiChoices()
+                self._hudChiButton.enable()
+            elif option == 'riichi':
+                self._hudChiButton.enable()
+                self._hudChiButton.changeText("Riichi")
+        self._enableCancelButtons()
 
-            #Append info about the scores and the round
-            if winningPlayer.isRiichi():
-                totalUraList = self._curWall.getUraList()
-            else:
-                totalUraList = []
-            roundInfo += [winningPlayer, handFu, totalYaku, len(doraList)
-                + len(uraList), self._curWall.getDoraList(), totalUraList,
-                handScore, scoreWord]
-
-            #Prepare the changes in scores
-            if self._endRoundType == 'ron':
-                if (self._playerWon == self._curDealer or
-                        self._playerLost == self._curDealer):
-                    curAmount = int(round(handScore*6,-2))
-                else:
-                    curAmount = int(round(handScore*4,-2))
-                winningPlayer.setScoreDiff(curAmount)
-                self._players[self._playerLost].setScoreDiff(-curAmount)
-            elif self._playerWon == self._curDealer:
-                for playerID in otherPlayers:
-                    player = self._players[playerID]
-                    player.setScoreDiff(int(round(-handScore*2,-2)))
-                winningPlayer.setScoreDiff(int(round(handScore*6,-2)))
-            else:
-                for playerID in otherPlayers:
-                    player = self._players[playerID]
-                    if playerID == self._playerWon:
-                        curAmount = int(round(-handScore*2,-2))
-                        self._players[playerID].setScoreDiff(curAmount)
-                    else:
-                        curAmount = int(round(-handScore,-2))
-                        self._players[playerID].setScoreDiff(curAmount)
-                winningPlayer.setScoreDiff(int(round(handScore*4,-2)))
-    
-            #Riichi sticks
-            riichiBonus = self._riichiStore
-            for player in self._players:
-                if player.isRiichi():
-                    riichiBonus += 1000
-            winningPlayer.addScoreDiff(riichiBonus)
-            self._riichiStore = 0
-
-            #Bonus Dealer ante
-            if self._playerWon == self._curDealer:
-                bonus = 0
-                anteAmount = self._bonusStore + self._curRound[2]
-                for i, player in enumerate(self._players):
-                    if i != self._curDealer:
-                        player.addScoreDiff(-anteAmount*100)
-                    else:
-                        player.addScoreDiff(anteAmount*300)
-                self._bonusStore = 0
-            else:
-                self._players[self._curDealer].addScoreDiff(
-                    100*self._curRound[2])
-        else:
-            #Scores for the no more tiles draw
-            if self._endRoundType == 'nomoretiles':
-                tenpaiList = []
-                notList = []
-                for i, player in enumerate(self._players):
-                    uniqueTiles = self._curWall.getUnique()
-                    if player.isTenpai(uniqueTiles):
-                        player.showHand()
-                        tenpaiList.append(i)
-                    else:
-                        notList.append(i)
-                if tenpaiList:
-                    curAmount1 = 3000/len(tenpaiList)
-                    curAmount2 = 3000/len(notList)
-                    for i in tenpaiList:
-                        self._players[i].setScoreDiff(curAmount1)
-                    for i in notList:
-                        self._players[i].setScoreDiff(-curAmount2)
-            riichiCount = 0
-            for player in self._players:
-                if player.isRiichi():
-                    riichiCount += 1
-            self._riichiStore += riichiCount
-            self._bonusStore += self._curRound[2]
-        
-        #Update the winning table scores
-        self._winTable[0].append(self._getRoundName())
-        self._winTable[0].append('(+- change)')
-        for i, player in enumerate(self._players):
-            self._winTable[i+1].append(player.getScore())
-            self._winTable[i+1].append(player.getScoreDiff())
-
-        #Popup the winning dialog
-        self.popupDialog('WindowRoundEnd', roundInfo)
-        self._skipScoreButton.enable()
-        self._curStageTimer = 0
-        
     def _scoreChange(self):
         """ Step-by-step function for adding/subtracting the score bit by bit.
 
@@ -654,337 +390,16 @@ class GameScreen(MenuScreen):
         if self._curStageTimer%5 == 0: #Intermittently repeat the score sound
             self._master.playButtonSound('scoreSound')
         end = True
-        for player in self._players:
+        for player in self._engine.getPlayers():
             if not player.updateScoreDiff(100):
                 end = False
         if end: #Wait for the user to continue
+            self._scoreChanging = False
             self._skipScoreButton.disable()
             self._invisCancelButton.enable()
             self._hudMenuButton.changeText('Continue')
             self._hudMenuButton.enable()
-            self._curStage = 'playerresponse'
-
-    def _roundFinalise(self):
-        """ Increments the rounds, and checks to see whether the game should end
-        yet. If not, resets all the variables necessary and gets it all ready
-        to rumble. If so, runs _gameEnd().
-
-        _roundFinalise() -> None
-
-        """
-        for player in self._players: #If a player goes below 0, end the game
-            if player.getScore() < 0:
-                self._gameEnd()
-                return
-        if self._playerWon != self._curDealer:
-            if not self._incrRound(): #If we can't go to the next round, end
-                self._gameEnd()
-                return
-            self._curDealer += 1
-            if self._curDealer > 3:
-                self._curDealer = 0
-        else:
-            self._incrBonusRound() #Bonus rounds for dealers
-        for player in self._players:
-            player.resetPlayer() #Reset the player hands
-        for i, player in enumerate(self._players):
-            player.setDealer(self._curDealer == i)
-        self._allocateSeatWinds(self._curDealer)
-        self._resetVars()
-        self._drawTextMid(self._getRoundName())
-        self._curStage = 'roundstart3'
-
-    def _gameEnd(self):
-        """ Determines which player won, and then popups a display
-        congratulating them and that whole shabang, before taking them back to
-        the main menu.
-
-        _gameEnd() -> None
-
-        """
-        winningPlayer = None
-        winningScore = 0
-        self._winTable[0].append('Final Total')
-        for i, player in enumerate(self._players):
-            self._winTable[i+1].append(player.getScore())
-            if player.getScore() > winningScore:
-                winningPlayer = player
-                winningScore = player.getScore()
-        self.popupDialog('WindowGameEnd', [winningPlayer, self._players,
-            self._winTable])
-        self.changeScreen('MainMenu',None)
-
-    #BEFORE TURN CHECKERS
-    def _checkRon(self, curOrder, playerChoice, prevPlayer):
-        """ Goes through each player in an anticlockwise direction and sees if
-        they want to ron the last tile, lets them do so and returns True if yes,
-        returning False if no.
-
-        _checkRon(list of integers, string, integer) -> Boolean
-
-        curOrder is a list containing the three playersID's to check in order.
-        playerChoice is a string containing which button the player pressed.
-        prevPlayer is the ID of the player who discarded the tile
-
-        """
-        for playerID in curOrder: #RON CHECK
-            if self._players[playerID].canRon(self._lastTile,
-                    self.getRoundWind(), self._yakuFile,
-                    self.getGameYaku(self._playerTurn, 'ron')):
-                if playerID == 0: #Separated to avoid a strange bug
-                    if playerChoice == 'ron':
-                        self._ron(0, prevPlayer)
-                        return True
-                elif self._ai[playerID-1].checkRon(self._lastTile):
-                    self._ron(playerID, prevPlayer)
-                    return True
-        return False
-                
-    def _checkKan(self, curOrder, playerChoice):
-        """ Goes through each player in an anticlockwise direction and sees if
-        they want to kan the last tile, lets them do so and returns True if yes,
-        returning False if no.
-
-        _checkKan(list of integers, string) -> Boolean
-
-        curOrder is a list containing the three playersID's to check in order.
-        playerChoice is a string containing which button the player pressed.
-
-        """
-        for playerID in curOrder: #KAN CHECK
-            if self._players[playerID].isRiichi():
-                return False
-            if self._players[playerID].canKan(self._lastTile):
-                if playerID == 0: #Separated to avoid a strange bug
-                    if playerChoice == 'kan':
-                        self._kan(0)
-                        return True
-                elif self._ai[playerID-1].checkKanOpen(self._lastTile):
-                    self._kan(playerID)
-                    return True
-        return False
-                
-    def _checkPon(self, curOrder, playerChoice):
-        """ Goes through each player in an anticlockwise direction and sees if
-        they want to pon the last tile, lets them do so and returns True if yes,
-        returning False if no.
-
-        _checkPon(list of integers, string) -> Boolean
-
-        curOrder is a list containing the three playersID's to check in order.
-        playerChoice is a string containing which button the player pressed.
-
-        """
-        for playerID in curOrder: #PON CHECK
-            if self._players[playerID].isRiichi():
-                return False
-            if self._players[playerID].canPon(self._lastTile):
-                if playerID == 0: #Separated to avoid a strange bug
-                    if playerChoice == 'pon':
-                        self._pon(playerID)
-                        return True
-                elif self._ai[playerID-1].checkPon(self._lastTile):
-                    self._pon(playerID)
-                    return True
-        return False
-                
-    def _checkChi(self, playerChoice):
-        """ Asks the current player if they want to chi the last tile, lets them
-        do so and returns True if yes, returning False if no.
-        If the user is the current player, then it takes their choice of tiles
-        into account.
-
-        _checkPon(string) -> Boolean
-
-        playerChoice is a string containing which button the player pressed.
-
-        """
-        playerID = self._playerTurn
-        if self._players[playerID].isRiichi():
-            return False
-        if playerChoice == 'chi' and playerID == 0:
-            self._chi(0, self._highlightTiles)
-            return True
-        elif playerID != 0:
-            choices = self._players[playerID].canChi(self._lastTile)
-            if choices: #If they can call chi
-                aiChoices = self._ai[playerID-1].checkChi(self._lastTile,
-                    choices)
-                if aiChoices: #If they will call chi
-                    self._chi(playerID, aiChoices)
-                    return True
-        return False
-    
-    #DURING TURN CHECKERS
-    def _tsumoCheck(self):
-        """ Asks the current player if they want to tsumo, lets them do so and
-        returns True if yes, returning False if no.
-
-        _tsumoCheck() -> Boolean
-
-        """
-        if self._optionsDeny: #If they chose 'cancel' this turn
-            return False
-        if self._players[self._playerTurn].canTsumo(self.getRoundWind(),
-                self._yakuFile, self.getGameYaku(self._playerTurn, 'tsumo')):
-            if self._playerTurn == 0:
-                self._hudCallButton.enable()
-                self._hudCallButton.changeText("Tsumo")
-                self._enableCancelButtons()
-                self._curStage = 'playerresponse'
-            else: #If this is an AI player
-                if self._ai[self._playerTurn-1].checkTsumo():
-                    self._tsumo(self._playerTurn)
-                else:
-                    return False
-            return True
-        else:
-            return False
-
-    def _lateKanCheck(self):
-        """ Asks the current player if they want to late kan, lets them do so
-        and returns True if yes, returning False if no.
-
-        _lateKanCheck() -> Boolean
-
-        """
-        if self._players[self._playerTurn].isRiichi(): #Can't kan with riichi
-            return False
-        if self._optionsDeny: #If they chose 'cancel' this turn
-            return False
-        kanTile = self._players[self._playerTurn].canKan_la()
-        if kanTile: #If we can late an
-            if self._playerTurn == 0:
-                self._hudKanButton.enable()
-                self._hudKanButton.changeText("Late Kan")
-                self._enableCancelButtons()
-                self._curStage = 'playerresponse'
-            else: #If this is an AI player
-                if self._ai[self._playerTurn-1].checkKanLate(kanTile):
-                    self._kan_la(self._playerTurn)
-                else:
-                    return False
-            return True
-        else:
-            return False
-
-    def _closedKanCheck(self):
-        """ Asks the current player if they want to closed kan, lets them do so
-        and returns True if yes, returning False if no.
-
-        _closedKanCheck() -> Boolean
-
-        """
-        if self._players[self._playerTurn].isRiichi(): #Can't kan with riichi
-            return False
-        if self._optionsDeny: #If they chose 'cancel' this turn
-            return False
-        kanTile = self._players[self._playerTurn].canKan_cl()
-        if kanTile: #If we can closed kan
-            if self._playerTurn == 0:
-                self._hudKanButton.enable()
-                self._hudKanButton.changeText("Clos. Kan")
-                self._enableCancelButtons()
-                self._curStage = 'playerresponse'
-            else: #If this is an AI player
-                if self._ai[self._playerTurn-1].checkKanClosed(kanTile):
-                    self._kan_cl(self._playerTurn)
-                else:
-                    return False
-            return True
-        else:
-            return False
-
-    def _riichiCheck(self):
-        """ Asks the current player if they want to riichi, lets them do so
-        and returns True if yes, returning False if no.
-
-        _riichiCheck() -> Boolean
-
-        """
-        if self._players[self._playerTurn].isRiichi(): #Obviously, can't riichi
-            return False
-        if self._optionsDeny: #If they chose 'cancel' this turn
-            return False
-        if not self._players[self._playerTurn].isClosed():
-            return False
-        uniqueTiles = self._curWall.getUnique()
-        curPlayerID = self._playerTurn
-        curPlayer = self._players[curPlayerID]
-        if self._players[curPlayerID].isTenpaiFull(uniqueTiles):
-            if self._playerTurn == 0:
-                self._hudChiButton.enable()
-                self._hudChiButton.changeText("Riichi")
-                self._enableCancelButtons()
-                self._curStage = 'playerresponse'
-            else: #If this is an AI player
-                curAI = self._ai[self._playerTurn-1]
-                if curAI.checkRiichi():
-                    self._riichiAI(self._playerTurn, curAI)
-                else:
-                    return False
-            return True
-        else:
-            return False
-
-    #GAMEPLAY FUNCTIONS
-    def _playerDraw(self, playerID):
-        """ Lets the given player draw from the wall, and plays the sound.
-
-        _playerDraw(int) -> None
-
-        playerID is the ID of the player who should draw.
-
-        """
-        self._players[playerID].draw(self._curWall.drawFromWall())
-        self._master.playButtonSound('drawSound')
-
-    def _playerDiscardAni(self, playerID, tileID):
-        """ Flash a tile for a few seconds, then discard it from the hand.
-
-        _playerDiscardAni(int, int) -> None
-
-        playerID is the ID of the player who should discard.
-        tileID is the index of the tile in the player's hand which should be
-        discarded.
-
-        """
-        self._startAnimate('flashTile', (playerID, tileID))
-
-    def _playerDiscardEnd(self):
-        """ After the flashing of a tile is done, get the tile and discard it.
-
-        _playerDiscardEnd() -> None
-
-        """
-        playerID = self._animationInfo[0]
-        tileID = self._animationInfo[1]
-        self._playerDiscard(playerID, tileID)
-
-    def _playerDiscardEndRiichi(self):
-        """ Similar to _playerDiscardEnd, but also declares riichi afterwards.
-
-        _playerDiscardEndRiichi() -> None
-
-        """
-        self._playerDiscardEnd()
-        uniqueTiles = self._curWall.getUnique()
-        self._players[playerID].riichi(uniqueTiles, self._isDouble())
-
-    def _playerDiscard(self, playerID, tileID):
-        """ Discards a given tile index from a given player's hand, playing the
-        appropriate sound.
-
-        _playerDiscard(int, int) -> None
-
-        playerID is the ID of the player who should discard.
-        tileID is the index of the tile in the player's hand which should be
-        discarded.
-
-        """
-        curPlayer = self._players[playerID]
-        self._lastTile = curPlayer.discard(tileID)
-        self._master.playButtonSound('discardSound')
+            self._waitContinue = True
 
     #HIGHLIGHT BUTTON RESPONSES
     def _getChiResponse(self):
@@ -999,7 +414,8 @@ class GameScreen(MenuScreen):
             tileButton.unHighlight() #Unhighlight all previous tiles
         if len(self._highlightTiles) == 2:
             #After they click two tiles, try calling chi
-            self._turnStartCheck2('chi')
+            self._engine.callLastTile('chi', self._highlightTiles)
+            self._highlightTiles = []
         elif len(self._highlightTiles) == 1:
             #After they click one tile, highlight the remaining choices
             firstChoice = self._highlightTiles[0]
@@ -1026,92 +442,14 @@ class GameScreen(MenuScreen):
             tileButton.unHighlight() #Unhighlight all previous tiles
         if len(self._highlightTiles) == 1:
             #After they click one tile, declare riichi
-            self._riichi(0, self._highlightTiles[0])
+            self._engine.takeOption('riichi', self._highlightTiles[0])
             self._highlightTiles = []
         else:
             #Before clicking a tile, highlight all related tiles
-            uniqueTiles = self._curWall.getUnique()
-            possibleTiles = self._players[0].isTenpaiFullPoss(uniqueTiles)
-            for tileInd in possibleTiles:
+            for tileInd in self._engine.getRiichiChoices():
                 self._hudTileButtons[tileInd].highlight('Riichi')
 
     #SUPPORT FUNCTIONS
-    def _resetVars(self):
-        """ Reset all round-based variables to their initial values.
-
-        _resetVars() -> None
-
-        """
-        self._die1 = 1
-        self._die2 = 6
-        self._curTurn = 1
-        self._playerTurn = -1
-        self._lastTile = None
-        self._playerWon = None #Which player just won
-        self._playerLost = None #Which player just lost
-        self._endRoundType = 'none'
-        self._canDouble = True #Is it possible to double riichi?
-        self._optionsDeny = False #Used for cancelling riichi and closed kans
-        self._lastDrawWasDead = False
-        self._userCanDiscard = False #Can only discard when waiting for input
-        self._curWall = Wall(self._repeat, self._suitnum, self._tileFile)
-
-    def _playerOrder(self, startingID):
-        """ Given a playerID to start with, returns a list containing the other
-        playerID's in anticlockwise order after it.
-
-        _playerOrder(int) -> list of integers
-
-        startingID is the playerID to start this list off with.
-
-        """
-        idList = [0,1,2,3]
-        return idList[startingID:] + idList[:startingID]
-
-    def _allocateSeatWinds(self, dealerNum):
-        """ Given the current dealerID, sets the correct seat winds for all
-        players in an anticlockwise direction.
-
-        _allocateSeatWinds(int) -> None
-
-        dealerNum is the ID of the player who is the current dealer.
-
-        """
-        windList = [Tile(52), Tile(51), Tile(54), Tile(53)]
-        for i, playerID in enumerate(self._playerOrder(dealerNum)):
-            self._players[playerID].setSeatWind(windList[i])
-
-    def _getRoundName(self):
-        """ Gets the name of the current round, as text.
-
-        _getRoundName() -> string
-
-        """
-        roundText = self._curRound[0]
-        if self._curRound[1] == 1: roundText += " First Round"
-        if self._curRound[1] == 2: roundText += " Second Round"
-        if self._curRound[1] == 3: roundText += " Third Round"
-        if self._curRound[1] == 4: roundText += " Fourth Round"
-        if self._curRound[2] > 0:
-            roundText += " -- Bonus " + str(self._curRound[2])
-        return roundText
-
-    def _determineSide(self, testPlayer):
-        """ Given a playerID, finds which side the last player who discarded is
-        on around the table, relative to this player. This side is given as 0
-        for 'on the left', 1 for 'in the middle' and 2 for 'on the right'.
-
-        _determineSide(int) -> int
-
-        testPlayer is the playerID from whose perspective we're looking at.
-
-        """
-        playerList = self._playerOrder(self._playerTurn)
-        lastPlayer = playerList[-1]
-        if testPlayer < lastPlayer:
-            testPlayer += 4
-        return testPlayer - lastPlayer - 1
-
     def _enableCancelButtons(self):
         """ Enables all the buttons needed to cancel menu buttons.
 
@@ -1140,225 +478,6 @@ class GameScreen(MenuScreen):
         self._hudCallButton.disable()
         self._invisCancelButton.disable()
 
-    def _deadWallDraw(self):
-        """ Draws from the dead wall, returning the tile and playing a sound.
-
-        _deadWallDraw() -> Tile
-
-        """
-        self._lastDrawWasDead = True
-        self._hudTileButtons = [] #Force this to update
-        self._master.playButtonSound('drawSound')
-        return self._curWall.deadWallDraw()
-
-    def _isDouble(self):
-        """ Returns whether or not the player can double riichi.
-
-        _isDouble() -> Boolean
-
-        """
-        return (self._curTurn <= 4) and self._canDouble
-
-    def _deactSpecialYaku(self):
-        """ Deactivates ippatsu and double riichi for all players.
-
-        _deactSpecialYaku() -> None
-
-        """
-        self._canDouble = False
-        for player in self._players:
-            player.addRiichiTurns(10) #Should be enough to ensure no ippatsu
-
-    def _incrRound(self):
-        """ Increments the current round, returning False if this is the last
-        round and true otherwise.
-
-        _incrRound() -> Boolean
-
-        """
-        if self._curRound[1] == 4:
-            if self._curRound[0] == 'East':
-                if self._isJustEastRound:
-                    return False
-                else:
-                    nextName = 'South'
-            else:
-                return False
-            nextNum = 1
-        else:
-            nextName = self._curRound[0]
-            nextNum = self._curRound[1] + 1
-        self._curRound = (nextName, nextNum, 0)
-        return True
-
-    def _incrBonusRound(self):
-        """ Increments the current bonus round, taking the dealer ante score
-        with it.
-
-        _incrBonusRound() -> None
-
-        """
-        nextBonus = self._curRound[2] + 1
-        self._curRound = (self._curRound[0], self._curRound[1], nextBonus)
-        self._players[self._curDealer].addScore(-100)
-
-    def _pon(self, playerID):
-        """ Declares pon on the last tile for the given playerID, playing sound
-        and displaying the related text.
-
-        _pon(int) -> None
-
-        playerID is the ID of the player who is declaring pon.
-
-        """
-        self._deactSpecialYaku()
-        self._drawTextShort('Pon')
-        self._master.playVoiceSound('ponSound')
-        side = self._determineSide(playerID)
-        self._players[playerID].pon(self._lastTile, side)
-        self._playerTurn = playerID
-        self._startAnimate('pause', 10)
-
-    def _chi(self, playerID, chosenTiles):
-        """ Declares chi on the last tile for the given playerID, playing sound
-        and displaying the related text.
-
-        _chi(int, list of tile indexes) -> None
-
-        playerID is the ID of the player who is declaring chi.
-        chosenTiles is a list of the tile indexes in the hand which will be
-        used for declaring the sequence.
-
-        """
-        self._deactSpecialYaku()
-        self._drawTextShort('Chi')
-        self._master.playVoiceSound('chiSound')
-        self._players[playerID].chi(self._lastTile, chosenTiles)
-        self._playerTurn = playerID
-        self._startAnimate('pause', 10)
-
-    def _kan(self, playerID):
-        """ Declares an open kan on the last tile for the given playerID,
-        playing sound and displaying the related text.
-
-        _kan(int) -> None
-
-        playerID is the ID of the player who is declaring kan.
-
-        """
-        self._deactSpecialYaku()
-        self._drawTextShort('Kan')
-        self._master.playVoiceSound('kanSound')
-        side = self._determineSide(playerID)
-        self._players[playerID].kan_op(self._lastTile, side)
-        self._players[playerID].draw(self._deadWallDraw())
-        self._playerTurn = playerID
-        self._startAnimate('pause', 15)
-
-    def _kan_cl(self, playerID):
-        """ Declares a closed kan on the last tile for the given playerID,
-        playing sound and displaying the related text.
-
-        _kan_cl(int) -> None
-
-        playerID is the ID of the player who is declaring kan.
-
-        """
-        self._deactSpecialYaku()
-        self._drawTextShort('Kan')
-        self._master.playVoiceSound('kanSound')
-        self._players[playerID].kan_cl()
-        self._players[playerID].draw(self._deadWallDraw())
-        self._startAnimate('pause', 15)
-
-    def _kan_la(self, playerID):
-        """ Declares a late kan on the last tile for the given playerID,
-        playing sound and displaying the related text.
-
-        _kan_la(int) -> None
-
-        playerID is the ID of the player who is declaring kan.
-
-        """
-        self._deactSpecialYaku()
-        self._drawTextShort('Kan')
-        self._master.playVoiceSound('kanSound')
-        self._players[playerID].kan_la()
-        self._players[playerID].draw(self._deadWallDraw())
-        self._startAnimate('pause', 15)
-
-    def _riichi(self, playerID, toDiscard):
-        """ Declares riichi on the last tile for the given playerID,
-        playing sound and displaying the related text. This function is used for
-        the user.
-
-        _riichi(int, int) -> None
-
-        playerID is the ID of the player who is declaring riichi.
-        toDiscard is the index of which tile should be discarded in the riichi
-        player's hand.
-
-        """
-        self._drawTextShort('Riichi')
-        self._master.playVoiceSound('riichiSound')
-        uniqueTiles = self._curWall.getUnique()
-        self._playerDiscard(playerID, toDiscard)
-        self._players[playerID].riichi(uniqueTiles, self._isDouble())
-        self._curStage = 'turnend'
-
-    def _riichiAI(self, playerID, curAI):
-        """ Declares riichi on the last tile for the given playerID,
-        playing sound and displaying the related text. This function is used for
-        AI.
-
-        _riichi(int, NoneAI) -> None
-
-        playerID is the ID of the player who is declaring riichi.
-        curAI is the AI who should be asked which tile they want to discard.
-
-        """
-        self._drawTextShort('Riichi')
-        self._master.playVoiceSound('riichiSound')
-        uniqueTiles = self._curWall.getUnique()
-        possTiles = self._players[playerID].isTenpaiFullPoss(uniqueTiles)
-        toDiscard = curAI.checkRiichiDiscard(possTiles)
-        self._startAnimate('flashTileRiichi', (playerID, toDiscard))
-
-    def _tsumo(self, playerID):
-        """ Declares tsumo on the last tile for the given playerID, playing
-        sound and displaying the related text.
-
-        _tsumo(int) -> None
-
-        playerID is the ID of the player who is declaring tsumo.
-
-        """
-        self._drawTextFinal('Tsumo')
-        self._master.playVoiceSound('tsumoSound')
-        self._playerWon = playerID
-        self._startAnimate('pause', 100)
-        self._curStage = 'roundend'
-        self._endRoundType = 'tsumo'
-        
-    def _ron(self, playerID, stolenID):
-        """ Declares ron on the last tile for the given playerID, playing sound
-        and displaying the related text.
-
-        _ron(int, int) -> None
-
-        playerID is the ID of the player who is declaring ron.
-        stolenID is the ID of the player who the tile is being taken from.
-
-        """
-        self._drawTextFinal('Ron')
-        self._master.playVoiceSound('ronSound')
-        self._players[playerID].draw(self._lastTile)
-        self._playerWon = playerID
-        self._playerLost = stolenID
-        self._startAnimate('pause', 100)
-        self._curStage = 'roundend'
-        self._endRoundType = 'ron'
-
     #BUTTON PRESSED FUNCTIONS
     def _buttMenu(self):
         """ Runs the appropriate functions and actions when the menu button is
@@ -1368,16 +487,10 @@ class GameScreen(MenuScreen):
 
         """
         if self._hudMenuButton.getText() == 'Continue': #Go to next round
-            self._roundFinalise()
+            self._waitContinue = False
+            self._engine.step()
         elif self._hudMenuButton.getText() == 'Cancel': #Cancel button
-            if (self._hudCallButton.getText() == 'Tsumo' or
-                    self._hudKanButton.getText() == 'Clos. Kan' or
-                    self._hudKanButton.getText() == 'Late Kan' or
-                    self._hudChiButton.getText() == 'Riichi'): #If user's turn
-                self._curStage = 'turnmid'
-                self._optionsDeny = True
-            else: #If other player's discard
-                self._curStage = 'turnstart'
+            self._engine.declineOption()
         elif self._hudMenuButton.getText() == 'Menu':
             self.popupDialog("WindowGameMenu")
         self._disableButtons()
@@ -1389,11 +502,10 @@ class GameScreen(MenuScreen):
         _buttSkip() -> None
 
         """
-        if self._curStage == 'scorechange':
+        if self._scoreChanging:
             self._skipScoreButton.disable()
-            for player in self._players:
+            for player in self._engine.getPlayers():
                 player.finScoreDiff()
-            self._curStage = 'playerresponse'
 
     def _buttPon(self):
         """ Declares pon when the pon button is clicked.
@@ -1401,7 +513,7 @@ class GameScreen(MenuScreen):
         _buttPon() -> None
 
         """
-        self._turnStartCheck2('pon')
+        self._engine.callLastTile('pon')
         self._disableButtons()
 
     def _buttChi(self):
@@ -1425,13 +537,11 @@ class GameScreen(MenuScreen):
         """
         curText = self._hudKanButton.getText()
         if curText == 'Clos. Kan': #If currently is a closed kan button
-            self._kan_cl(0)
-            self._curStage = 'turnmid'
+            self._engine.takeOption('kan_cl')
         elif curText == 'Late Kan': #If currently is a late kan button
-            self._kan_la(0)
-            self._curStage = 'turnmid'
+            self._engine.takeOption('kan_la')
         else: #If currently is an open kan button
-            self._turnStartCheck2('kan')
+            self._engine.callLastTile('kan')
         self._disableButtons()
 
     def _buttCall(self):
@@ -1441,9 +551,9 @@ class GameScreen(MenuScreen):
 
         """
         if self._hudCallButton.getText() == 'Ron':
-            self._turnStartCheck2('ron')
+            self._engine.callLastTile('ron')
         elif self._hudCallButton.getText() == 'Tsumo':
-            self._tsumo(0)
+            self._engine.takeOption('tsumo')
         self._disableButtons()
 
     def _buttTile(self, tileInd):
@@ -1464,8 +574,7 @@ class GameScreen(MenuScreen):
                 self._getChiResponse()
         else: #If this is just a normal discard
             self._userCanDiscard = False
-            self._playerDiscard(0, tileInd)
-            self._curStage = 'turnend'
+            self._engine.discardTile(tileInd)
             
     #ANIMATION FUNCTIONS
     def _drawTextShort(self, text):
@@ -1539,14 +648,10 @@ class GameScreen(MenuScreen):
         if aniType == 'dice':
             if self._dieTimer():
                 self._animation = False
+                (self._die1, self._die2) = self._animationInfo
         elif aniType == 'flashTile':
             if self._flashTimer():
                 self._animation = False
-                self._playerDiscardEnd()
-        elif aniType == 'flashTileRiichi':
-            if self._flashTimer():
-                self._animation = False
-                self._playerDiscardEndRiichi()
         elif aniType == 'pause':
             if self._curStageTimer == self._animationInfo:
                 self._animation = False
@@ -1643,7 +748,8 @@ class GameScreen(MenuScreen):
         side is which side should be drawn, as in 'top', 'bottom' etc.
 
         """
-        (curIndex, endIndex) = self._curWall.getWallPart(side)
+        curWall = self._engine.getWall()
+        (curIndex, endIndex) = curWall.getWallPart(side)
         size = (mahjongGlobals.TILEWIDTH*(endIndex-curIndex)/2,
             mahjongGlobals.TILEHEIGHT + 10)
         curX = 0
@@ -1651,12 +757,12 @@ class GameScreen(MenuScreen):
         tempSurface.convert_alpha()
         while curIndex < endIndex:
             #Go through each tile between the start and end indexes in the wall
-            if self._curWall[curIndex]: #If the tile exists
+            if curWall[curIndex]: #If the tile exists
                 if curIndex%2 == 0: #Only draw every second tile
-                    if self._curWall.indexIsDoraInd(curIndex): #dora flip
-                        tileSurface = self._loadTileImg(self._curWall[curIndex])
+                    if curWall.indexIsDoraInd(curIndex): #dora flip
+                        tileSurface = self._loadTileImg(curWall[curIndex])
                         tempSurface.blit(tileSurface, (curX, 10))
-                    elif self._curWall.indexInDead(curIndex): #dead wall
+                    elif curWall.indexInDead(curIndex): #dead wall
                         tileSurface = self._tileImgDict[
                             mahjongGlobals.TILEBACKDEADIMG]
                         tempSurface.blit(tileSurface, (curX, 10))
@@ -1665,14 +771,14 @@ class GameScreen(MenuScreen):
                             mahjongGlobals.TILEBACKIMG]
                         tempSurface.blit(tileSurface, (curX, 0))
                     curX += mahjongGlobals.TILEWIDTH
-                elif not self._curWall[curIndex-1]: #Draw small tiles
+                elif not curWall[curIndex-1]: #Draw small tiles
                     #This only runs when the previous tile doesn't exist:
                     #Ie. only when you can see this tile.
                     curX -= mahjongGlobals.TILEWIDTH
                     scaleHeight = int(round(mahjongGlobals.TILEHEIGHT*0.8))
                     scaleWidth = int(round(mahjongGlobals.TILEWIDTH*0.8))
-                    if self._curWall.indexInDead(curIndex): #Dead wall check
-                        if self._curWall.indexInDead(curIndex-1):
+                    if curWall.indexInDead(curIndex): #Dead wall check
+                        if curWall.indexInDead(curIndex-1):
                             scaleX = curX
                         else:
                             scaleX = int(round(curX +
@@ -1783,7 +889,7 @@ class GameScreen(MenuScreen):
         playerID is the ID of which player's hand should be drawn.
 
         """
-        player = self._players[playerID]
+        player = self._engine.getPlayer(playerID)
         tempSurface = pygame.Surface((mahjongGlobals.HANDWIDTH,
             mahjongGlobals.TILEHEIGHT), pygame.SRCALPHA, 32)
         tempSurface.convert_alpha()
@@ -1845,7 +951,7 @@ class GameScreen(MenuScreen):
         _getPlayerHandMelds() -> Surface
 
         """
-        handImmutable = self._players[0].getImmutable()
+        handImmutable = self._engine.getPlayer(0).getImmutable()
         curX = mahjongGlobals.PLAYERHANDWIDTH
         tempSurface = pygame.Surface((mahjongGlobals.PLAYERHANDWIDTH,
             mahjongGlobals.PLAYERTILEHEIGHT), pygame.SRCALPHA, 32)
@@ -1863,9 +969,9 @@ class GameScreen(MenuScreen):
         _getPlayerButtons() -> list of Buttons
 
         """
-        handMutable = self._players[0].getMutable()
-        handMaxsize = self._players[0].getHandsize()
-        handCursize = self._players[0].getTileNum()
+        handMutable = self._engine.getPlayer(0).getMutable()
+        handMaxsize = self._engine.getPlayer(0).getHandsize()
+        handCursize = self._engine.getPlayer(0).getTileNum()
         if handCursize == handMaxsize:
             tileSpace = True
         else:
@@ -1899,12 +1005,13 @@ class GameScreen(MenuScreen):
         curFont = pygame.font.Font(mahjongGlobals.HUDFONT, 17)
     
         #Text for the current round name.
-        roundText = self._getRoundName()
+        roundText = self._engine.getRoundName()
         roundDraw = curFont.render(roundText, True, curColour)
         tempSurface.blit(roundDraw, (10, 5))
 
         #Text for the turns remaining.
-        turnsText = "Turns Remaining -- " + str(self._curWall.getTilesRemaining())
+        turnsText = "Turns Remaining -- " + str(
+            self._engine.getTilesRemaining())
         turnsDraw = curFont.render(turnsText, True, curColour)
         tempSurface.blit(turnsDraw, (10, 30))
         return tempSurface
@@ -1919,8 +1026,8 @@ class GameScreen(MenuScreen):
 
         """
         tempSurface = pygame.Surface((139, 164))
-        curPlayer = self._players[playerID]
-        if self._playerTurn == playerID:
+        curPlayer = self._engine.getPlayer(playerID)
+        if self._engine.getPlayerTurn() == playerID:
             tempSurface.blit(self._hudRightLightImg, (0,0))
             curColour = mahjongGlobals.BLACK
         else:
@@ -1932,20 +1039,15 @@ class GameScreen(MenuScreen):
         nameText = curPlayer.getName()
         nameDraw = curFont.render(nameText, True, curColour)
         tempSurface.blit(nameDraw, (10, 10))
-        if playerID == 0:
+        typeText = self._engine.getAIName(playerID)
+        if typeText is None:
             typeText = "(You)"
-        elif playerID == 1:
-            typeText = self._p1ai
-        elif playerID == 2:
-            typeText = self._p2ai
-        elif playerID == 3:
-            typeText = self._p3ai
         typeDraw = curFont.render(typeText, True, curColour)
         tempSurface.blit(typeDraw, (15, 30))
 
         #Picture for seat wind
-        if not (self._curStage == "roundstart1" or
-                self._curStage == "roundstart2"):
+        if not (self._engine.getStage() == "roundstart1" or
+                self._engine.getStage() == "roundstart2"):
             curWind = curPlayer.getSeatWind()
             windDraw = self._loadTileImg(curWind)
             tempSurface.blit(windDraw, (90, 35))
@@ -1965,7 +1067,7 @@ class GameScreen(MenuScreen):
             riichiText = "(riichi)"
             riichiDraw = curFont.render(riichiText, True, curColour)
             tempSurface.blit(riichiDraw, (10, 110))
-        if playerID == self._curDealer:
+        if playerID == self._engine.getDealer():
             dealerText = "(dealer)"
             dealerDraw = curFont.render(dealerText, True, curColour)
             tempSurface.blit(dealerDraw, (50, 130))
@@ -1996,21 +1098,23 @@ class GameScreen(MenuScreen):
         #Draw carryover sticks
         curFont = pygame.font.Font(mahjongGlobals.HUDFONT, 20)
         curColour = mahjongGlobals.WHITE
-        text1 = curFont.render(" x " + str(self._riichiStore), True, curColour)
-        text2 = curFont.render(" x " + str(self._bonusStore), True, curColour)
+        text1 = curFont.render(" x " + str(self._engine.getRiichiStore()), True,
+            curColour)
+        text2 = curFont.render(" x " + str(self._engine.getBonusStore()), True,
+            curColour)
         tempSurface.blit(self._riichiTinyImg, (355,335))
         tempSurface.blit(text1, (400,345))
         tempSurface.blit(self._bonusTinyImg, (355,385))
         tempSurface.blit(text2, (400,395))
 
         #Riichi Sticks
-        if self._players[0].isRiichi():
+        if self._engine.getPlayer(0).isRiichi():
             tempSurface.blit(self._riichiImg, (342,460))
-        if self._players[1].isRiichi():
+        if self._engine.getPlayer(1).isRiichi():
             tempSurface.blit(self._riichiVertImg, (570,287))
-        if self._players[2].isRiichi():
+        if self._engine.getPlayer(2).isRiichi():
             tempSurface.blit(self._riichiImg, (342,295))
-        if self._players[3].isRiichi():
+        if self._engine.getPlayer(3).isRiichi():
             tempSurface.blit(self._riichiVertImg, (295,287))
 
         #Draw hand names
@@ -2026,12 +1130,12 @@ class GameScreen(MenuScreen):
         tempSurface.blit(p3Draw, (10, 70))
         
         #Draw discards
-        p0DiscardSurface = self._getDiscard(self._players[0])
-        p1DiscardSurface = self._getDiscard(self._players[1])
+        p0DiscardSurface = self._getDiscard(self._engine.getPlayer(0))
+        p1DiscardSurface = self._getDiscard(self._engine.getPlayer(1))
         p1DiscardSurface = pygame.transform.rotate(p1DiscardSurface, 90)
-        p2DiscardSurface = self._getDiscard(self._players[2])
+        p2DiscardSurface = self._getDiscard(self._engine.getPlayer(2))
         p2DiscardSurface = pygame.transform.rotate(p2DiscardSurface, 180)
-        p3DiscardSurface = self._getDiscard(self._players[3])
+        p3DiscardSurface = self._getDiscard(self._engine.getPlayer(3))
         p3DiscardSurface = pygame.transform.rotate(p3DiscardSurface, 270)
         tempSurface.blit(p0DiscardSurface, (337,490))
         tempSurface.blit(p1DiscardSurface, (600,142))
@@ -2091,7 +1195,7 @@ class GameScreen(MenuScreen):
         #Buttons
         self.clearButtons()
         #Tile Buttons
-        currentHandLen = len(self._players[0].getMutable())
+        currentHandLen = len(self._engine.getPlayer(0).getMutable())
         oldHandLen = len(self._hudTileButtons)
         if currentHandLen != oldHandLen: #Update if hand tiles change
             self._hudTileButtons = []
@@ -2142,117 +1246,39 @@ class GameScreen(MenuScreen):
         self._aniText = updateList
         return tempSurface
 
+
     #SAVE/LOAD GAME FUNCTIONS
     def saveGame(self):
-        """ Saves the current game in progress to the files located in
-        SAVEGAMELOC and similar. This can only be run on the player's turn,
-        during the 'choose a discard' phase.
+        """ Saves the current game in progress, along with the background used.
+        This can only be run on the player's turn, during the 'choose a
+        discard' phase.
 
         saveGame() -> None
 
         """
-        #Save main data
-        mainFile = open(mahjongGlobals.SAVEGAMELOC, "w")
-        infoStore = []
-        infoStore.append('self._curRound')
-        infoStore.append('self._riichiStore')
-        infoStore.append('self._bonusStore')
-        infoStore.append('self._curDealer')
-        infoStore.append('self._winTable')
-        infoStore.append('self._playerName')
-        infoStore.append('self._p1ai')
-        infoStore.append('self._p2ai')
-        infoStore.append('self._p3ai')
-        infoStore.append('self._isJustEastRound')
-        infoStore.append('self._bgImgLoc')
-        infoStore.append('self._die1')
-        infoStore.append('self._die2')
-        infoStore.append('self._curTurn')
-        infoStore.append('self._playerTurn')
-        infoStore.append('self._lastTile')
-        infoStore.append('self._canDouble')
-        infoStore.append('self._optionsDeny')
-        infoStore.append('self._lastDrawWasDead')
-        for info in infoStore:
-            mainFile.write(self._getRunnableLine(info))
-            mainFile.write('\n')
-        mainFile.close()
-
-        #Save each player's data
-        self._players[0].saveData(mahjongGlobals.SAVEP1LOC)
-        self._players[1].saveData(mahjongGlobals.SAVEP2LOC)
-        self._players[2].saveData(mahjongGlobals.SAVEP3LOC)
-        self._players[3].saveData(mahjongGlobals.SAVEP4LOC)
-
-        #Save the wall's data
-        self._curWall.saveData(mahjongGlobals.SAVEWALLLOC)
-
-    def _getRunnableLine(self, varName):
-        """ Converts the given variable into a string line which, when run,
-        sets the variable to its own value.
-
-        e.g: If we had some variable x = 4, running _getRunnableLine('x') would
-             return the string 'x = 4'
-
-        _getRunnableLine(string) -> string
-
-        varName is the name of the variable to convert, as a string.
+        self._engine.setViewInfo('bgImgLoc', self._bgImgLoc)
+        self._engine.saveGame()
 
-        """
-        value = eval(varName)
-        value = repr(value)
-        return varName + ' = ' + value
-        
     def loadGame(self):
-        """ Loads a previously saved game from the files located in
-        SAVEGAMELOC and similar.
+        """ Loads a previously saved game, along with the background used.
 
         loadGame() -> None
 
         """
-        #Load the main data
-        mainFile = open(mahjongGlobals.SAVEGAMELOC, "rU")
-        for line in mainFile:
-            exec(line) #Runs all those lines saved with _getRunnableLine
-        mainFile.close()
-
-        #Set some required default starting variables
+        self._engine = GameEngine(None, None, None, None, True)
+        self._bgImgLoc = self._engine.getViewInfo('bgImgLoc',
+            mahjongGlobals.MAINBACKBLUEIMG)
         self._userCanDiscard = True
         self._hudMenuButton.enable()
-        self._curStage = 'playerresponse'
-        self._playerWon = None
-        self._playerLost = None
-        self._endRoundType = 'none'
-        self._players = []
-
-        #Load each player's data
-        self._players.append(PlayerScore(None, None, None, None, None, None,
-            mahjongGlobals.SAVEP1LOC))
-        self._players.append(PlayerScore(None, None, None, None, None, None,
-            mahjongGlobals.SAVEP2LOC))
-        self._players.append(PlayerScore(None, None, None, None, None, None,
-            mahjongGlobals.SAVEP3LOC))
-        self._players.append(PlayerScore(None, None, None, None, None, None,
-            mahjongGlobals.SAVEP4LOC))
-
-        #Load each AI
-        exec('ai1 = ' + self._p1ai + '(self, 1)')
-        exec('ai2 = ' + self._p2ai + '(self, 2)')
-        exec('ai3 = ' + self._p3ai + '(self, 3)')
-        self._ai = [ai1, ai2, ai3]
-
-        #Load the wall's data
-        self._curWall = Wall(None, None, None, mahjongGlobals.SAVEWALLLOC)
-
-        #(Note that the None values in the above are used to simply space out
-        # the arguments given to PlayerScore and Wall; without them, the
-        # constructor would poo itself, though their actual values are quite
-        # irrelevant as they are ignored when the last flag is defined.)
-        
+
     #GETTER FUNCTIONS
+    def getEngine(self):
+        """ Returns the GameEngine running this game. """
+        return self._engine
+
     def getPlayer(self, playerID):
         """ Returns the player at playerID. """
-        return self._players[playerID]
+        return self._engine.getPlayer(playerID)
 
     def getBackImgLoc(self):
         """ Returns the location of the background image. """
@@ -2260,73 +1286,45 @@ class GameScreen(MenuScreen):
 
     def getRoundWind(self):
         """ Returns the current round wind, as a Tile. """
-        textWind = self._curRound[0]
-        if textWind == 'East':
-            return Tile(52)
-        else:
-            return Tile(53)
+        return self._engine.getRoundWind()
 
     def getTilesRemaining(self):
         """ Returns the amount of tiles remaining in the wall. """
-        return self._curWall.getTilesRemaining()
-
-    def getGameYaku(self, playerID, typeDraw):
-        """ Returns the relevant special game yaku.
-
-        getGameYaku(int, string) -> list of Yaku
-
-        playerID is the ID of which player to check.
-        typeDraw is whether they won by tsumo or not.
-
-        """
-        curPlayer = self._players[playerID]
-        temp = []
-        if (self._lastDrawWasDead and playerID == self._playerTurn and
-            typeDraw == 'tsumo'):
-            temp.append(self._yakuRinshan)
-        if self._curWall.getTilesRemaining() <= 0:
-            if typeDraw == 'tsumo':
-                temp.append(self._yakuHaitei)
-            else:
-                temp.append(self._yakuHoutei)
-        return temp
-
-    def getDoraList(self, playerID):
-        """ Returns the list of dora a player has, given their ID. """
-        currentDora = self._curWall.getDoraList()
-        doraList = []
-        for tile in self._players[playerID].returnTiles():
-            if tile in currentDora:
-                doraList.append(tile)
-        return doraList
-
-    def getUraList(self, playerID):
-        """ Returns the list of ura dora a player has, given their ID. """
-        currentDora = self._curWall.getUraList()
-        doraList = []
-        for tile in self._players[playerID].returnTiles():
-            if tile in currentDora:
-                doraList.append(tile)
-        return doraList
+        return self._engine.getTilesRemaining()
 
     def getAllDiscards(self):
         """ Returns a list of all tiles in the discard piles for all players."""
-        temp = []
-        for player in self._players:
-            temp += player.getDiscardPile()
-        return temp
+        return self._engine.getAllDiscards()
 
     def getAllMelds(self):
         """ Returns a list of the tiles in all melds that have been declared."""
-        temp = []
-        for player in self._players:
-            for tileColl in player.getImmutable():
-                temp += tileColl.getTileList()
-        return temp
+        return self._engine.getAllMelds()
+
+    def getVisibleTiles(self):
+        """ Returns the VisibleTiles counting every discard, meld and dora
+        indicator on the table. """
+        return self._engine.getVisibleTiles()
+
+    def getAllDiscardsMask(self):
+        """ Returns which tiles are in the discard piles of any player, as a
+        bitmask of their positions in a count list. """
+        return self._engine.getAllDiscardsMask()
+
+    def getGenbutsuMask(self, playerID):
+        """ Returns the tiles which are completely safe to discard against
+        the given player, as a bitmask of their positions in a count list. """
+        return self._engine.getGenbutsuMask(playerID)
+
+    def getSujiMask(self, playerID):
+        """ Returns the numbered tiles which the given player can't be
+        waiting on with a two-sided wait because of their discards. """
+        return self._engine.getSujiMask(playerID)
+
+    def getKabeMask(self, playerID):
+        """ Returns the numbered tiles which, as far as the given player can
+        see, no one can be waiting on with a two-sided wait. """
+        return self._engine.getKabeMask(playerID)
 
     def getNonRoundWinds(self):
         """ Returns a list of all wind tiles that aren't the round wind. """
-        windList = [Tile(51), Tile(52), Tile(53), Tile(54)]
-        windList.remove(self.getRoundWind())
-        return windList
-        
+        return self._engine.getNonRoundWinds()
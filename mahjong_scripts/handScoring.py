@@ -0,0 +1,272 @@
+################################################################################
+# Copyright (c) 2013, Sean Manson.
+# Part of CSSE1001 Major Project (Assignment 3).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met: 
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer. 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution. 
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" handScoring.py:
+Contains the batch scorer, which scores winning hands without a game being
+played. Each hand is given by a HandDescription, which holds everything its
+score depends on, and scoring one never changes anything outside of it.
+
+Every hand has a canonical key, which is the same for any two descriptions of
+the same hand. Results are kept by this key, so each hand is only scored once,
+and hands which haven't been scored yet are spread across a pool of
+processes. The keys are also what is sent to the pool, as they are small and
+made only of ints.
+
+"""
+
+#Import major libraries
+import multiprocessing
+
+#Import other mahjong modules
+import mahjongGlobals
+from mahjong_rulebase import *
+
+#Scoring settings
+RIICHIFLAG = 1
+IPPATSUFLAG = 2
+TSUMOFLAG = 4
+DEALERWIND = Tile(52) #Seat wind of the dealer
+POOLMINHANDS = 64 #New hands are only sent to the pool if there are this many
+
+class HandDescription(object):
+    """ Everything the score of a winning hand depends on, kept as its
+    canonical key.
+
+    """
+    __slots__ = ('_key',)
+
+    def __init__(self, closedTiles, melds, winTile, seatWind, roundWind,
+            riichi=False, ippatsu=False, tsumo=False, doraAmount=0):
+        """ Describes a winning hand.
+        Constructor: HandDescription(list of Tiles, list of TileCollections,
+            Tile, Tile, Tile, Boolean, Boolean, Boolean, int)
+
+        closedTiles is the tiles in the hand, not counting the winning tile.
+        melds is the called melds in the hand, including closed kans.
+        winTile is the tile the hand was won on.
+        seatWind and roundWind are the Tiles for the seat and round winds.
+        riichi is whether riichi was declared, and ippatsu whether the hand
+        was won within a turn of riichi.
+        tsumo is whether the winning tile was self drawn.
+        doraAmount is the amount of dora in the hand, ura dora included.
+        
+        """
+        if ippatsu and not riichi:
+            raise GameRunningException('Ippatsu without riichi.')
+        flags = 0
+        if riichi:
+            flags |= RIICHIFLAG
+        if ippatsu:
+            flags |= IPPATSUFLAG
+        if tsumo:
+            flags |= TSUMOFLAG
+        meldKeys = [(MELDTYPES.index(tileColl.getType()),
+            tileColl.getMainTile().getUniqueID()) for tileColl in melds]
+        self._key = (tuple(sorted(tile.getUniqueID() for tile in closedTiles)),
+            tuple(sorted(meldKeys)), winTile.getUniqueID(),
+            seatWind.getUniqueID(), roundWind.getUniqueID(), flags,
+            doraAmount)
+
+    def __repr__(self):
+        return 'HandDescription(' + repr(self._key) + ')'
+
+    def __eq__(self, other):
+        return isinstance(other, self.__class__) and self._key == other._key
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def getKey(self):
+        """ The canonical key of this hand, a tuple of:
+            (closed tile IDs, melds as (MELDTYPES index, tile ID), winning
+             tile ID, seat wind ID, round wind ID, flags, dora amount)
+        with the tiles and melds sorted.
+
+        """
+        return self._key
+
+    @classmethod
+    def fromPlayer(cls, player, roundWind, tsumo, doraAmount=0):
+        """ Describes the hand of the given PlayerScore, whose last tile is
+        the one they won on.
+
+        fromPlayer(PlayerScore, Tile, Boolean, int) -> HandDescription
+        
+        """
+        mutable = player.getMutable()
+        return cls(mutable[:-1], player.getImmutable(), mutable[-1],
+            player.getSeatWind(), roundWind, player.isRiichi(),
+            player.isIppatsu(), tsumo, doraAmount)
+
+
+def getScoringSettings():
+    """ Reads the settings that scoring a hand needs from the game settings
+    file.
+
+    getScoringSettings() -> tuple(int, int, int, string)
+
+    Returns (handsize, suitnum, totalsuitnum, yakuFile).
+    
+    """
+    settingsLoad = IOHelper(mahjongGlobals.GAMESETTINGSLOC,
+        mahjongGlobals.DELIMITER, mahjongGlobals.COMMENTIND)
+    return (int(settingsLoad.getRowByOneID('handsize')[1]),
+        int(settingsLoad.getRowByOneID('suitnum')[1]),
+        int(settingsLoad.getRowByOneID('totalsuitnum')[1]),
+        settingsLoad.getRowByOneID('yakufile')[1])
+
+def scoreHandKey(key, settings):
+    """ Scores the hand with the given canonical key.
+    A new PlayerScore is made to hold the hand, so nothing else is changed.
+
+    scoreHandKey(tuple, tuple) -> tuple
+
+    settings is the tuple from getScoringSettings().
+
+    Returns None if the hand isn't a winning hand with at least one yaku, and
+    otherwise (han, fu, yaku IDs, points), with han being -1 for a yakuman.
+    points is what the winner is paid by the other players, not counting
+    riichi or bonus sticks.
+
+    """
+    (handsize, suitnum, totalsuitnum, yakuFile) = settings
+    (closedIDs, meldKeys, winID, seatID, roundID, flags, doraAmount) = key
+    tiles = [Tile(tileID) for tileID in closedIDs] + [Tile(winID)]
+    melds = []
+    for (meldType, tileID) in meldKeys:
+        side = 0
+        if MELDTYPES[meldType] == 'kan_cl':
+            side = -1
+        melds.append(TileCollection(MELDTYPES[meldType], Tile(tileID), side))
+    if len(tiles) + 3*len(melds) != handsize:
+        raise GameRunningException('Wrong amount of tiles in hand.')
+    player = PlayerScore(handsize, suitnum, totalsuitnum, '', 0, Tile(seatID))
+    player.setHand(tiles, melds)
+    if flags & RIICHIFLAG:
+        player.setRiichi(bool(flags & IPPATSUFLAG))
+
+    bestArrange = player.getBestArrange(Tile(roundID),
+        bool(flags & TSUMOFLAG), yakuFile, [], doraAmount)
+    if not bestArrange or not bestArrange[3]:
+        return None
+    (handArrange, handFu, totalYaku, handResult) = bestArrange
+    han = doraAmount
+    for yaku in totalYaku:
+        if player.isClosed():
+            yakuHan = yaku.getScoreClosed()
+        else:
+            yakuHan = yaku.getScoreOpen()
+        if yakuHan == -1: #if yakuman
+            han = -1
+            break
+        han += yakuHan
+    if seatID == DEALERWIND.getUniqueID():
+        points = int(round(handResult[0]*6, -2))
+    else:
+        points = int(round(handResult[0]*4, -2))
+    return (han, handFu, tuple(yaku.getID() for yaku in totalYaku), points)
+
+def _scoreHandInfo(handInfo):
+    """ Scores a (key, settings) tuple, for the process pool. """
+    return scoreHandKey(*handInfo)
+
+
+class BatchScorer(object):
+    """ Scores lists of HandDescriptions, keeping the result for every hand
+    it has scored by the hand's canonical key.
+
+    """
+    def __init__(self, processes=None, settings=None):
+        """ Creates a new BatchScorer.
+        Constructor: BatchScorer(int, tuple)
+
+        processes is the number of processes to score hands in, or None to use
+        every CPU. If 1, all hands are scored in this process.
+        settings is the tuple from getScoringSettings(), read from the game
+        settings file if not given.
+
+        """
+        if settings is None:
+            settings = getScoringSettings()
+        self._settings = settings
+        self._processes = processes
+        self._pool = None #Started the first time it is needed
+        self._results = {}
+
+    def scoreHand(self, hand):
+        """ Scores a single HandDescription, as for scoreHands(). """
+        return self.scoreHands([hand])[0]
+
+    def scoreHands(self, hands, chunksize=32):
+        """ Scores every HandDescription in hands, returning a list of their
+        results in the same order. Hands that haven't been scored before are
+        scored in the pool if there are enough of them.
+
+        scoreHands(list of HandDescriptions, int) -> list of tuples
+
+        See scoreHandKey() for what each result is.
+
+        """
+        keys = [hand.getKey() for hand in hands]
+        newKeys = []
+        for key in keys:
+            if key not in self._results:
+                self._results[key] = None
+                newKeys.append(key)
+        try:
+            handInfo = [(key, self._settings) for key in newKeys]
+            if self._processes == 1 or len(newKeys) < POOLMINHANDS:
+                newResults = map(_scoreHandInfo, handInfo)
+            else:
+                if self._pool is None:
+                    getSuitTable() #Build it once here, not once per worker
+                    self._pool = multiprocessing.Pool(self._processes)
+                newResults = self._pool.map(_scoreHandInfo, handInfo,
+                    chunksize)
+        except:
+            for key in newKeys:
+                del self._results[key]
+            raise
+        for key, result in zip(newKeys, newResults):
+            self._results[key] = result
+        return [self._results[key] for key in keys]
+
+    def getResultCount(self):
+        """ Returns how many hands have results kept. """
+        return len(self._results)
+
+    def clearResults(self):
+        """ Forgets the results of every hand scored so far. """
+        self._results = {}
+
+    def close(self):
+        """ Stops the process pool, if it was started. """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
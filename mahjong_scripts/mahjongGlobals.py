@@ -83,12 +83,10 @@ RIICHISOUND = os.path.join('resources', 'sounds', 'riichi.wav')
 TSUMOSOUND = os.path.join('resources', 'sounds', 'tsumo.wav')
 RONSOUND = os.path.join('resources', 'sounds', 'ron.wav')
 GAMESETTINGSLOC = os.path.join('resources', 'gameplaysettings.txt')
-SAVEGAMELOC = os.path.join('resources', 'savefolder', 'currentsave.txt')
-SAVEP1LOC = os.path.join('resources', 'savefolder', 'currentsavep1.txt')
-SAVEP2LOC = os.path.join('resources', 'savefolder', 'currentsavep2.txt')
-SAVEP3LOC = os.path.join('resources', 'savefolder', 'currentsavep3.txt')
-SAVEP4LOC = os.path.join('resources', 'savefolder', 'currentsavep4.txt')
-SAVEWALLLOC = os.path.join('resources', 'savefolder', 'currentsavewall.txt')
+SAVEGAMELOC = os.path.join('resources', 'savefolder', 'currentsave.dat')
+OLDSAVEGAMELOC = os.path.join('resources', 'savefolder', 'currentsave.txt')
+    #Main file of the old text saves, which can't be loaded any more
+GAMERECORDLOC = os.path.join('resources', 'savefolder', 'gamerecords.txt')
 CREDITSPAGE = os.path.join('resources', 'credits.txt')
 AILIST = ['NoneAI', 'GeoffAI', 'HighHandAI', 'AttackAI', 'DefendAI']
 TILEWIDTH = 35
@@ -5,8 +5,15 @@ tools for loading information about these things.
 
 """
 from selfio import *
+from suitTable import *
+from handCount import *
+from handSummary import *
+from handCache import *
 from player import *
 from playerScore import *
+from callIndex import *
 from tile import *
 from wall import *
 from yaku import *
+from snapshot import *
+from handBatch import *
@@ -0,0 +1,121 @@
+################################################################################
+# Copyright (c) 2013, Sean Manson.
+# Part of CSSE1001 Major Project (Assignment 3).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met: 
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer. 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution. 
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" callIndex.py:
+Contains the definition of the CallIndex class, which keeps track of which
+players at a table could call each tile when it is discarded.
+
+"""
+
+#Import mahjong libraries
+from tile import *
+from selfexcept import *
+
+#The ways a discard can be called, in the order of Player.getCallMasks()
+CALLTYPES = ['ron', 'kan', 'pon', 'chi']
+
+
+class CallIndex(object):
+    """ Maps every tile to the players at a table who could call it if it were
+    discarded, for each type of call.
+
+    For each tile, the players are kept as a bitmask with a bit for each
+    player's ID. Rather than asking each player whether they can call a
+    discard, the index is updated from the players' call masks whenever their
+    hands change, and only the bits of the tiles whose masks changed are
+    touched. Players whose hands haven't changed since the last lookup aren't
+    looked at again beyond checking their hash.
+
+    Being able to ron a tile here only means the hand waits on it; whether it
+    has a yaku and isn't in furiten still has to be checked with canRon().
+
+    """
+    def __init__(self, players):
+        """ A general class used for a table's call index.
+        Constructor: CallIndex(list of Players)
+
+        players is the list of players at the table, in order of their IDs.
+
+        """
+        self._players = players
+        self._callers = [[0]*len(CALLTYPES) for index in range(TILETYPES)]
+            #Bitmask of players for each call type, for each tile
+        self._masks = [(0,)*len(CALLTYPES) for player in players]
+        self._keys = [None for player in players]
+
+    def _updatePlayer(self, playerID):
+        """ Brings the entries for the given player up to date with their
+        hand, if it has changed.
+
+        _updatePlayer(int) -> None
+
+        """
+        player = self._players[playerID]
+        key = (player.getHandHash(), player.getMeldSignature())
+        if key == self._keys[playerID]:
+            return
+        newMasks = player.getCallMasks()
+        bit = 1 << playerID
+        for callType, oldMask in enumerate(self._masks[playerID]):
+            changed = oldMask ^ newMasks[callType]
+            while changed:
+                lowest = changed & -changed
+                index = lowest.bit_length() - 1
+                self._callers[index][callType] ^= bit
+                changed ^= lowest
+        self._masks[playerID] = newMasks
+        self._keys[playerID] = key
+
+    def update(self):
+        """ Brings the index up to date with every player's hand. """
+        for playerID in range(len(self._players)):
+            self._updatePlayer(playerID)
+
+    def getCallers(self, tile):
+        """ Returns bitmasks of which players could ron, kan, pon and chi the
+        given tile, in that order.
+
+        getCallers(Tile) -> list of ints
+
+        """
+        self.update()
+        index = tile.getIndex()
+        if index is None:
+            return [0]*len(CALLTYPES)
+        return self._callers[index]
+
+    def canCall(self, tile, playerID, callType):
+        """ Returns whether the given player could make the given call on the
+        given tile.
+
+        canCall(Tile, int, string) -> Boolean
+
+        callType is one of 'ron', 'kan', 'pon' or 'chi'.
+
+        """
+        if callType not in CALLTYPES:
+            raise GameRunningException('Unknown call type: ' + str(callType))
+        return bool(self.getCallers(tile)[CALLTYPES.index(callType)] &
+            (1 << playerID))
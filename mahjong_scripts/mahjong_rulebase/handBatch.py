@@ -0,0 +1,145 @@
+################################################################################
+# Copyright (c) 2013, Sean Manson.
+# Part of CSSE1001 Major Project (Assignment 3).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met: 
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer. 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution. 
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" handBatch.py:
+Contains tools for checking large batches of hands at once with NumPy, where
+each hand is a row of 34 tile counts in a matrix, laid out as for TileCounts.
+No Tiles, TileCollections or lists are made for any single hand; every check
+is done over the whole matrix at once.
+
+NumPy is only needed for the functions in here, and the rest of the game runs
+without it.
+
+"""
+
+#Import major libraries
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#Import mahjong libraries
+from tile import *
+from suitTable import *
+from handCount import *
+from selfexcept import *
+
+_suitLookup = None #Whether each packed numbered suit can be arranged
+
+def _checkNumpy():
+    """ Raises an error if NumPy can't be used. """
+    if numpy is None:
+        raise GameRunningException('NumPy is needed to check hands in batches')
+
+def _getSuitLookup():
+    """ Returns an array saying whether each packed numbered suit can be
+    broken down into melds and up to one pair, made from the SuitTable the
+    first time it is needed.
+
+    _getSuitLookup() -> numpy array of Booleans
+
+    """
+    global _suitLookup
+    if _suitLookup is None:
+        lookup = numpy.zeros((MAXCOPIES + 1)**SUITLENGTH, dtype=bool)
+        lookup[numpy.array(getSuitTable().getKeys(), dtype=numpy.int64)] = True
+        _suitLookup = lookup
+    return _suitLookup
+
+def getCountMatrix(indexMatrix):
+    """ Turns a matrix of hands given as tile indexes into a matrix of tile
+    counts.
+
+    getCountMatrix(numpy array) -> numpy array
+
+    indexMatrix is an (N, tiles per hand) matrix of tile indexes, as given by
+    Tile.getIndex().
+
+    """
+    _checkNumpy()
+    indexMatrix = numpy.asarray(indexMatrix, dtype=numpy.int64)
+    handNum = indexMatrix.shape[0]
+    offsets = numpy.arange(handNum, dtype=numpy.int64)[:, None]*TILETYPES
+    counts = numpy.bincount((indexMatrix + offsets).ravel(),
+        minlength=handNum*TILETYPES)
+    return counts.reshape(handNum, TILETYPES).astype(numpy.int8)
+
+def checkHandBatch(countMatrix, suitnum):
+    """ Checks every hand in a matrix of tile counts at once, for whether each
+    is a normal hand of melds and a pair, a chiitoitsu or a kokushi musou.
+    For full closed hands, these agree with TileCounts.isComplete(),
+    isChiitoitsu() and isKokushi(); Player.isValid() finds a hand only when it
+    is complete, and PlayerScore.isValid() when it is any of the three.
+
+    checkHandBatch(numpy array, int) -> (numpy array, numpy array,
+        numpy array)
+    Gives an array of Booleans for each: complete, chiitoitsu and kokushi.
+
+    countMatrix is an (N, 34) matrix of tile counts.
+    suitnum is the amount of numbered suits, all others being honours.
+
+    """
+    _checkNumpy()
+    counts = numpy.asarray(countMatrix)
+    if counts.ndim != 2 or counts.shape[1] != TILETYPES:
+        raise GameRunningException('Hands must be given as rows of ' +
+            str(TILETYPES) + ' counts')
+    if counts.size and (counts.min() < 0 or counts.max() > MAXCOPIES):
+        raise GameRunningException('Tile counts must be from 0 to ' +
+            str(MAXCOPIES))
+    counts = counts.astype(numpy.int64)
+    totals = counts.sum(axis=1)
+
+    #Normal hands: every suit must break down, with one pair between them
+    suitLookup = _getSuitLookup()
+    places = (MAXCOPIES + 1)**numpy.arange(SUITLENGTH, dtype=numpy.int64)
+    complete = numpy.ones(len(counts), dtype=bool)
+    pairs = numpy.zeros(len(counts), dtype=numpy.int64)
+    for suit in range(len(SUITSIZES)):
+        start = SUITSTARTS[suit]
+        size = SUITSIZES[suit]
+        suitCounts = counts[:, start:start + size]
+        if suit >= suitnum: #Honours can only be pons and pairs
+            complete &= ((suitCounts == 0) | (suitCounts == 2) |
+                (suitCounts == 3)).all(axis=1)
+            pairs += (suitCounts == 2).sum(axis=1)
+        elif size != SUITLENGTH:
+            raise GameRunningException('Numbered suits must have ' +
+                str(SUITLENGTH) + ' tiles')
+        else:
+            complete &= suitLookup[suitCounts.dot(places)]
+            pairs += suitCounts.sum(axis=1)%3 == 2
+    complete &= pairs == 1
+
+    #Seven different pairs
+    chiitoitsu = (((counts == 0) | (counts == 2)).all(axis=1) &
+        ((counts == 2).sum(axis=1) == 7))
+
+    #One of each terminal and honour, and one more of any of them
+    specials = getSpecialIndexes(suitnum)
+    specialCounts = counts[:, specials]
+    kokushi = ((specialCounts > 0).all(axis=1) &
+        (specialCounts.sum(axis=1) == totals) & (totals > len(specials)))
+    return (complete, chiitoitsu, kokushi)
@@ -0,0 +1,202 @@
+################################################################################
+# Copyright (c) 2013, Sean Manson.
+# Part of CSSE1001 Major Project (Assignment 3).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met: 
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer. 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution. 
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" handCache.py:
+Contains the Zobrist keys used to hash the tiles in a hand, and HandCache, a
+cache of what has been worked out about hands, such as their arrangements and
+waits, so that the same hand never has to be worked out twice.
+
+A hand's hash is the XOR of one random 64-bit key for every tile in it, the
+key depending on the tile and which copy of it that tile is. Adding or
+removing a tile only changes the hash by that one key, so a hand's hash can
+be kept up to date a tile at a time. Two different hands can in theory have
+the same hash, but with 64 bits this is too unlikely to ever happen in play.
+
+"""
+
+#Import major libraries
+import random
+
+#Import mahjong libraries
+from tile import *
+
+#Cache settings
+HASHSEED = 0x5a0b71 #Seed for the Zobrist keys, so hashes never change
+HASHBITS = 64
+HASHCOPIES = 8 #Copies of each tile given a key; more than a hand can hold
+DEFAULTCACHESIZE = 1 << 16 #Entries kept by the shared cache
+EVICTFRACTION = 4 #A full cache throws away 1/this of its entries
+_MISSING = object() #Stands in for a key that isn't in the cache
+
+def _makeHashKeys():
+    """ Makes the Zobrist key for every copy of every tile.
+
+    _makeHashKeys() -> list of lists of ints
+
+    """
+    rng = random.Random(HASHSEED)
+    return [[rng.getrandbits(HASHBITS) for copy in range(HASHCOPIES)]
+        for index in range(TILETYPES)]
+
+HASHKEYS = _makeHashKeys() #Key for each copy of the tile at each index
+
+def getCountsHash(counts):
+    """ Returns the hash of a hand with the given list of counts.
+
+    getCountsHash(list of ints) -> int
+    
+    """
+    handHash = 0
+    for index, amount in enumerate(counts):
+        for copy in range(amount):
+            handHash ^= HASHKEYS[index][copy]
+    return handHash
+
+
+class HandCache(object):
+    """ A bounded cache of what has been worked out about hands. When it is
+    full, the entries that were used longest ago are thrown away, a quarter
+    of the cache at a time so that this doesn't have to happen on every new
+    entry.
+    Keeps count of how many lookups were found, how many weren't, and how
+    many entries had to be thrown away, for working out how big it should be.
+
+    """
+    def __init__(self, maxSize=DEFAULTCACHESIZE):
+        """ Create a new, empty HandCache.
+        Constructor: HandCache(int)
+
+        maxSize is the most entries the cache will hold.
+        
+        """
+        self._maxSize = maxSize
+        self._values = {}
+        self._stamps = {} #When each entry was last used, from _clock
+        self._clock = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __repr__(self):
+        return ('HandCache(' + str(len(self._values)) + '/' +
+            str(self._maxSize) + ')')
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key, default=None):
+        """ Returns the value kept for the given key, or default if there
+        isn't one.
+
+        get(object, object) -> object
+        
+        """
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            self._misses += 1
+            return default
+        self._hits += 1
+        self._stamps[key] = self._clock
+        self._clock += 1
+        return value
+
+    def put(self, key, value):
+        """ Keeps the given value for the given key, throwing away the least
+        recently used entries if the cache is full.
+
+        put(object, object) -> None
+        
+        """
+        if self._maxSize <= 0:
+            return
+        if key not in self._values and len(self._values) >= self._maxSize:
+            self._evict(len(self._values) - self._maxSize +
+                max(1, self._maxSize/EVICTFRACTION))
+        self._values[key] = value
+        self._stamps[key] = self._clock
+        self._clock += 1
+
+    def _evict(self, amount):
+        """ Throws away the given amount of the least recently used entries.
+
+        _evict(int) -> None
+        
+        """
+        if amount <= 0:
+            return
+        stamps = self._stamps
+        cutoff = sorted(stamps.itervalues())[amount - 1]
+        for key, stamp in stamps.items():
+            if stamp <= cutoff:
+                del stamps[key]
+                del self._values[key]
+        self._evictions += amount
+
+    def clear(self):
+        """ Throws away every entry, and resets the counts. """
+        self._values.clear()
+        self._stamps.clear()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def getMaxSize(self):
+        return self._maxSize
+
+    def setMaxSize(self, maxSize):
+        """ Changes the most entries the cache will hold, throwing away the
+        least recently used entries if it now holds too many.
+
+        """
+        self._maxSize = maxSize
+        self._evict(len(self._values) - max(maxSize, 0))
+
+    def getHits(self):
+        return self._hits
+
+    def getMisses(self):
+        return self._misses
+
+    def getEvictions(self):
+        return self._evictions
+
+    def getStats(self):
+        """ Returns (hits, misses, evictions, entries) for the cache.
+
+        getStats() -> tuple(int, int, int, int)
+        
+        """
+        return (self._hits, self._misses, self._evictions, len(self._values))
+
+
+_handCache = HandCache() #Shared by every Player in this process
+
+def getHandCache():
+    """ Returns the HandCache shared by every Player in this process.
+
+    getHandCache() -> HandCache
+    
+    """
+    return _handCache
@@ -0,0 +1,574 @@
+################################################################################
+# Copyright (c) 2013, Sean Manson.
+# Part of CSSE1001 Major Project (Assignment 3).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met: 
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer. 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution. 
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" handCount.py:
+Contains the count based representation of a hand, where a hand is stored as a
+fixed list of 34 tile counts rather than a list of Tile objects, as well as the
+engine used for breaking such a hand down into valid melds and pairs.
+
+"""
+
+#Import mahjong libraries
+from tile import *
+from suitTable import *
+
+def getTileIndex(tile):
+    """ Returns the position of the given tile in a count list.
+
+    getTileIndex(Tile) -> int
+    
+    """
+    return tile.getIndex()
+
+def getIndexID(index):
+    """ Returns the unique tile ID for the given position in a count list.
+
+    getIndexID(int) -> int
+    
+    """
+    suitID = 1
+    while suitID < len(SUITSTARTS) and SUITSTARTS[suitID] <= index:
+        suitID += 1
+    return suitID*10 + index - SUITSTARTS[suitID - 1] + 1
+
+def getIndexTile(index):
+    """ Returns a Tile for the given position in a count list.
+
+    getIndexTile(int) -> Tile
+    
+    """
+    return Tile(getIndexID(index))
+
+def getTilesMask(tileList):
+    """ Returns a bitmask with the bit set for the position in a count list
+    of every tile in tileList.
+
+    getTilesMask(list of Tiles) -> int
+    
+    """
+    mask = 0
+    for tile in tileList:
+        mask |= 1 << getTileIndex(tile)
+    return mask
+
+def getSpecialIndexes(suitnum):
+    """ Returns the positions in a count list of every terminal and honour.
+
+    getSpecialIndexes(int) -> list of ints
+
+    suitnum is the amount of numbered suits, all others being honours.
+    
+    """
+    specials = []
+    for suit in range(len(SUITSIZES)):
+        start = SUITSTARTS[suit]
+        size = SUITSIZES[suit]
+        if suit < suitnum:
+            specials += [start, start + size - 1]
+        else:
+            specials += range(start, start + size)
+    return specials
+
+class TileCounts(object):
+    """ A hand of tiles, stored as the amount of each type of tile there is.
+    Similar to a list of tiles, but much faster to search through and break
+    down into melds, since no Tile objects need to be made or compared.
+
+    """
+    def __init__(self, tileList=()):
+        """ Create a new TileCounts.
+        Constructor: TileCounts(list)
+
+        tileList is an optional list of Tiles to start the counts off with.
+        
+        """
+        self._counts = [0]*TILETYPES
+        for tile in tileList:
+            self._counts[getTileIndex(tile)] += 1
+
+    def __str__(self):
+        return str(self._counts)
+
+    def __repr__(self):
+        return "TileCounts(" + self.__str__() + ")"
+
+    def __getitem__(self, index):
+        return self._counts[index]
+
+    def getCounts(self):
+        return self._counts
+
+    def copy(self):
+        """ Returns a new TileCounts with the same counts as this one.
+
+        copy() -> TileCounts
+        
+        """
+        counts = TileCounts()
+        counts._counts = list(self._counts)
+        return counts
+
+    def getTotal(self):
+        """ Returns the total amount of tiles counted.
+
+        getTotal() -> int
+        
+        """
+        return sum(self._counts)
+
+    def countTile(self, tile):
+        """ Returns how many of the given tile there are.
+
+        countTile(Tile) -> int
+        
+        """
+        return self._counts[getTileIndex(tile)]
+
+    def addTile(self, tile):
+        """ Adds one of the given tile to the counts.
+
+        addTile(Tile) -> None
+        
+        """
+        self._counts[getTileIndex(tile)] += 1
+
+    def removeTile(self, tile):
+        """ Removes one of the given tile from the counts.
+
+        removeTile(Tile) -> None
+        
+        """
+        self._counts[getTileIndex(tile)] -= 1
+
+    def addTiles(self, tileList):
+        """ Adds one of each tile in tileList to the counts.
+
+        addTiles(list of Tiles) -> None
+        
+        """
+        for tile in tileList:
+            self._counts[getTileIndex(tile)] += 1
+
+    def addIndex(self, index):
+        """ Adds one of the tile at the given position to the counts. """
+        self._counts[index] += 1
+
+    def removeIndex(self, index):
+        """ Removes one of the tile at the given position from the counts. """
+        self._counts[index] -= 1
+
+    def getNearIndexes(self, suitnum, suits=None):
+        """ Returns the positions of every tile that could make a meld with
+        the counted tiles: in an honour suit, only the tiles that are already
+        counted, and in a numbered suit, any tile up to two away from one.
+
+        getNearIndexes(int, list) -> list of ints
+
+        suitnum is the amount of numbered suits, all others being honours.
+        suits is an optional list of which suits to look in, instead of all.
+        
+        """
+        if suits is None:
+            suits = range(len(SUITSIZES))
+        temp = []
+        for suit in suits:
+            start = SUITSTARTS[suit]
+            end = start + SUITSIZES[suit]
+            for index in range(start, end):
+                if suit >= suitnum:
+                    if self._counts[index]:
+                        temp.append(index)
+                elif any(self._counts[max(index - 2, start):min(index + 3,
+                        end)]):
+                    temp.append(index)
+        return temp
+
+    def getBrokenSuits(self, suitnum):
+        """ Returns which suits can't be broken down into pons, chis and
+        pairs by themselves.
+
+        getBrokenSuits(int) -> list of ints
+
+        suitnum is the amount of numbered suits, all others being honours.
+        
+        """
+        counts = self._counts
+        suitTable = getSuitTable()
+        temp = []
+        for suit in range(len(SUITSIZES)):
+            start = SUITSTARTS[suit]
+            size = SUITSIZES[suit]
+            if not any(counts[start:start + size]):
+                continue
+            if suit >= suitnum:
+                if suitTable.getHonourSets(counts, start, size) is None:
+                    temp.append(suit)
+            elif not suitTable.getArrangements(counts, start, size):
+                temp.append(suit)
+        return temp
+
+    def getArrangement(self, suitnum):
+        """ Breaks the counted tiles down into pons, chis and a pair.
+        Gives the same arrangement as Player.getValidArrange() and
+        Player.getValidArrangePair() would, in the same order: suit by suit,
+        with the pair coming after the melds of its suit.
+        Returns [] if the tiles cannot be arranged.
+
+        getArrangement(int) -> list of TileCollections
+
+        suitnum is the amount of numbered suits, all others being honours.
+        
+        """
+        for arrange in self.iterArrangements(suitnum):
+            return arrange
+        return []
+
+    def getShanten(self, suitnum, meldNum=0):
+        """ Works out the shanten of the counted tiles as a normal hand of
+        melds and a pair; that is, how many more tiles need to be swapped
+        before the hand is one away from being valid. A hand that is already
+        one tile away gives 0, and a hand that is valid gives -1.
+        Does not consider unique hands like chiitoitsu.
+
+        getShanten(int, int) -> int
+
+        suitnum is the amount of numbered suits, all others being honours.
+        meldNum is the amount of melds that have already been called.
+        
+        """
+        counts = self._counts
+        suitTable = getSuitTable()
+        parts = {(0, 0): 0}
+        for suit in range(len(SUITSIZES)):
+            start = SUITSTARTS[suit]
+            size = SUITSIZES[suit]
+            if not any(counts[start:start + size]):
+                continue
+            parts = mergeShantenParts(parts, suitTable.getShantenParts(counts,
+                start, size, suit >= suitnum))
+        best = 2*MAXMELDS
+        for (melds, pairs), partials in parts.items():
+            melds = min(melds + meldNum, MAXMELDS)
+            partials = min(partials, MAXMELDS - melds)
+            best = min(best, 2*MAXMELDS - 2*melds - partials - pairs)
+        return best
+
+    def getChiitoitsuShanten(self):
+        """ Works out the shanten of the counted tiles as a chiitoitsu (seven
+        different pairs). Only makes sense for a hand with no calls.
+
+        getChiitoitsuShanten() -> int
+        
+        """
+        pairs = 0
+        kinds = 0
+        for number in self._counts:
+            if number:
+                kinds += 1
+                if number > 1:
+                    pairs += 1
+        return 6 - pairs + max(0, 7 - kinds)
+
+    def getKokushiShanten(self, suitnum):
+        """ Works out the shanten of the counted tiles as a kokushi musou (one
+        of each terminal and honour, plus a pair of one of them). Only makes
+        sense for a hand with no calls.
+
+        getKokushiShanten(int) -> int
+
+        suitnum is the amount of numbered suits, all others being honours.
+        
+        """
+        specials = getSpecialIndexes(suitnum)
+        kinds = 0
+        hasPair = 0
+        for index in specials:
+            if self._counts[index]:
+                kinds += 1
+                if self._counts[index] > 1:
+                    hasPair = 1
+        return len(specials) - kinds - hasPair
+
+    def isComplete(self, suitnum):
+        """ Checks whether the counted tiles can be broken down into pons,
+        chis and a pair, without working out what the arrangement is.
+        Agrees with getArrangement() for any non-empty counts.
+
+        isComplete(int) -> Boolean
+
+        suitnum is the amount of numbered suits, all others being honours.
+        
+        """
+        counts = self._counts
+        suitTable = getSuitTable()
+        pairCount = 0
+        for suit in range(len(SUITSIZES)):
+            start = SUITSTARTS[suit]
+            size = SUITSIZES[suit]
+            total = sum(counts[start:start + size])
+            if total == 0:
+                continue
+            if pairCount > 1: #more than one pair in the suits -> invalid
+                return False
+            if suit >= suitnum:
+                honourSets = suitTable.getHonourSets(counts, start, size)
+                if honourSets is None:
+                    return False
+                for setType, pos in honourSets:
+                    if setType == 'pair':
+                        pairCount += 1
+            else:
+                if total%3 == 2:
+                    pairCount += 1
+                if not suitTable.getArrangements(counts, start, size):
+                    return False
+        return pairCount <= 1 #The last suit can hold extra pairs too
+
+    def isChiitoitsu(self):
+        """ Checks whether the counted tiles are seven different pairs.
+
+        isChiitoitsu() -> Boolean
+        
+        """
+        pairs = 0
+        for number in self._counts:
+            if number == 2:
+                pairs += 1
+            elif number != 0:
+                return False
+        return pairs == 7
+
+    def isKokushi(self, suitnum):
+        """ Checks whether the counted tiles are one of each terminal and
+        honour, plus one more of any of them.
+
+        isKokushi(int) -> Boolean
+
+        suitnum is the amount of numbered suits, all others being honours.
+        
+        """
+        specials = getSpecialIndexes(suitnum)
+        specialTotal = 0
+        for index in specials:
+            if not self._counts[index]:
+                return False
+            specialTotal += self._counts[index]
+        return specialTotal == self.getTotal() > len(specials)
+
+    def iterArrangements(self, suitnum):
+        """ Generates every distinct way of breaking the counted tiles down
+        into pons, chis and a pair, one at a time. The first arrangement given
+        is always the same one returned by getArrangement().
+        Each suit is looked up in the shared SuitTable rather than searched.
+        Gives nothing if the tiles cannot be arranged.
+
+        iterArrangements(int) -> generator of lists of TileCollections
+
+        suitnum is the amount of numbered suits, all others being honours.
+        
+        """
+        counts = self._counts
+        suitTable = getSuitTable()
+        suitParts = []
+        pairCount = 0
+        for suit in range(len(SUITSIZES)):
+            start = SUITSTARTS[suit]
+            size = SUITSIZES[suit]
+            total = sum(counts[start:start + size])
+            if total == 0:
+                continue
+            if pairCount > 1: #more than one pair in the suits -> invalid
+                return
+            if suit >= suitnum: #Honour suits can only hold pons and pairs
+                honourSets = suitTable.getHonourSets(counts, start, size)
+                if honourSets is None:
+                    return
+                for setType, pos in honourSets:
+                    if setType == 'pair':
+                        pairCount += 1
+                suitArranges = (honourSets,)
+            else:
+                if total%3 == 2: #Has a pair
+                    pairCount += 1
+                suitArranges = suitTable.getArrangements(counts, start, size)
+                if not suitArranges:
+                    return
+            suitParts.append(self._makeSuitColls(suit, suitArranges))
+        if pairCount > 1: #The last suit can hold extra pairs too
+            return
+        for arrange in self._iterSuitParts(suitParts, 0):
+            yield arrange
+
+    def _makeSuitColls(self, suit, suitArranges):
+        """ Turns each arrangement of a suit from the SuitTable into a list of
+        TileCollections.
+
+        _makeSuitColls(int, tuple of tuples) -> list of lists
+        
+        """
+        temp = []
+        for suitSets in suitArranges:
+            colls = []
+            for setType, pos in suitSets:
+                mainTile = Tile((suit + 1)*10 + pos + 1)
+                colls.append(TileCollection(setType, mainTile, -1))
+            temp.append(colls)
+        return temp
+
+    def _iterSuitParts(self, suitParts, partNum):
+        """ Generates every combination of the arrangements of each suit in
+        suitParts, from partNum onwards, as lists of TileCollections.
+
+        _iterSuitParts(list of lists, int) -> generator
+        
+        """
+        if partNum == len(suitParts):
+            yield []
+            return
+        for suitColls in suitParts[partNum]:
+            for rest in self._iterSuitParts(suitParts, partNum + 1):
+                yield suitColls + rest
+
+
+def getSujiMask(safeMask, suitnum):
+    """ Returns the numbered tiles which are suji against a player who can't
+    ron any tile in safeMask, as a bitmask of their positions in a count
+    list. A tile is suji if, for every two-sided wait on it, the other tile
+    of that wait is in safeMask; so the player can't be waiting on it with
+    a two-sided wait.
+
+    getSujiMask(int, int) -> int
+
+    suitnum is the number of numbered suits in the game.
+    
+    """
+    suji = 0
+    for suit in range(min(suitnum, len(SUITSIZES))):
+        size = SUITSIZES[suit]
+        suitMask = (1 << size) - 1
+        safe = (safeMask >> SUITSTARTS[suit]) & suitMask
+        noHigher = suitMask & ~((1 << (size - 3)) - 1) #No wait with tile+3
+        noLower = (1 << 3) - 1 #No wait with tile-3
+        suitSuji = (safe >> 3 | noHigher) & (safe << 3 | noLower) & suitMask
+        suji |= suitSuji << SUITSTARTS[suit]
+    return suji
+
+
+class VisibleTiles(TileCounts):
+    """ Counts of every tile that all players can see on the table: the
+    discard piles, the called melds and the dora indicators.
+    Kept up to date as each tile is shown, so that the tiles that are still
+    live can be worked out without going through the table each time.
+    The dora indicators are also counted by themselves, so that the tiles
+    which have been played to the table can be told apart from them.
+
+    """
+    def __init__(self, repeat, tileList=(), indicatorList=()):
+        """ Create a new VisibleTiles.
+        Constructor: VisibleTiles(int, list, list)
+
+        repeat is the amount of each individual tile there is in the game.
+        tileList is an optional list of Tiles which are already visible.
+        indicatorList is an optional list of dora indicators which are
+        already visible.
+        
+        """
+        TileCounts.__init__(self, tileList)
+        self._repeat = repeat
+        self._indicators = [0]*TILETYPES
+        for tile in indicatorList:
+            self.addIndicator(tile)
+
+    def __repr__(self):
+        return "VisibleTiles(" + self.__str__() + ")"
+
+    def getRepeat(self):
+        return self._repeat
+
+    def getLiveCount(self, index, handCounts):
+        """ Returns how many copies of the tile at index could still be drawn
+        by a player, given the counts of their own hand.
+
+        getLiveCount(int, TileCounts) -> int
+        
+        """
+        return max(0, self._repeat - self._counts[index] - handCounts[index])
+
+    def addIndicator(self, tile):
+        """ Adds a newly shown dora indicator to the counts.
+
+        addIndicator(Tile) -> None
+        
+        """
+        index = getTileIndex(tile)
+        self._counts[index] += 1
+        self._indicators[index] += 1
+
+    def getTableCount(self, index):
+        """ Returns how many copies of the tile at index are in the discard
+        piles and called melds, leaving out the dora indicators.
+
+        getTableCount(int) -> int
+        
+        """
+        return self._counts[index] - self._indicators[index]
+
+    def getDeadMask(self, handCounts):
+        """ Returns the tiles which a player can see every copy of, given the
+        counts of their own hand, as a bitmask of their positions in a count
+        list.
+
+        getDeadMask(TileCounts) -> int
+        
+        """
+        mask = 0
+        for index in range(TILETYPES):
+            if self._counts[index] + handCounts[index] >= self._repeat:
+                mask |= 1 << index
+        return mask
+
+    def getKabeMask(self, handCounts, suitnum):
+        """ Returns the numbered tiles which no player can be waiting on with
+        a two-sided wait, because every such wait would need a tile which the
+        player with the given hand counts can see every copy of. Given as a
+        bitmask of their positions in a count list.
+
+        getKabeMask(TileCounts, int) -> int
+
+        suitnum is the number of numbered suits in the game.
+        
+        """
+        deadMask = self.getDeadMask(handCounts)
+        kabe = 0
+        for suit in range(min(suitnum, len(SUITSIZES))):
+            size = SUITSIZES[suit]
+            suitMask = (1 << size) - 1
+            dead = (deadMask >> SUITSTARTS[suit]) & suitMask
+            noHigher = suitMask & ~((1 << (size - 3)) - 1) #No wait above
+            noLower = (1 << 3) - 1 #No wait below
+            suitKabe = ((dead >> 1 | dead >> 2 | noHigher) &
+                (dead << 1 | dead << 2 | noLower) & suitMask)
+            kabe |= suitKabe << SUITSTARTS[suit]
+        return kabe
@@ -0,0 +1,366 @@
+################################################################################
+# Copyright (c) 2013, Sean Manson.
+# Part of CSSE1001 Major Project (Assignment 3).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met: 
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer. 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution. 
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" handSummary.py:
+Contains HandSummary, a summary of everything about a winning hand that its
+yaku depend on, worked out in a single pass over the hand and its
+arrangement. Yaku are found from the summary as a bitmask, which is only
+turned back into Yaku at the very end.
+
+"""
+
+#Import mahjong libraries
+from tile import *
+from yaku import *
+
+#Yaku found from the hand, in the order they are listed for a hand
+HANDYAKU = ['yakupaiGD', 'yakupaiRD', 'yakupaiWD', 'yakupaiSeatWind',
+    'yakupaiRoundWind', 'tsumo', 'riichi', 'riichidb', 'ippatsu', 'pinfu',
+    'tanyao', 'iipeikou', 'itsuu', 'chanta', 'sanshoku', 'sanshokualt',
+    'chiitoitsu', 'toitoi', 'sanankou', 'sankantsu', 'honitsu', 'junchan',
+    'ryanpeikou', 'shousangen', 'honroutou', 'honroutouPairs', 'chinitsu',
+    'daisangen', 'suuankou', 'tsuiisou', 'chinroutou', 'ryuuiisou', 'chuuren',
+    'kokushi', 'tenhou', 'chiihou']
+HANDYAKUBITS = dict((yakuID, 1 << pos) for (pos, yakuID) in enumerate(HANDYAKU))
+YAKUMANMASK = ~(HANDYAKUBITS['daisangen'] - 1)
+    #Every yakuman comes after daisangen
+
+#Flags for what sort of tile each tile is
+SPECIALFLAG = 1
+HONOURFLAG = 2
+TERMINALFLAG = 4
+GREENFLAG = 8
+ALLFLAGS = SPECIALFLAG | HONOURFLAG | TERMINALFLAG | GREENFLAG
+
+GREENIDS = [41, 12, 13, 14, 16, 18]
+KOKUSHIIDS = [11, 19, 21, 29, 31, 39, 41, 42, 43, 51, 52, 53, 54]
+DRAGONIDS = [41, 42, 43]
+PONTYPES = ['pon', 'kan_cl', 'kan_op']
+_tileFlags = {} #The flags for every tile, by amount of numbered suits
+
+def getTileFlags(suitnum):
+    """ Returns a list of the flags for the tile at each position in a count
+    list, given the amount of numbered suits.
+
+    getTileFlags(int) -> list of ints
+    
+    """
+    flags = _tileFlags.get(suitnum)
+    if flags is None:
+        flags = []
+        for suit in range(len(SUITSIZES)):
+            for tileID in range(1, SUITSIZES[suit] + 1):
+                tile = Tile((suit + 1)*10 + tileID)
+                curFlags = 0
+                if tile.isSpecial(suitnum):
+                    curFlags |= SPECIALFLAG
+                if tile.isHonour(suitnum):
+                    curFlags |= HONOURFLAG
+                if tile.isTerminal(suitnum):
+                    curFlags |= TERMINALFLAG
+                if tile.getUniqueID() in GREENIDS:
+                    curFlags |= GREENFLAG
+                flags.append(curFlags)
+        _tileFlags[suitnum] = flags
+    return flags
+
+def getMaskYaku(mask, registry):
+    """ Turns a bitmask of hand yaku into a list of Yaku from the given
+    registry, in the order they are listed for a hand.
+
+    getMaskYaku(int, YakuRegistry) -> list of Yaku
+    
+    """
+    temp = []
+    while mask:
+        bit = mask & -mask
+        temp.append(registry.getYaku(HANDYAKU[bit.bit_length() - 1]))
+        mask ^= bit
+    return temp
+
+
+class HandSummary(object):
+    """ A summary of a winning hand, for finding its yaku.
+    Holds the counts of every tile, what sorts of tiles and suits are in the
+    hand, and what the melds in one arrangement of the hand are, all worked
+    out in one pass so that no yaku has to look through the hand itself.
+
+    """
+    __slots__ = ('_counts', '_total', '_anyFlags', '_allFlags', '_honitsu',
+        '_chinitsu', '_chuuren', '_kokushi', '_chiPairs', '_itsuu', '_chanta',
+        '_junchan', '_sanshoku', '_sanshokuAlt', '_toitoi', '_closedPons',
+        '_kans')
+
+    def __init__(self, mutable, immutable, currentArrange, suitnum):
+        """ Sums up the given hand.
+        Constructor: HandSummary(list of Tiles, list of TileCollections,
+            list of TileCollections, int)
+
+        mutable and immutable are the tiles and called melds in the hand.
+        currentArrange is the full arrangement of the hand into melds and a
+        pair, including the called melds, or -1 for a seven pairs hand.
+        suitnum is the amount of numbered suits, all others being honours.
+        
+        """
+        flags = getTileFlags(suitnum)
+        counts = [0]*TILETYPES
+        for tile in mutable:
+            counts[tile.getIndex()] += 1
+        self._kokushi = False
+        if len(mutable) >= 14: #Only the hand itself counts for this
+            self._kokushi = self._isKokushi(counts, flags)
+        for tileColl in immutable:
+            index = tileColl.getMainTile().getIndex()
+            setType = tileColl.getType()
+            if setType == 'chi':
+                counts[index] += 1
+                counts[index + 1] += 1
+                counts[index + 2] += 1
+            elif setType == 'pon':
+                counts[index] += 3
+            elif setType == 'pair':
+                counts[index] += 2
+            else:
+                counts[index] += 4
+        self._counts = counts
+
+        #Go through every tile once for the tile based yaku
+        anyFlags = 0
+        allFlags = ALLFLAGS
+        suits = 0
+        numberedSuits = 0
+        total = 0
+        for suit in range(len(SUITSIZES)):
+            start = SUITSTARTS[suit]
+            for index in range(start, start + SUITSIZES[suit]):
+                if counts[index]:
+                    anyFlags |= flags[index]
+                    allFlags &= flags[index]
+                    suits |= 1 << suit
+                    if not flags[index] & HONOURFLAG:
+                        numberedSuits |= 1 << suit
+                    total += counts[index]
+        self._total = total
+        self._anyFlags = anyFlags
+        self._allFlags = allFlags
+        self._honitsu = (bool(anyFlags & HONOURFLAG) and
+            numberedSuits & (numberedSuits - 1) == 0)
+        self._chinitsu = suits & (suits - 1) == 0
+        self._chuuren = False
+        if total >= 14:
+            for suit in range(suitnum):
+                if suit < len(SUITSIZES) and SUITSIZES[suit] == 9:
+                    start = SUITSTARTS[suit]
+                    if min(counts[start:start + 9]) > 0:
+                        self._chuuren = True
+
+        #Then every meld once for the arrangement based yaku
+        self._chiPairs = 0
+        self._itsuu = False
+        self._chanta = False
+        self._junchan = False
+        self._sanshoku = False
+        self._sanshokuAlt = False
+        self._toitoi = False
+        self._closedPons = 0
+        self._kans = 0
+        if currentArrange != -1:
+            self._sumArrange(currentArrange, flags, suitnum)
+
+    def _isKokushi(self, counts, flags):
+        """ Whether the given counts of the hand itself make a kokushi. """
+        for tileID in KOKUSHIIDS:
+            if not counts[Tile(tileID).getIndex()]:
+                return False
+        for index in range(TILETYPES):
+            if counts[index] and not flags[index] & SPECIALFLAG:
+                return False
+        return True
+
+    def _sumArrange(self, currentArrange, flags, suitnum):
+        """ Sums up the melds in the given arrangement of the hand. """
+        chiCounts = {}
+        ponIDs = set()
+        chanta = junchan = len(currentArrange) > 0
+        for tileColl in currentArrange:
+            setType = tileColl.getType()
+            mainTile = tileColl.getMainTile()
+            index = mainTile.getIndex()
+            if setType == 'chi':
+                uniqueID = mainTile.getUniqueID()
+                chiCounts[uniqueID] = chiCounts.get(uniqueID, 0) + 1
+                collFlags = flags[index] | flags[index + 1] | flags[index + 2]
+            else:
+                collFlags = flags[index]
+                if setType in PONTYPES:
+                    ponIDs.add((mainTile.getUniqueID(), setType))
+                    if tileColl.getSide() == -1:
+                        self._closedPons += 1
+                    if setType != 'pon':
+                        self._kans += 1
+            if not collFlags & SPECIALFLAG:
+                chanta = False
+            if not collFlags & TERMINALFLAG:
+                junchan = False
+        self._chanta = chanta
+        self._junchan = junchan
+        self._toitoi = len(currentArrange) > 0 and not chiCounts
+
+        for (uniqueID, count) in chiCounts.items():
+            self._chiPairs += count/2
+            suitCount = 0
+            for suitID in range(1, suitnum + 1):
+                if suitID*10 + uniqueID%10 in chiCounts:
+                    suitCount += 1
+            if suitCount == 3:
+                self._sanshoku = True
+        for suitID in range(1, suitnum + 1):
+            if (suitID*10 + 1 in chiCounts and suitID*10 + 4 in chiCounts and
+                    suitID*10 + 7 in chiCounts):
+                self._itsuu = True
+        for (uniqueID, setType) in ponIDs:
+            ponCount = 0
+            for suitID in range(1, suitnum + 1):
+                for otherType in PONTYPES:
+                    if (suitID*10 + uniqueID%10, otherType) in ponIDs:
+                        ponCount += 1
+            if ponCount == 3:
+                self._sanshokuAlt = True
+
+    def getCounts(self):
+        return self._counts
+
+    def getTotal(self):
+        return self._total
+
+    def countTile(self, tile):
+        """ Returns how many of the given tile there are in the hand. """
+        index = tile.getIndex()
+        if index is None:
+            return 0
+        return self._counts[index]
+
+    def getYakuMask(self, roundWind, seatWind, currentFu, selfDrawn, closed,
+            riichi, doubleRiichi, riichiTurns, canTenhou, canChiihou):
+        """ Works out the yaku of the hand as a bitmask of HANDYAKUBITS.
+        If the hand has any yakuman, only the yakuman are given.
+        Yaku which invalidate others have not been applied.
+
+        getYakuMask(Tile, Tile, int, Boolean, Boolean, Boolean, Boolean, int,
+            Boolean, Boolean) -> int
+
+        roundWind and seatWind are the Tiles for the round and seat winds.
+        currentFu is the fu of the hand in this arrangement.
+        selfDrawn is whether the last tile was self drawn.
+        closed is whether the hand has no open melds.
+        riichi, doubleRiichi and riichiTurns are the hand's riichi state.
+        canTenhou and canChiihou are whether the hand won on its first draw.
+        
+        """
+        bits = HANDYAKUBITS
+        counts = self._counts
+        dragons = [self.countTile(Tile(tileID)) for tileID in DRAGONIDS]
+        mask = 0
+
+        #Yakuman hands
+        if min(dragons) > 2:
+            mask |= bits['daisangen']
+        if self._closedPons == 4:
+            mask |= bits['suuankou']
+        if self._allFlags & HONOURFLAG:
+            mask |= bits['tsuiisou']
+        if self._allFlags & TERMINALFLAG:
+            mask |= bits['chinroutou']
+        if self._allFlags & GREENFLAG:
+            mask |= bits['ryuuiisou']
+        if self._chuuren:
+            mask |= bits['chuuren']
+        if self._kokushi:
+            mask |= bits['kokushi']
+        if canTenhou:
+            mask |= bits['tenhou']
+        if canChiihou:
+            mask |= bits['chiihou']
+        if mask: #yakuman override other yaku
+            return mask
+
+        #Basic yaku
+        if dragons[0] > 2:
+            mask |= bits['yakupaiGD']
+        if dragons[1] > 2:
+            mask |= bits['yakupaiRD']
+        if dragons[2] > 2:
+            mask |= bits['yakupaiWD']
+        if self.countTile(seatWind) > 2:
+            mask |= bits['yakupaiSeatWind']
+        if self.countTile(roundWind) > 2:
+            mask |= bits['yakupaiRoundWind']
+        if closed and selfDrawn:
+            mask |= bits['tsumo']
+        if riichi:
+            mask |= bits['riichi']
+        if doubleRiichi:
+            mask |= bits['riichidb']
+        if riichiTurns < 4 and riichi:
+            mask |= bits['ippatsu']
+        if closed and ((currentFu == 20 and selfDrawn) or
+                (currentFu == 30 and not selfDrawn)):
+            mask |= bits['pinfu']
+        if not self._anyFlags & SPECIALFLAG:
+            mask |= bits['tanyao']
+        if closed and self._chiPairs >= 1:
+            mask |= bits['iipeikou']
+        if self._itsuu:
+            mask |= bits['itsuu']
+        if self._chanta:
+            mask |= bits['chanta']
+        if self._sanshoku:
+            mask |= bits['sanshoku']
+        if self._sanshokuAlt:
+            mask |= bits['sanshokualt']
+        if currentFu == 25:
+            mask |= bits['chiitoitsu']
+        if self._toitoi:
+            mask |= bits['toitoi']
+        if self._closedPons >= 3:
+            mask |= bits['sanankou']
+        if self._kans >= 3:
+            mask |= bits['sankantsu']
+        if self._honitsu:
+            mask |= bits['honitsu']
+        if self._junchan:
+            mask |= bits['junchan']
+        if closed and self._chiPairs >= 2:
+            mask |= bits['ryanpeikou']
+        if min(dragons) > 1 and currentFu != 25: #chiitoitsu not allowed
+            mask |= bits['shousangen']
+        if self._allFlags & SPECIALFLAG:
+            if currentFu == 25: #different han for seven pairs hand.
+                mask |= bits['honroutouPairs']
+            else:
+                mask |= bits['honroutou']
+        if self._chinitsu:
+            mask |= bits['chinitsu']
+        return mask
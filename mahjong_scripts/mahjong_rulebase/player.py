@@ -32,13 +32,19 @@ dealing with tiles and mutability.
 
 #Import major libraries
 import math
-import copy
 
 #Import mahjong libraries
 from selfio import *
 from wall import *
 from tile import *
 from yaku import *
+from handCount import *
+from handSummary import *
+from handCache import *
+
+#The suit of the tile at each position in a count list
+INDEXSUITS = [suit for suit in range(len(SUITSIZES))
+    for i in range(SUITSIZES[suit])]
 
 
 class Player(object):
@@ -50,6 +56,14 @@ class Player(object):
     etc), while 'immutable' is the list of TileCollections containing these
     tiles.
 
+    The mutable tiles are always kept sorted, apart from the last tile, which
+    is the last one drawn. Counts of the tiles in the hand are kept alongside
+    the lists and changed a tile at a time as tiles are drawn, discarded and
+    called, so that nothing needs to look through the lists to count them.
+    A Zobrist hash of the mutable tiles is kept the same way, which is used
+    to look up the hand's arrangements, waits and shanten in the HandCache
+    shared by every Player.
+
     """
     def __init__(self, handsize, suitnum, totalsuitnum, name):
         """ A general class used for player hands.
@@ -70,6 +84,7 @@ class Player(object):
         self._totalsuitnum = totalsuitnum
         self._name = name
         self._closed = True
+        self._rebuildHandState()
 
     def __str__(self):
         return (self._name + ', ' + str(self._mutable) + ', ' +
@@ -84,6 +99,119 @@ class Player(object):
         self._immutable = []
         self._discardPile = []
         self._closed = True
+        self._rebuildHandState()
+
+    def _rebuildHandState(self):
+        """ Works out the counts kept for the hand from scratch, from the
+        tiles and melds in it.
+
+        _rebuildHandState() -> None
+
+        """
+        self._tileFlags = getTileFlags(self._suitnum)
+        self._handCounts = TileCounts(self._mutable) #Just the mutable tiles
+        self._tileCounts = [0]*TILETYPES #Every tile, called melds included
+        self._suitCounts = [0]*len(SUITSIZES)
+            #As for countSuitTiles(), which counts each called meld once
+        self._suitTotals = [0]*len(SUITSIZES) #Every tile, by suit
+        self._tileTotal = 0
+        self._honourCount = 0
+        self._terminalCount = 0
+        self._specialCount = 0
+        self._handHash = getCountsHash(self._handCounts.getCounts())
+        self._cacheTag = (self.__class__.__name__, self._suitnum,
+            self._handsize)
+            #Players with different rules can't share cache entries
+        self._waitMask = 0
+        self._waitMaskKey = None #Hash and melds the wait mask is for
+        self._callMasks = (0, 0, 0, 0)
+        self._callMasksKey = None #Hash and melds the call masks are for
+        self._discardMask = getTilesMask(self._discardPile)
+        for tile in self._mutable:
+            self._countTile(tile.getIndex(), 1)
+            self._suitCounts[tile.getSuitID() - 1] += 1
+        for tileColl in self._immutable:
+            self._countMeld(tileColl, 1)
+
+    def _countTile(self, index, amount):
+        """ Adds amount of the tile at the given position to the counts of
+        every tile in the hand. """
+        self._tileCounts[index] += amount
+        self._suitTotals[INDEXSUITS[index]] += amount
+        self._tileTotal += amount
+        flags = self._tileFlags[index]
+        if flags & HONOURFLAG:
+            self._honourCount += amount
+        if flags & TERMINALFLAG:
+            self._terminalCount += amount
+        if flags & SPECIALFLAG:
+            self._specialCount += amount
+
+    def _countMeld(self, tileColl, amount):
+        """ Adds amount of the given TileCollection to the counts of every
+        tile in the hand. """
+        for tile in tileColl.getTileList():
+            self._countTile(tile.getIndex(), amount)
+        self._suitCounts[tileColl.getSuitID() - 1] += amount
+
+    def _addHandTile(self, tile):
+        """ Adds the given tile to the end of the mutable tiles. """
+        index = tile.getIndex()
+        self._mutable.append(tile)
+        self._handCounts.addIndex(index)
+        self._handHash ^= HASHKEYS[index][self._handCounts[index] - 1]
+        self._countTile(index, 1)
+        self._suitCounts[tile.getSuitID() - 1] += 1
+
+    def _removeHandTile(self, tilepos=-1):
+        """ Removes and returns the tile at index tilepos from the mutable
+        tiles. """
+        tile = self._mutable.pop(tilepos)
+        index = tile.getIndex()
+        self._handHash ^= HASHKEYS[index][self._handCounts[index] - 1]
+        self._handCounts.removeIndex(index)
+        self._countTile(index, -1)
+        self._suitCounts[tile.getSuitID() - 1] -= 1
+        return tile
+
+    def _removeHandTiles(self, tile, amount):
+        """ Removes the first amount copies of tile from the mutable tiles. """
+        for i in range(amount):
+            self._removeHandTile(self._mutable.index(tile))
+
+    def _addMeld(self, tileColl):
+        """ Adds the given TileCollection to the immutable tiles. """
+        self._immutable.append(tileColl)
+        self._countMeld(tileColl, 1)
+
+    def _removeMeld(self, tileColl):
+        """ Removes the given TileCollection from the immutable tiles. """
+        self._immutable.remove(tileColl)
+        self._countMeld(tileColl, -1)
+
+    def _getCacheKey(self, kind, handHash):
+        """ Returns the key in the HandCache for the given kind of info about
+        the mutable tiles with the given hash, alongside this hand's melds.
+
+        _getCacheKey(string, int) -> tuple
+        
+        """
+        return (kind, self._cacheTag, handHash, len(self._immutable))
+            #len(self._immutable) is getMeldSignature()
+
+    def _sortLastTile(self):
+        """ Moves the last mutable tile to where it belongs in sorted order.
+        As the rest of the tiles are already sorted, this sorts all of them.
+        The tile's place is the amount of tiles that come before it, which is
+        found from the counts rather than by comparing tiles.
+
+        _sortLastTile() -> None
+
+        """
+        if self._mutable:
+            tile = self._mutable.pop()
+            self._mutable.insert(sum(
+                self._handCounts.getCounts()[:tile.getIndex()]), tile)
 
     def returnTiles(self):
         """ Returns a list of all tiles in the hand.
@@ -112,8 +240,9 @@ class Player(object):
         
         """
         num = {}
-        for x in self._mutable:
-            num[x] = num.get(x, 0) + 1
+        for index, amount in enumerate(self._handCounts.getCounts()):
+            if amount:
+                num[getIndexTile(index)] = amount
         return num
 
     def countTile(self, tile):
@@ -122,10 +251,10 @@ class Player(object):
         countTile(Tile) -> int
         
         """
-        count = self._mutable.count(tile)
-        for item in self._immutable:
-            count += item.getTileList().count(tile)
-        return count
+        index = tile.getIndex()
+        if index is None:
+            return 0
+        return self._tileCounts[index]
 
     def countID(self, tile):
         """ Returns a count of how many tiles of the given ID there are.
@@ -148,9 +277,10 @@ class Player(object):
         """
         if tile < 10:
             return 0
-        else:
-            searchTile = Tile(tile)
-            return self._mutable.count(searchTile)
+        index = Tile(tile).getIndex()
+        if index is None:
+            return 0
+        return self._handCounts[index]
 
     def countDiscardPile(self):
         """ Returns the amount of tiles in the discard pile. """
@@ -162,14 +292,9 @@ class Player(object):
         countSuitTiles(int) -> int
         
         """
-        count = 0
-        for tile in self._mutable:
-            if tile.getSuitID() == suitID:
-                count += 1
-        for tileColl in self._immutable:
-            if tileColl.getSuitID() == suitID:
-                count += 1
-        return count
+        if suitID < 1 or suitID > len(self._suitCounts):
+            return 0
+        return self._suitCounts[suitID - 1]
 
     def getName(self):
         return self._name
@@ -183,9 +308,29 @@ class Player(object):
     def getDiscardPile(self):
         return self._discardPile
 
+    def getDiscardMask(self):
+        """ Returns which tiles are in the discard pile, as a bitmask of their
+        positions in a count list. """
+        return self._discardMask
+
     def getHandsize(self):
         return self._handsize
 
+    def getHandHash(self):
+        """ Returns the 64-bit Zobrist hash of the mutable tiles. """
+        return self._handHash
+
+    def getHandCounts(self):
+        """ Returns the TileCounts of the mutable tiles, which is kept up to
+        date as the hand changes and so shouldn't be changed itself. """
+        return self._handCounts
+
+    def getMeldSignature(self):
+        """ Returns what the arrangements, waits and shanten of the mutable
+        tiles depend on about the called melds, which is only how many of
+        them there are. """
+        return len(self._immutable)
+
     def getTileNum(self):
         """ Returns how many tiles are in the hand.
         Counts kans as threes.
@@ -214,13 +359,9 @@ class Player(object):
         getFirstIndexFromID(int) -> int
         
         """
-        ind = -1
-        curTile = Tile(tileID)
-        for i, x in enumerate(self._mutable):
-            if x == curTile:
-                ind = i
-                break
-        return ind
+        if not self.countMutID(tileID):
+            return -1
+        return self._mutable.index(Tile(tileID))
 
     def getTileFromIndex(self, index):
         """ Returns a Tile given the index of it in _mutable
@@ -266,6 +407,25 @@ class Player(object):
         for item in self._mutable:
             item.setName(settingsFile.getTileName(item))
 
+    def setHand(self, tiles, melds):
+        """ Replaces the hand with the given tiles and called melds.
+        The last of the tiles is kept last, as the last drawn tile, and the
+        rest are sorted. The hand is closed if every meld is a closed kan.
+
+        setHand(list of Tiles, list of TileCollections) -> None
+        
+        """
+        if len(tiles) + 3*len(melds) > self._handsize:
+            raise GameRunningException('Too many tiles in hand.')
+        self._mutable = (sorted(tiles[:-1], key = lambda x: x.getUniqueID()) +
+            list(tiles[-1:]))
+        self._immutable = list(melds)
+        self._closed = True
+        for tileColl in self._immutable:
+            if tileColl.getType() != 'kan_cl':
+                self._closed = False
+        self._rebuildHandState()
+
     def draw(self, tile):
         """ Adds the given tile to the end of the hand.
 
@@ -273,8 +433,8 @@ class Player(object):
         
         """
         if self.getTileNum() < self._handsize:
-            self.sort()
-            self._mutable.append(tile)
+            self._sortLastTile()
+            self._addHandTile(tile)
         else:
             raise GameRunningException('Too many tiles in hand.')
 
@@ -287,9 +447,10 @@ class Player(object):
         
         """
         if len(self._mutable) > 0:
-            tempTile = self._mutable.pop(tilepos)
+            tempTile = self._removeHandTile(tilepos)
             self._discardPile.append(tempTile)
-            self.sort()
+            self._discardMask |= 1 << tempTile.getIndex()
+            self._sortLastTile()
             return tempTile
         else:
             raise GameRunningException('No tiles to discard')
@@ -297,6 +458,7 @@ class Player(object):
     def removeDiscard(self):
         """ Deletes the last tile in the discard pile. """
         self._discardPile.pop()
+        self._discardMask = getTilesMask(self._discardPile)
 
     def reset(self):
         """ Resets the hand back to its default state.
@@ -315,7 +477,7 @@ class Player(object):
         canPon(Tile) -> Boolean
         
         """
-        numInHand = self._mutable.count(tile)
+        numInHand = self.countMutID(tile.getUniqueID())
         if numInHand > 1 and numInHand < 5:
             return True
         else:
@@ -332,9 +494,8 @@ class Player(object):
         
         """
         if self.canPon(tile):
-            self._immutable.append(TileCollection('pon', tile, side))
-            self._mutable.remove(tile)
-            self._mutable.remove(tile)
+            self._addMeld(TileCollection('pon', tile, side))
+            self._removeHandTiles(tile, 2)
             self._closed = False
         else:
             raise GameRunningException('Incorrect Pon Attempt')
@@ -385,10 +546,10 @@ class Player(object):
             tileList.sort(key = lambda x: x.getUniqueID())
             side = tileList.index(tile)
             #Make the tile collection
-            self._immutable.append(TileCollection('chi', tileList[0], side))
+            self._addMeld(TileCollection('chi', tileList[0], side))
             #Remove the other two from the hand
-            self._mutable.remove(other0)
-            self._mutable.remove(other1)
+            self._removeHandTiles(other0, 1)
+            self._removeHandTiles(other1, 1)
             self._closed = False
         else:
             raise GameRunningException('Incorrect Chi Attempt')
@@ -399,7 +560,7 @@ class Player(object):
         canKan(Tile) -> Boolean
         
         """
-        numInHand = self._mutable.count(tile)
+        numInHand = self.countMutID(tile.getUniqueID())
         if numInHand == 3:
             return True
         else:
@@ -417,10 +578,8 @@ class Player(object):
         
         """
         if self.canKan(tile):
-            self._immutable.append(TileCollection('kan_op', tile, side))
-            self._mutable.remove(tile)
-            self._mutable.remove(tile)
-            self._mutable.remove(tile)
+            self._addMeld(TileCollection('kan_op', tile, side))
+            self._removeHandTiles(tile, 3)
             self._closed = False
         else:
             raise GameRunningException('Incorrect Open Kan Attempt')
@@ -433,7 +592,7 @@ class Player(object):
         
         """
         for tile in self._mutable:
-            if self._mutable.count(tile) == 4:
+            if self._handCounts[tile.getIndex()] == 4:
                 return tile
         return False
 
@@ -448,12 +607,9 @@ class Player(object):
         """
         testTile = self.canKan_cl()
         if testTile:
-            self._immutable.append(TileCollection('kan_cl', testTile, -1))
+            self._addMeld(TileCollection('kan_cl', testTile, -1))
                 #side is irrelevant in this case
-            self._mutable.remove(testTile)
-            self._mutable.remove(testTile)
-            self._mutable.remove(testTile)
-            self._mutable.remove(testTile)
+            self._removeHandTiles(testTile, 4)
         else:
             raise GameRunningException('Incorrect Closed Kan Attempt')
 
@@ -481,10 +637,10 @@ class Player(object):
         testTile = self.canKan_la()
         if testTile:
             temp = self.getTileCollection('pon', testTile)
-            self._immutable.append(TileCollection('kan_op', testTile,
+            self._addMeld(TileCollection('kan_op', testTile,
                 temp.getSide()))
-            self._immutable.remove(temp)
-            self._mutable.remove(testTile)
+            self._removeMeld(temp)
+            self._removeHandTiles(testTile, 1)
         else:
             raise GameRunningException('Incorrect Late Kan Attempt')
 
@@ -503,47 +659,49 @@ class Player(object):
         """
         if self.getTileNum() < self._handsize: #hand must be full
             return []
-        if self.isSpecialHand(): #if the hand is a unique hand
+        arranges = self._getArrangements()
+        if not arranges:
+            return []
+        if arranges[0] == -1:
             return -1
+        return list(arranges[0])
+
+    def iterValid(self):
+        """ Generates every valid arrangement of the hand one at a time, rather
+        than just the first one found like isValid().
+        Gives -1 first if the hand is a unique style of hand, followed by any
+        normal arrangements it may also have.
+        Gives nothing if the hand is not valid.
+
+        iterValid() -> generator
         
-        tempMutable = sorted(self._mutable, key = lambda x: x.getUniqueID())
-        finalArrange = []
-        count = 0
-        for setItem in self.splitSuits(tempMutable): #Find the arrangements
-            if setItem:
-                if count > 1: #more than one pair in the splits -> invalid
-                    return []
-                if setItem[0].isHonour(self._suitnum): #If it is an honour tile
-                    numberList = self.countNumbers(setItem)
-                    tileCount = -1
-                    for number in numberList:
-                        tileCount += number
-                        curTile = setItem[tileCount]
-                        if number == 2:
-                            finalArrange.append(TileCollection('pair', curTile,
-                                -1))
-                            count += 1
-                        elif number == 3:
-                            finalArrange.append(TileCollection('pon', curTile,
-                                -1))
-                        else:
-                            return []
-                elif len(setItem)%3 == 2: #Has a pair
-                    count += 1
-                    curArrange = self.getValidArrangePair(setItem)
-                    if not curArrange: #Check if the arrangements are correct
-                        return []
-                    else:
-                        finalArrange += curArrange #Add them to the list
-                elif len(setItem)%3 == 0: #Has no pair
-                    curArrange = self.getValidArrange(setItem)
-                    if not curArrange:
-                        return []
-                    else:
-                        finalArrange += curArrange
-                else: #Invalid if they have a number of tiles not div. by 3.
-                    return []
-        return finalArrange
+        """
+        if self.getTileNum() < self._handsize: #hand must be full
+            return
+        for arrange in self._getArrangements():
+            if arrange == -1:
+                yield -1
+            else:
+                yield list(arrange)
+
+    def _getArrangements(self):
+        """ Returns every arrangement of the full hand in the order
+        iterValid() gives them, from the HandCache if they are in it.
+
+        _getArrangements() -> list
+        
+        """
+        cache = getHandCache()
+        key = self._getCacheKey('arranges', self._handHash)
+        arranges = cache.get(key)
+        if arranges is None:
+            arranges = []
+            if self.isSpecialHand(): #if the hand is a unique hand
+                arranges.append(-1)
+            counts = self._handCounts.copy()
+            arranges += counts.iterArrangements(self._suitnum)
+            cache.put(key, arranges)
+        return arranges
 
     def splitSuits(self, tempList):
         """ Splits the given list of tiles up into a list of lists each
@@ -647,10 +805,271 @@ class Player(object):
         """
         return False
 
+    def isCountsSpecial(self, counts):
+        """ As for isSpecialHand(), but for the given TileCounts of this hand
+        in place of the tiles in it.
+        
+        """
+        return False
+
+    def getSpecialShanten(self, counts):
+        """ The shanten of the given counts of this hand as any unique hand,
+        or None if there are none. Like isSpecialHand(), this exists for
+        special hands which may be used in subclasses to this one.
+        
+        """
+        return None
+
+    def shanten(self):
+        """ Works out how far the hand is from being valid: the amount of
+        tiles that still need to be swapped before it is tenpai. Gives 0 if
+        the hand is tenpai, and -1 if it is already valid.
+        Works with either handsize or handsize-1 tiles.
+
+        shanten() -> int
+        
+        """
+        cache = getHandCache()
+        key = self._getCacheKey('shanten', self._handHash)
+        shanten = cache.get(key)
+        if shanten is None:
+            shanten = self.getCountsShanten(self._handCounts.copy())
+            cache.put(key, shanten)
+        return shanten
+
+    def getCountsShanten(self, counts):
+        """ As for shanten(), but for the given TileCounts in place of the
+        tiles in the hand, keeping this hand's calls.
+
+        getCountsShanten(TileCounts) -> int
+        
+        """
+        best = counts.getShanten(self._suitnum, len(self._immutable))
+        special = self.getSpecialShanten(counts)
+        if special is not None and special < best:
+            return special
+        return best
+
+    def getEffectiveTiles(self, visibleTiles=None):
+        """ Finds every tile which would lower the shanten of the hand if it
+        was drawn, and how many copies of it are still live.
+        Requires a hand with handsize-1 tiles.
+
+        getEffectiveTiles(VisibleTiles) -> list of tuple(Tile, int)
+
+        visibleTiles is a VisibleTiles of everything on the table, which are
+        not counted as live. If not given, only this hand is counted.
+        
+        """
+        counts = self._handCounts.copy()
+        handCounts = self._handCounts.copy()
+        return self._findEffectiveTiles(counts, self.getCountsShanten(counts),
+            handCounts, visibleTiles)
+
+    def getDiscardEffectiveTiles(self, visibleTiles=None):
+        """ For each different tile in the hand, works out the shanten the
+        hand would have after discarding it, and the tiles which would lower
+        the shanten after that, as for getEffectiveTiles().
+        Requires a hand with handsize tiles.
+
+        getDiscardEffectiveTiles(VisibleTiles) -> list of
+            tuple(Tile, int, list of tuple(Tile, int))
+
+        visibleTiles is a VisibleTiles of everything on the table, which are
+        not counted as live. If not given, only this hand is counted.
+        
+        """
+        counts = self._handCounts.copy()
+        handCounts = self._handCounts.copy() #Discards stay unlive
+        temp = []
+        for index in range(TILETYPES):
+            if not handCounts[index]:
+                continue
+            counts.removeIndex(index)
+            curShanten = self.getCountsShanten(counts)
+            temp.append((getIndexTile(index), curShanten,
+                self._findEffectiveTiles(counts, curShanten, handCounts,
+                visibleTiles)))
+            counts.addIndex(index)
+        return temp
+
+    def _findEffectiveTiles(self, counts, curShanten, handCounts,
+            visibleTiles):
+        """ Finds every tile which would lower curShanten if added to counts,
+        along with how many copies of it aren't in handCounts or visibleTiles.
+
+        _findEffectiveTiles(TileCounts, int, TileCounts, VisibleTiles) ->
+            list of tuple(Tile, int)
+        
+        """
+        if self.getSpecialShanten(counts) is not None:
+            tryIndexes = range(TILETYPES)
+                #Unique hands can be helped by any tile, not just nearby ones
+        else:
+            tryIndexes = counts.getNearIndexes(self._suitnum)
+        temp = []
+        for index in tryIndexes:
+            counts.addIndex(index)
+            if self.getCountsShanten(counts) < curShanten:
+                if visibleTiles is not None:
+                    live = visibleTiles.getLiveCount(index, handCounts)
+                else:
+                    live = max(0, MAXCOPIES - handCounts[index])
+                temp.append((getIndexTile(index), live))
+            counts.removeIndex(index)
+        return temp
+
     def isClosed(self):
         """ Is the hand closed? """
         return self._closed
 
+    def getWaits(self):
+        """ Finds every tile which would make the hand valid if it was drawn,
+        working it out from the tile counts directly rather than trying every
+        tile with isValid().
+        Requires a hand with handsize-1 tiles.
+
+        getWaits() -> list of Tiles
+        
+        """
+        if self.getTileNum() < self._handsize - 1: #hand must be full
+            return []
+        counts = self._handCounts.copy()
+        return [getIndexTile(index)
+            for index in self._getWaits(counts, self._handHash)]
+
+    def getWaitMask(self):
+        """ Returns the tiles which would make the hand valid, as for
+        getWaits(), as a bitmask of their positions in a count list.
+        This is kept, and only worked out again once the mutable tiles or
+        the melds have changed.
+        Requires a hand with handsize-1 tiles, and gives 0 otherwise.
+
+        getWaitMask() -> int
+        
+        """
+        key = (self._handHash, len(self._immutable))
+        if key != self._waitMaskKey:
+            mask = 0
+            if self.getTileNum() == self._handsize - 1:
+                for index in self._getWaits(self._handCounts.copy(),
+                        self._handHash):
+                    mask |= 1 << index
+            self._waitMask = mask
+            self._waitMaskKey = key
+        return self._waitMask
+
+    def getCallMasks(self):
+        """ Returns the tiles which could be called from another player's
+        discard, as bitmasks of their positions in a count list. These are,
+        in order, the tiles the hand waits on (as for getWaitMask(), so which
+        it could ron if it has a yaku and isn't in furiten), and the tiles it
+        could kan, pon and chi, as for canKan(), canPon() and canChi().
+        Like the wait mask, these are only worked out again once the mutable
+        tiles or the melds have changed.
+
+        getCallMasks() -> tuple(int, int, int, int)
+        
+        """
+        key = (self._handHash, len(self._immutable))
+        if key != self._callMasksKey:
+            handMask = kanMask = ponMask = chiMask = 0
+            for index, amount in enumerate(self._handCounts.getCounts()):
+                if amount:
+                    handMask |= 1 << index
+                    if amount > 1:
+                        ponMask |= 1 << index
+                        if amount == 3:
+                            kanMask |= 1 << index
+            for suit in range(min(self._suitnum, len(SUITSIZES))):
+                #Honours can't be in a chi
+                suitMask = (1 << SUITSIZES[suit]) - 1
+                have = (handMask >> SUITSTARTS[suit]) & suitMask
+                #Tiles with both others of a chi below, around or above them
+                suitChi = ((have << 1 & have << 2) | (have << 1 & have >> 1) |
+                    (have >> 1 & have >> 2))
+                chiMask |= (suitChi & suitMask) << SUITSTARTS[suit]
+            self._callMasks = (self.getWaitMask(), kanMask, ponMask, chiMask)
+            self._callMasksKey = key
+        return self._callMasks
+
+    def isFuriten(self):
+        """ Is any tile that would make the hand valid in our own discard
+        pile? Requires a hand with handsize-1 tiles. """
+        return bool(self.getWaitMask() & self._discardMask)
+
+    def getDiscardWaits(self):
+        """ For each different tile in the hand, finds the tiles which would
+        make the hand valid if it was discarded, as for getWaits().
+        Only goes through the hand once, rather than once per discard.
+        Requires a hand with handsize tiles.
+
+        getDiscardWaits() -> list of tuple(Tile, list of Tiles)
+        
+        """
+        if self.getTileNum() < self._handsize: #hand must be full
+            return []
+        counts = self._handCounts.copy()
+        temp = []
+        for index in range(TILETYPES):
+            if not counts[index]:
+                continue
+            handHash = self._handHash ^ HASHKEYS[index][counts[index] - 1]
+            counts.removeIndex(index)
+            temp.append((getIndexTile(index), [getIndexTile(waitIndex)
+                for waitIndex in self._getWaits(counts, handHash)]))
+            counts.addIndex(index)
+        return temp
+
+    def _getWaits(self, counts, handHash):
+        """ As for _findWaits(), but looked up in the HandCache by the given
+        hash of counts first.
+
+        _getWaits(TileCounts, int) -> list of ints
+        
+        """
+        cache = getHandCache()
+        key = self._getCacheKey('waits', handHash)
+        waits = cache.get(key)
+        if waits is None:
+            waits = self._findWaits(counts)
+            cache.put(key, waits)
+        return waits
+
+    def _findWaits(self, counts):
+        """ Finds the positions of every tile which would make the given
+        counts of this hand valid if added to it.
+
+        _findWaits(TileCounts) -> list of ints
+        
+        """
+        specialShanten = self.getSpecialShanten(counts)
+        special = specialShanten is not None and specialShanten <= 0
+        brokenSuits = counts.getBrokenSuits(self._suitnum)
+        if special:
+            tryIndexes = range(TILETYPES)
+                #Unique hands can be finished by any tile, not just nearby ones
+        elif len(brokenSuits) > 1:
+            return [] #One tile can only fix one suit
+        elif brokenSuits:
+            tryIndexes = counts.getNearIndexes(self._suitnum, brokenSuits)
+        else:
+            tryIndexes = counts.getNearIndexes(self._suitnum)
+        temp = []
+        for index in tryIndexes:
+            counts.addIndex(index)
+            if ((special and self.isCountsSpecial(counts)) or
+                    counts.isComplete(self._suitnum)):
+                temp.append(index)
+            counts.removeIndex(index)
+        return temp
+
+    def _getWaitIndexes(self, listOfTiles, waits):
+        """ Returns which of listOfTiles are in the list of Tiles waits. """
+        waitIndexes = [getTileIndex(tile) for tile in waits]
+        return [tile for tile in listOfTiles
+            if getTileIndex(tile) in waitIndexes]
+
     def isTenpai(self, listOfTiles):
         """ Checks to see whether the hand is one tile away from being valid.
         Requires a hand with handsize-1 tiles.
@@ -661,15 +1080,7 @@ class Player(object):
         possibilities.
         
         """
-        if self.getTileNum() < self._handsize - 1: #hand must be full
-            return False
-        for tile in listOfTiles:
-            self._mutable.append(tile)
-            if self.isValid():
-                self._mutable.pop()
-                return True
-            self._mutable.pop()
-        return False
+        return len(self.isTenpaiPoss(listOfTiles)) > 0
 
     def isTenpaiFull(self, listOfTiles):
         """ Checks to see whether the hand is one tile away from being valid,
@@ -682,16 +1093,7 @@ class Player(object):
         possibilities.
 
         """
-        if self.getTileNum() < self._handsize: #hand must be full
-            return False
-        tempMutable = copy.deepcopy(self._mutable)
-        for x in range(len(tempMutable)):
-            self._mutable.pop(x)
-            if self.isTenpai(listOfTiles):
-                self._mutable = copy.deepcopy(tempMutable)
-                return True
-            self._mutable = copy.deepcopy(tempMutable)
-        return False
+        return len(self.isTenpaiFullPoss(listOfTiles)) > 0
 
     def isTenpaiPoss(self, listOfTiles):
         """ Checks to see whether the hand is one tile away from being valid.
@@ -704,13 +1106,7 @@ class Player(object):
         possibilities.
 
         """
-        poss = []
-        for tile in listOfTiles:
-            self._mutable.append(tile)
-            if self.isValid():
-                poss.append(tile)
-            self._mutable.pop()
-        return poss
+        return self._getWaitIndexes(listOfTiles, self.getWaits())
 
     def isTenpaiFullPoss(self, listOfTiles):
         """ Checks to see whether the hand is one tile away from being valid,
@@ -724,11 +1120,12 @@ class Player(object):
         possibilities.
 
         """
+        tenpaiDiscards = []
+        for discardTile, waits in self.getDiscardWaits():
+            if self._getWaitIndexes(listOfTiles, waits):
+                tenpaiDiscards.append(discardTile)
         poss = []
-        tempMutable = copy.deepcopy(self._mutable)
-        for x in range(len(tempMutable)):
-            self._mutable.pop(x)
-            if self.isTenpai(listOfTiles):
+        for x, tile in enumerate(self._mutable):
+            if tile in tenpaiDiscards:
                 poss.append(x)
-            self._mutable = copy.deepcopy(tempMutable)
         return poss
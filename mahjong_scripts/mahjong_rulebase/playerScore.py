@@ -35,6 +35,7 @@ import math
 
 #Import mahjong libraries
 from player import *
+from handSummary import *
 from selfio import *
 from wall import *
 from tile import *
@@ -42,6 +43,10 @@ from yaku import *
 
 #Misc. global variables
 GREENTILES = [Tile(41), Tile(12), Tile(13), Tile(14), Tile(16), Tile(18)]
+ARRANGEYAKU = ['pinfu', 'iipeikou', 'ryanpeikou', 'itsuu', 'chanta', 'junchan',
+    'sanshoku', 'sanshokualt', 'toitoi', 'sanankou', 'suuankou', 'chiitoitsu',
+    'shousangen', 'honroutou', 'honroutouPairs']
+    #Yaku which can change depending on how the hand is arranged
 
 class PlayerScore(Player):
     """ Extension of the Player class, containing functions and attributes
@@ -60,11 +65,11 @@ class PlayerScore(Player):
         name is the player's name.
         score refers to the player's current score.
         seatWind is a tile representing the current seating, North by default.
-        loadData is an optional file location string containing the data that
-        this player should load.
+        loadData is an optional SnapshotReader containing the data that this
+        player should load.
             (Note that if loadData exists, then there is no need to have the
              other values defined properly, as they will just be loaded from
-             this file)
+             this snapshot)
             
         """
         if loadData:
@@ -114,6 +119,17 @@ class PlayerScore(Player):
         self._canChiihou = False
         return Player.discard(self, tilepos)
 
+    def setHand(self, tiles, melds):
+        """ As for Player.setHand(), but as the hand wasn't just dealt, it
+        can no longer win by Tenhou or Chiihou.
+
+        setHand(list of Tiles, list of TileCollections) -> None
+        
+        """
+        Player.setHand(self, tiles, melds)
+        self._canTenhou = False
+        self._canChiihou = False
+
     def setScoreDiff(self, amount):
         """ Sets the current score difference to the given amount. """
         self._scoreDiff = amount
@@ -180,6 +196,7 @@ class PlayerScore(Player):
     def finScoreDiff(self):
         """ Instantly apply the current score difference. """
         self._score += self._scoreDiff
+        self._scoreDiff = 0
 
     def addScoreDiff(self, amount):
         """ Add a certain amount to the current score difference. """
@@ -201,6 +218,22 @@ class PlayerScore(Player):
         """ Are we riichi? """
         return self._riichi
 
+    def setRiichi(self, isIppatsu):
+        """ Sets the player as having declared riichi, without paying for it
+        or working out their wait.
+        isIppatsu is whether they can still win by ippatsu.
+
+        """
+        self._riichi = True
+        if isIppatsu:
+            self._riichiturns = 0
+        else:
+            self._riichiturns = 4
+
+    def isIppatsu(self):
+        """ Could we still win by ippatsu? """
+        return self._riichi and self._riichiturns < 4
+
     def addRiichiTurns(self, num):
         """ Add the given amount on to the amount of turns since riichi. """
         self._riichiturns += num
@@ -215,56 +248,81 @@ class PlayerScore(Player):
         """ Add one to the amount of wins we have. """
         self._amountOfWins += 1
 
-    def saveData(self, saveLocation):
-        """ Save all the variables for this PlayerScore into saveLocation. """
-        playerFile = open(saveLocation, "w")
-        infoStore = []
-        infoStore.append('self._mutable')
-        infoStore.append('self._immutable')
-        infoStore.append('self._discardPile')
-        infoStore.append('self._handsize')
-        infoStore.append('self._suitnum')
-        infoStore.append('self._totalsuitnum')
-        infoStore.append('self._name')
-        infoStore.append('self._closed')
-        infoStore.append('self._score')
-        infoStore.append('self._seatWind')
-        infoStore.append('self._riichi')
-        infoStore.append('self._doubleriichi')
-        infoStore.append('self._riichiturns')
-        infoStore.append('self._riichiPos')
-        infoStore.append('self._riichiWait')
-        infoStore.append('self._canTenhou')
-        infoStore.append('self._canChiihou')
-        infoStore.append('self._showHand')
-        infoStore.append('self._amountOfWins')
-        for info in infoStore:
-            playerFile.write(self._getRunnableLine(info))
-            playerFile.write('\n')
-        playerFile.close()
-
-    def _getRunnableLine(self, varName):
-        """ As for _getRunnableLine in gameScreen.py. """
-        value = eval(varName)
-        value = repr(value)
-        return varName + ' = ' + value
-
-    def loadData(self, saveLocation):
-        """ Load all the variables for this PlayerScore from saveLocation. """
-        playerFile = open(saveLocation, "rU")
-        for line in playerFile:
-            exec(line)
-        playerFile.close()
-        
+    def saveData(self, writer):
+        """ Write all the variables for this PlayerScore into the given
+        SnapshotWriter.
+
+        saveData(SnapshotWriter) -> None
+
+        """
+        writer.addTiles(self._mutable)
+        writer.addMelds(self._immutable)
+        writer.addTiles(self._discardPile)
+        writer.addInt(self._handsize)
+        writer.addInt(self._suitnum)
+        writer.addInt(self._totalsuitnum)
+        writer.addString(self._name)
+        writer.addBool(self._closed)
+        writer.addInt(self._score)
+        writer.addTile(self._seatWind)
+        writer.addBool(self._riichi)
+        writer.addBool(self._doubleriichi)
+        writer.addInt(self._riichiturns)
+        writer.addInt(self._riichiPos)
+        writer.addTiles(self._riichiWait)
+        writer.addBool(self._canTenhou)
+        writer.addBool(self._canChiihou)
+        writer.addBool(self._showHand)
+        writer.addInt(self._amountOfWins)
+
+    def loadData(self, reader):
+        """ Read all the variables for this PlayerScore from the given
+        SnapshotReader, in the order saveData wrote them.
+
+        loadData(SnapshotReader) -> None
+
+        """
+        self._mutable = reader.getTiles()
+        self._immutable = reader.getMelds()
+        self._discardPile = reader.getTiles()
+        self._handsize = reader.getInt()
+        self._suitnum = reader.getInt()
+        self._totalsuitnum = reader.getInt()
+        self._name = reader.getString()
+        self._closed = reader.getBool()
+        self._score = reader.getInt()
+        self._seatWind = reader.getTile()
+        self._riichi = reader.getBool()
+        self._doubleriichi = reader.getBool()
+        self._riichiturns = reader.getInt()
+        self._riichiPos = reader.getInt()
+        self._riichiWait = reader.getTiles()
+        self._canTenhou = reader.getBool()
+        self._canChiihou = reader.getBool()
+        self._showHand = reader.getBool()
+        self._amountOfWins = reader.getInt()
+        self._rebuildHandState()
 
     def isSpecialHand(self):
         """ Used for adding validity exceptions for chiitoitsu and
         kokushi musou hands. """
-        if self.isChiitoitsu(): #Check for chiitoitsu
-            return True
-        if self.isKokushi(): #Check for kokushi
-            return True
-        return False
+        return self.isCountsSpecial(self._handCounts)
+
+    def isCountsSpecial(self, counts):
+        """ As for isSpecialHand(), but for the given TileCounts of this hand
+        in place of the tiles in it. """
+        if counts.getTotal() < 14: #Need 14 tiles for these
+            return False
+        return counts.isChiitoitsu() or counts.isKokushi(self._suitnum)
+
+    def getSpecialShanten(self, counts):
+        """ The shanten of the given counts of this hand as a chiitoitsu or
+        kokushi musou, whichever is closer, or None if the hand has made any
+        calls. """
+        if self._immutable:
+            return None
+        return min(counts.getChiitoitsuShanten(),
+            counts.getKokushiShanten(self._suitnum))
 
     def canTsumo(self, roundWind, yakuFile, gameYakuList):
         """ Can we declare tsumo?
@@ -277,18 +335,20 @@ class PlayerScore(Player):
         
         """
         selfDrawn = True
-        curArrange = self.isValid()
-        if curArrange:
-            if curArrange == -1: #Special hands
+        bestArrange = self.getBestArrange(roundWind, selfDrawn, yakuFile,
+            gameYakuList)
+        if bestArrange:
+            if bestArrange[0] == -1: #Special hands
                 return True
-            return self.testYaku(roundWind, curArrange, yakuFile, gameYakuList,
-                selfDrawn)
+            return len(bestArrange[2]) > 0
         else:
             return False
 
     def canRon(self, newTile, roundWind, yakuFile, gameYakuList):
         """ Can we declare ron?
         Requires a hand with handsize-1 tiles.
+        The tile and furiten are checked against the kept masks of our waits
+        and discards first, so most tiles are turned down straight away.
 
         canTsumo(Tile, Tile, string, list) -> None
 
@@ -301,26 +361,18 @@ class PlayerScore(Player):
         selfDrawn = False
         if newTile == False: #False in the base case
             return False
-        if newTile in self._discardPile: #Basic furiten case
-            return False
-        #If it still works after the above, test it for reals, then bulletproof
-        self._mutable.append(newTile)
-        curArrange = self.isValid()
-        if curArrange:
-            self._mutable.pop()
-            if not self.testYaku(roundWind, curArrange, yakuFile, gameYakuList,
-                    selfDrawn):
-                return False
-        else:
-            self._mutable.pop()
+        index = newTile.getIndex()
+        waitMask = self.getWaitMask()
+        if index is None or not waitMask & (1 << index):
+            return False #Not one of the tiles we're waiting on
+        if waitMask & self._discardMask: #Furiten
             return False
-        for disTile in self._discardPile: #Test all furiten case
-            self._mutable.append(disTile)
-            if self.isValid():
-                self._mutable.pop()
-                return False
-            self._mutable.pop()
-        return True
+        #If it still works after the above, make sure it has yaku
+        self._addHandTile(newTile)
+        bestArrange = self.getBestArrange(roundWind, selfDrawn, yakuFile,
+            gameYakuList)
+        self._removeHandTile()
+        return bool(bestArrange) and len(bestArrange[2]) > 0
 
     def testYaku(self, roundWind, curArrange, yakuFile, gameYakuList,
             selfDrawn):
@@ -338,6 +390,130 @@ class PlayerScore(Player):
         else:
             return True
 
+    def getBestArrange(self, roundWind, selfDrawn, yakuFile, gameYakuList=[],
+            doraAmount=0):
+        """ Goes through every valid arrangement of the hand, rather than just
+        the first one from isValid(), and finds the one that scores the most.
+        Arrangements are worked out one at a time, and any whose highest
+        possible han and fu can't beat the best so far are skipped without
+        checking their yaku.
+        Returns a tuple containing the best arrangement, its fu, its list of
+        yaku (including gameYakuList) and its score from scoreHand().
+        Returns None if the hand is not valid.
+
+        getBestArrange(Tile, Boolean, string, list, int) -> tuple
+
+        roundWind is a Tile for the current round wind.
+        selfDrawn is whether the current player drew the last tile.
+        yakuFile is the location of the info file about the yaku.
+        gameYakuList is a list of all applicable gameYaku for this hand.
+        doraAmount is the amount of dora in the hand.
+        
+        """
+        best = None
+        bestPoints = -1
+        baseHan = None
+        for curArrange in self.iterValid():
+            curFu = self.getFu(roundWind, curArrange, selfDrawn)
+            if best and (self._getArrangeBound(curArrange, curFu, selfDrawn,
+                    baseHan, yakuFile) <= bestPoints):
+                continue #Can't possibly do better than what we have
+            if curArrange != -1:
+                curArrange = list(curArrange) #getHandYaku() adds to this
+            curYaku = self.getHandYaku(roundWind, curArrange, curFu,
+                selfDrawn, yakuFile)
+            curYaku += gameYakuList
+            curScore = self.scoreHand(curYaku, curFu, doraAmount)
+            if baseHan is None:
+                baseHan = self._getBaseHan(curYaku, len(gameYakuList),
+                    doraAmount, yakuFile)
+            if curScore and curScore[0] > bestPoints:
+                bestPoints = curScore[0]
+                best = (curArrange, curFu, curYaku, curScore)
+            elif not best:
+                best = (curArrange, curFu, curYaku, curScore)
+        return best
+
+    def _getBaseHan(self, currentYaku, gameYakuNum, doraAmount, yakuFile):
+        """ Given the yaku for one arrangement of the hand, works out the most
+        han that any arrangement of the hand could get from yaku that don't
+        depend on how it is arranged.
+        Returns a tuple of the amount of yakuman, the han and the amount of
+        gameYaku.
+
+        _getBaseHan(list of Yaku, int, int, string) -> tuple(int, int, int)
+        
+        """
+        yakumanCount = 0
+        currentHan = 2 + doraAmount
+        for yaku in currentYaku:
+            for invalidYaku in yaku.getInvalid(): #might not be removed in others
+                if invalidYaku and invalidYaku not in ARRANGEYAKU:
+                    currentHan += max(self._getYakuHan(invalidYaku, yakuFile), 0)
+            if yaku.getID() in ARRANGEYAKU:
+                continue
+            yakuHan = self._getYakuHan(yaku.getID(), yakuFile)
+            if yakuHan == -1:
+                yakumanCount += 1
+            else:
+                currentHan += yakuHan
+        return (yakumanCount, currentHan, gameYakuNum)
+
+    def _getYakuHan(self, yakuID, yakuFile):
+        """ Returns the han the given yaku is worth to this hand. """
+        yaku = getYakuRegistry(yakuFile).getYaku(yakuID)
+        if self.isClosed():
+            return yaku.getScoreClosed()
+        return yaku.getScoreOpen()
+
+    def _getArrangeBound(self, currentArrange, currentFu, selfDrawn, baseHan,
+            yakuFile):
+        """ Works out the most points the given arrangement could possibly be
+        worth, by assuming it gets every arrangement based yaku that it isn't
+        obviously ruled out of.
+
+        _getArrangeBound(list of TileCollections, int, Boolean, tuple,
+            string) -> int
+        
+        """
+        (yakumanCount, currentHan, gameYakuNum) = baseHan
+        if currentArrange == -1:
+            possible = ['chiitoitsu', 'honroutouPairs']
+        else:
+            possible = ['honroutou', 'shousangen']
+            allSets = currentArrange + self._immutable
+            chiList = []
+            ponCount = 0
+            closedPonCount = 0
+            for tileColl in allSets:
+                if tileColl.getType() == 'chi':
+                    chiList.append(tileColl.getMainTile().getUniqueID())
+                elif tileColl.getType() != 'pair':
+                    ponCount += 1
+                    if tileColl.getSide() == -1:
+                        closedPonCount += 1
+            if self.isPinfu(currentFu, selfDrawn):
+                possible.append('pinfu')
+            if self.isClosed() and len(chiList) != len(set(chiList)):
+                possible += ['iipeikou', 'ryanpeikou']
+            if len(chiList) >= 3:
+                possible += ['itsuu', 'sanshoku']
+            if ponCount >= 3:
+                possible.append('sanshokualt')
+            if not chiList:
+                possible.append('toitoi')
+            if closedPonCount >= 3:
+                possible.append('sanankou')
+            if self.isChanta(allSets):
+                possible += ['chanta', 'junchan']
+            if closedPonCount == 4:
+                yakumanCount += 1 #Suuankou
+        if yakumanCount:
+            return (yakumanCount + gameYakuNum)*8000
+        for yakuID in possible:
+            currentHan += max(self._getYakuHan(yakuID, yakuFile), 0)
+        return self.getHanScore(currentHan, currentFu)[0]
+
     def scoreHand(self, currentYaku, currentFu, doraAmount):
         """ Gives the current hand score for the current hand, as well as the
         name for this score, if it is a limit.
@@ -376,20 +552,31 @@ class PlayerScore(Player):
             curNum = len(currentYaku)
             return (curNum*8000, 'Yakuman')
         else: #if normal hand
-            basicPoints = float(currentFu)*2**(currentHan)
-            if basicPoints > 2000: #if we pass the limit, just go by han
-                if currentHan <= 7:
-                    return (2000, 'Mangan')
-                elif currentHan <= 9:
-                    return (3000, 'Haneman')
-                elif currentHan <= 12:
-                    return (4000, 'Baiman')
-                elif currentHan <= 14:
-                    return (6000, 'Sanbaiman')
-                else:
-                    return (8000, 'Counted Yakuman') #yakuman, woohoo!
+            return self.getHanScore(currentHan, currentFu)
+
+    def getHanScore(self, currentHan, currentFu):
+        """ Gives the hand score for a non-yakuman hand with the given han
+        (including the two bonus han) and fu, as well as the name for this
+        score, if it is a limit.
+        Is not rounded.
+
+        getHanScore(int, int) -> tuple(int, string)
+            
+        """
+        basicPoints = float(currentFu)*2**(currentHan)
+        if basicPoints > 2000: #if we pass the limit, just go by han
+            if currentHan <= 7:
+                return (2000, 'Mangan')
+            elif currentHan <= 9:
+                return (3000, 'Haneman')
+            elif currentHan <= 12:
+                return (4000, 'Baiman')
+            elif currentHan <= 14:
+                return (6000, 'Sanbaiman')
             else:
-                return (int(basicPoints), None)
+                return (8000, 'Counted Yakuman') #yakuman, woohoo!
+        else:
+            return (int(basicPoints), None)
 
     def getRiichiPos(self):
         """ Gets the position of the declared riichi tile. """
@@ -489,90 +676,24 @@ class PlayerScore(Player):
         names.
             
         """
-        temp = []
-
         if currentArrange == []: #if invalid hand, return nothing
             return []
         elif currentArrange != -1:
             currentArrange += self._immutable
 
-        #First, check all the basic yaku
-        temp += self.getYakupai(roundWind, yakuFile)
-        if self.isClosed() and selfDrawn:
-            temp.append(Yaku('tsumo', yakuFile))
-        if self._riichi:
-            temp.append(Yaku('riichi', yakuFile))
-        if self._doubleriichi:
-            temp.append(Yaku('riichidb', yakuFile))
-        if self._riichiturns < 4 and self._riichi:
-            temp.append(Yaku('ippatsu', yakuFile))
-        if self.isPinfu(currentFu, selfDrawn):
-            temp.append(Yaku('pinfu', yakuFile))
-        if self.isTanyao():
-            temp.append(Yaku('tanyao', yakuFile))
-        if self.isIipeikou(currentArrange):
-            temp.append(Yaku('iipeikou', yakuFile))
-        if self.isItsuu(currentArrange):
-            temp.append(Yaku('itsuu', yakuFile))
-        if self.isChanta(currentArrange):
-            temp.append(Yaku('chanta', yakuFile))
-        if self.isSanshoku(currentArrange):
-            temp.append(Yaku('sanshoku', yakuFile))
-        if self.isSanshokuAlt(currentArrange):
-            temp.append(Yaku('sanshokualt', yakuFile))
-        if currentFu == 25:
-            temp.append(Yaku('chiitoitsu', yakuFile))
-        if self.isToitoi(currentArrange):
-            temp.append(Yaku('toitoi', yakuFile))
-        if self.isSanankou(currentArrange):
-            temp.append(Yaku('sanankou', yakuFile))
-        if self.isSankantsu(currentArrange):
-            temp.append(Yaku('sankantsu', yakuFile))
-        if self.isHonitsu():
-            temp.append(Yaku('honitsu', yakuFile))
-        if self.isJunchan(currentArrange):
-            temp.append(Yaku('junchan', yakuFile))
-        if self.isRyanpeikou(currentArrange):
-            temp.append(Yaku('ryanpeikou', yakuFile))
-        if self.isShousangen() and currentFu != 25: #chiitoitsu not allowed
-            temp.append(Yaku('shousangen', yakuFile))
-        if self.isHonroutou():
-            if currentFu == 25: #different han for seven pairs hand.
-                temp.append(Yaku('honroutouPairs', yakuFile))
-            else:
-                temp.append(Yaku('honroutou', yakuFile))
-        if self.isChinitsu():
-            temp.append(Yaku('chinitsu', yakuFile))
-
-        #Yakuman hands
-        yakuman = []
-        if self.isDaisangen():
-            yakuman.append(Yaku('daisangen', yakuFile))
-        if self.isSuuankou(currentArrange):
-            yakuman.append(Yaku('suuankou', yakuFile))
-        if self.isTsuiisou():
-            yakuman.append(Yaku('tsuiisou', yakuFile))
-        if self.isChinroutou():
-            yakuman.append(Yaku('chinroutou', yakuFile))
-        if self.isRyuuiisou():
-            yakuman.append(Yaku('ryuuiisou', yakuFile))
-        if self.isChuuren():
-            yakuman.append(Yaku('chuuren', yakuFile))
-        if self.isKokushi():
-            yakuman.append(Yaku('kokushi', yakuFile))
-        if self._canTenhou:
-            yakuman.append(Yaku('tenhou', yakuFile))
-        if self._canChiihou:
-            yakuman.append(Yaku('chiihou', yakuFile))
-
-        if yakuman: #yakuman override previous yaku
-            temp = yakuman
-        else:
+        #Sum the hand up once, then find every yaku from that
+        summary = HandSummary(self._mutable, self._immutable, currentArrange,
+            self._suitnum)
+        yakuMask = summary.getYakuMask(roundWind, self._seatWind, currentFu,
+            selfDrawn, self._closed, self._riichi, self._doubleriichi,
+            self._riichiturns, self._canTenhou, self._canChiihou)
+        temp = getMaskYaku(yakuMask, getYakuRegistry(yakuFile))
+
+        if not yakuMask & YAKUMANMASK: #yakuman override previous yaku
             for yaku in temp:
-                for invalidYaku in yaku.getInvalid():
-                    testYaku = Yaku(invalidYaku, yakuFile)
-                    if testYaku in temp:
-                        temp.remove(testYaku)
+                for invalidYaku in yaku.getInvalidYaku():
+                    if invalidYaku in temp:
+                        temp.remove(invalidYaku)
         return temp
 
 ###YAKU CHECKERS###
@@ -586,16 +707,17 @@ class PlayerScore(Player):
         
         """
         temp = []
+        registry = getYakuRegistry(yakuFile)
         if self.countTile(Tile(41)) > 2:
-            temp.append(Yaku('yakupaiGD', yakuFile))
+            temp.append(registry.getYaku('yakupaiGD'))
         if self.countTile(Tile(42)) > 2:
-            temp.append(Yaku('yakupaiRD', yakuFile))
+            temp.append(registry.getYaku('yakupaiRD'))
         if self.countTile(Tile(43)) > 2:
-            temp.append(Yaku('yakupaiWD', yakuFile))
+            temp.append(registry.getYaku('yakupaiWD'))
         if self.countTile(self._seatWind) > 2:
-            temp.append(Yaku('yakupaiSeatWind', yakuFile))
+            temp.append(registry.getYaku('yakupaiSeatWind'))
         if self.countTile(roundWind) > 2:
-            temp.append(Yaku('yakupaiRoundWind', yakuFile))
+            temp.append(registry.getYaku('yakupaiRoundWind'))
         return temp
 
     def isPinfu(self, currentFu, selfDrawn):
@@ -623,11 +745,7 @@ class PlayerScore(Player):
         isTanyao() -> Boolean
         
         """
-        tempHand = self.returnTiles()
-        for item in tempHand:
-            if item.isSpecial(self._suitnum):
-                return False #Need all tiles to not be special
-        return True
+        return self._specialCount == 0 #Need all tiles to not be special
 
     def isIipeikou(self, currentArrange):
         """ Checks to see whether the hand has an iipeikou. (two of the same
@@ -768,18 +886,9 @@ class PlayerScore(Player):
         isChiitoitsu() -> Boolean
         
         """
-        tempMutable = sorted(self._mutable, key = lambda x: x.getUniqueID())
-        if len(tempMutable) < 14: #Need 14 tiles for this
+        if len(self._mutable) < 14: #Need 14 tiles for this
             return False
-        if not (tempMutable.count(tempMutable[0]) == 2 and
-                tempMutable.count(tempMutable[2]) == 2 and
-                tempMutable.count(tempMutable[4]) == 2 and
-                tempMutable.count(tempMutable[6]) == 2 and
-                tempMutable.count(tempMutable[8]) == 2 and
-                tempMutable.count(tempMutable[10]) == 2 and
-                tempMutable.count(tempMutable[12]) == 2):
-            return False #Need seven pairs (should be in order)
-        return True
+        return self._handCounts.isChiitoitsu() #Need seven pairs
 
     def isToitoi(self, currentArrange):
         """ Checks to see whether the hand is toitoi (no sequences).
@@ -846,18 +955,11 @@ class PlayerScore(Player):
         isHonitsu() -> Boolean
         
         """
-        tileList = self.returnTiles()
-        honour = False
-        curSuit = -1
-        for tile in tileList:
-            if not tile.isHonour(self._suitnum):
-                if curSuit == -1:
-                    curSuit = tile.getSuitID()
-                elif curSuit != tile.getSuitID():
-                    return False
-            else:
-                honour = True
-        return honour
+        numberedSuits = 0
+        for total in self._suitTotals[:self._suitnum]:
+            if total:
+                numberedSuits += 1
+        return numberedSuits <= 1 and self._honourCount > 0
 
     def isJunchan(self, currentArrange):
         """ Checks to see whether the hand is junchan (contains a terminal in
@@ -926,11 +1028,8 @@ class PlayerScore(Player):
         isHonroutou() -> Boolean
         
         """
-        tempHand = self.returnTiles()
-        for item in tempHand:
-            if not item.isSpecial(self._suitnum):
-                return False #Need all tiles to be terminal
-        return True
+        return self._specialCount == self._tileTotal
+            #Need all tiles to be terminal
 
     def isChinitsu(self):
         """ Checks to see whether the hand is chinitsu. (All tiles are in the
@@ -939,14 +1038,11 @@ class PlayerScore(Player):
         isChinitsu() -> Boolean
         
         """
-        tileList = self.returnTiles()
-        curSuit = -1
-        for tile in tileList:
-            if curSuit == -1:
-                curSuit = tile.getSuitID()
-            elif curSuit != tile.getSuitID():
-                return False
-        return True
+        suits = 0
+        for total in self._suitTotals:
+            if total:
+                suits += 1
+        return suits <= 1
 
 
 #YAKUMAN HANDS
@@ -1008,11 +1104,8 @@ class PlayerScore(Player):
         isTsuiisou() -> Boolean
         
         """
-        tempHand = self.returnTiles()
-        for item in tempHand:
-            if not item.isHonour(self._suitnum):
-                return False #Need all tiles to be honour
-        return True
+        return self._honourCount == self._tileTotal
+            #Need all tiles to be honour
 
     def isChinroutou(self):
         """ Checks to see whether the hand is chinroutou. (All tiles are
@@ -1021,11 +1114,8 @@ class PlayerScore(Player):
         isChinroutou() -> Boolean
         
         """
-        tempHand = self.returnTiles()
-        for item in tempHand:
-            if not item.isTerminal(self._suitnum):
-                return False #Need all tiles to be terminal
-        return True
+        return self._terminalCount == self._tileTotal
+            #Need all tiles to be terminal
 
     def isRyuuiisou(self):
         """ Checks to see whether the hand is 'all green'. (All tiles are GD
@@ -1080,24 +1170,7 @@ class PlayerScore(Player):
         isKokushi() -> Boolean
             
         """
-        tempMutable = self._mutable
-        if len(tempMutable) < 14: #Need 14 tiles for this
+        if len(self._mutable) < 14: #Need 14 tiles for this
             return False
-        if not (tempMutable.count(Tile(11)) > 0 and
-                tempMutable.count(Tile(19)) > 0 and
-                tempMutable.count(Tile(21)) > 0 and
-                tempMutable.count(Tile(29)) > 0 and
-                tempMutable.count(Tile(31)) > 0 and
-                tempMutable.count(Tile(39)) > 0 and
-                tempMutable.count(Tile(41)) > 0 and
-                tempMutable.count(Tile(42)) > 0 and
-                tempMutable.count(Tile(43)) > 0 and
-                tempMutable.count(Tile(51)) > 0 and
-                tempMutable.count(Tile(52)) > 0 and
-                tempMutable.count(Tile(53)) > 0 and
-                tempMutable.count(Tile(54)) > 0):
-            return False #Need one of each in the first thirteen
-        for item in tempMutable:
-            if not item.isSpecial(self._suitnum):
-                return False #Need all tiles to be special
-        return True
+        return self._handCounts.isKokushi(self._suitnum)
+            #Need one of each, and all tiles to be special
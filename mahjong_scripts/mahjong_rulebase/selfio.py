@@ -32,6 +32,9 @@ A helper file used for loading information from other text settings files.
 #Import major libraries
 import os
 
+#Set default globals
+_parsedTables = {} #Every file read so far, by path, delimiter and comment
+
 class IOHelper(object):
     """ Used for quick operations with info files, for tiles and yaku etc.
     Allows for the loading of data given ID's; effectively a collection of
@@ -77,6 +80,41 @@ class IOHelper(object):
         """
         return int(str(intone) + str(inttwo))
 
+    def getTable(self):
+        """ Returns the ParsedTable for this file, shared with every other
+        IOHelper for the same file. The file is only read again if it has
+        changed since it was last read.
+
+        getTable() -> ParsedTable
+        
+        """
+        key = (os.path.abspath(self._filename), self._delimiter, self._comment)
+        try:
+            fileInfo = os.stat(self._filename)
+            stamp = (fileInfo.st_mtime, fileInfo.st_size)
+        except OSError:
+            stamp = None #Let opening the file give the usual error
+        table = _parsedTables.get(key)
+        if table is None or stamp is None or table.getStamp() != stamp:
+            table = ParsedTable(self, stamp)
+            _parsedTables[key] = table
+        return table
+
+    def readRows(self):
+        """ Reads every row of data in the file, straight from the file.
+        File must exist or an error is given.
+
+        readRows() -> list of lists
+        
+        """
+        f = open(self._filename, 'rU')
+        temp = []
+        for line in f:
+            if line[0]!= self._comment:
+                temp.append(self.parseLine(line))
+        f.close()
+        return temp
+
     def getRowByOneID(self, curid):
         """ Given data with one id part, return a row.
         File must exist or an error is given.
@@ -86,16 +124,10 @@ class IOHelper(object):
         getRowByOneID(str) -> list
         
         """
-        parsed = None
-        f = open(self._filename, 'rU')
-        for line in f:
-            if line[0]!= self._comment:
-                parsed = self.parseLine(line)
-                if parsed[0] == str(curid):
-                    f.close()
-                    return parsed
-        f.close()
-        return False
+        row = self.getTable().getRowByOneID(str(curid))
+        if row is None:
+            return False
+        return list(row)
 
     def getRowByTwoID(self, idone, idtwo):
         """ Given data with two id parts, get a row.
@@ -106,16 +138,10 @@ class IOHelper(object):
         getRowByTwoID(int, int) -> list
         
         """
-        parsed = None
-        f = open(self._filename, 'rU')
-        for line in f:
-            if line[0]!= self._comment:
-                parsed = self.parseLine(line)
-                if (parsed[0], parsed[1]) == (str(idone), str(idtwo)):
-                    f.close()
-                    return parsed
-        f.close()
-        return False
+        row = self.getTable().getRowByTwoID(str(idone), str(idtwo))
+        if row is None:
+            return False
+        return list(row)
 
     def getAllRows(self):
         """ Returns a list of all rows of data in the file.
@@ -126,12 +152,41 @@ class IOHelper(object):
         getAllRows -> list of tuples
         
         """
-        f = open(self._filename, 'rU')
-        temp = []
-        for line in f:
-            if line[0]!= self._comment:
-                parsed = self.parseLine(line)
-                temp.append(tuple(parsed))
-        f.close()
-        return temp
+        return list(self.getTable().getAllRows())
+
+
+class ParsedTable(object):
+    """ The parsed contents of an info file, with its rows indexed by their
+    first id, and by their first two ids, so that they can be found without
+    reading through the file again.
+
+    """
+    def __init__(self, helper, stamp):
+        """ Reads and indexes the file for the given IOHelper.
+        Constructor: ParsedTable(IOHelper, tuple)
+
+        stamp is the modified time and size of the file when it was read.
         
+        """
+        self._stamp = stamp
+        self._rows = tuple(tuple(row) for row in helper.readRows())
+        self._oneIndex = {}
+        self._twoIndex = {}
+        for row in self._rows: #Earlier rows win, as when searching the file
+            self._oneIndex.setdefault(row[0], row)
+            if len(row) > 1:
+                self._twoIndex.setdefault((row[0], row[1]), row)
+
+    def getStamp(self):
+        return self._stamp
+
+    def getRowByOneID(self, curid):
+        """ Returns the first row with the given first id, or None. """
+        return self._oneIndex.get(curid)
+
+    def getRowByTwoID(self, idone, idtwo):
+        """ Returns the first row with the given first two ids, or None. """
+        return self._twoIndex.get((idone, idtwo))
+
+    def getAllRows(self):
+        return self._rows
@@ -0,0 +1,231 @@
+################################################################################
+# Copyright (c) 2013, Sean Manson.
+# Part of CSSE1001 Major Project (Assignment 3).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met: 
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer. 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution. 
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" snapshot.py:
+Contains the reader and writer for snapshots, the binary format that games are
+saved in. A snapshot starts with a header giving its version, followed by the
+values written into it in order; it is up to whatever reads them back to know
+what that order is. Tiles are stored as a single byte each.
+
+"""
+
+#Import major libraries
+import struct
+
+#Import mahjong libraries
+from tile import *
+from selfexcept import *
+
+#Set default globals
+SNAPSHOTMAGIC = 'RMSS' #Marks the start of every snapshot
+SNAPSHOTVERSION = 1
+SNAPSHOTHEADER = struct.Struct('<4sH')
+MELDTYPES = ['pon', 'chi', 'kan_op', 'kan_cl', 'pair']
+    #Every meld type, stored as its index in this list
+NOTILE = 0 #Stored in place of a missing tile
+
+#Formats for each kind of value
+_INT = struct.Struct('<i')
+_LONG = struct.Struct('<q')
+_BOOL = struct.Struct('<?')
+_LENGTH = struct.Struct('<H')
+_MELD = struct.Struct('<BBb')
+
+class SnapshotWriter(object):
+    """ Builds up a snapshot, one value at a time. """
+    def __init__(self):
+        """ Create a new SnapshotWriter, with the header already written.
+        Constructor: SnapshotWriter()
+
+        """
+        self._parts = [SNAPSHOTHEADER.pack(SNAPSHOTMAGIC, SNAPSHOTVERSION)]
+
+    def getData(self):
+        """ Returns the snapshot written so far, as a string of bytes. """
+        return ''.join(self._parts)
+
+    def addInt(self, value):
+        self._parts.append(_INT.pack(value))
+
+    def addBool(self, value):
+        self._parts.append(_BOOL.pack(bool(value)))
+
+    def addLong(self, value):
+        """ Adds an int too big for addInt, such as a seed. """
+        self._parts.append(_LONG.pack(value))
+
+    def addOptionalLong(self, value):
+        """ Adds a long which may be None. """
+        self.addBool(value is not None)
+        if value is not None:
+            self.addLong(value)
+
+    def addString(self, value):
+        """ Adds a string which may be None, as None is stored as ''.
+        Unicode strings are stored as utf-8.
+
+        """
+        if value is None:
+            value = ''
+        if isinstance(value, unicode):
+            value = value.encode('utf-8')
+        self._parts.append(_LENGTH.pack(len(value)))
+        self._parts.append(value)
+
+    def addBytes(self, value):
+        """ Adds a string of bytes, or anything else with a tostring(). """
+        if not isinstance(value, str):
+            value = value.tostring()
+        self._parts.append(_LENGTH.pack(len(value)))
+        self._parts.append(value)
+
+    def addStrings(self, values):
+        self._parts.append(_LENGTH.pack(len(values)))
+        for value in values:
+            self.addString(value)
+
+    def addInts(self, values):
+        self._parts.append(_LENGTH.pack(len(values)))
+        self._parts.append(struct.pack('<%di' % len(values), *values))
+
+    def addTile(self, tile):
+        """ Adds a single tile, which may be None. """
+        if tile is None:
+            self._parts.append(chr(NOTILE))
+        else:
+            self._parts.append(chr(tile.getUniqueID()))
+
+    def addTiles(self, tiles):
+        """ Adds a list of tiles, one byte each. """
+        self._parts.append(_LENGTH.pack(len(tiles)))
+        self._parts.append(''.join([chr(tile.getUniqueID())
+            for tile in tiles]))
+
+    def addMelds(self, melds):
+        """ Adds a list of TileCollections. """
+        self._parts.append(_LENGTH.pack(len(melds)))
+        for meld in melds:
+            self._parts.append(_MELD.pack(MELDTYPES.index(meld.getType()),
+                meld.getMainTile().getUniqueID(), meld.getSide()))
+
+class SnapshotReader(object):
+    """ Reads the values back out of a snapshot, in the order they were
+    written.
+
+    """
+    def __init__(self, data):
+        """ Create a new SnapshotReader, checking the header of the data.
+        Constructor: SnapshotReader(string)
+
+        data is the snapshot, as given by SnapshotWriter.getData().
+
+        """
+        self._data = data
+        self._pos = SNAPSHOTHEADER.size
+        if len(data) < self._pos:
+            raise GameRunningException('Snapshot is too short')
+        (magic, version) = SNAPSHOTHEADER.unpack_from(data, 0)
+        if magic != SNAPSHOTMAGIC:
+            raise GameRunningException('Not a snapshot')
+        if version != SNAPSHOTVERSION:
+            raise GameRunningException('Unknown snapshot version ' +
+                str(version))
+        self._version = version
+
+    def getVersion(self):
+        return self._version
+
+    def isFinished(self):
+        """ Returns whether every value in the snapshot has been read. """
+        return self._pos >= len(self._data)
+
+    def _unpack(self, format):
+        """ Reads a value with the given struct format. """
+        if self._pos + format.size > len(self._data):
+            raise GameRunningException('Snapshot is too short')
+        values = format.unpack_from(self._data, self._pos)
+        self._pos += format.size
+        return values
+
+    def _getChunk(self, length):
+        """ Reads the given amount of bytes. """
+        if self._pos + length > len(self._data):
+            raise GameRunningException('Snapshot is too short')
+        value = self._data[self._pos:self._pos + length]
+        self._pos += length
+        return value
+
+    def _getRaw(self):
+        """ Reads a string of bytes, stored with its length first. """
+        (length,) = self._unpack(_LENGTH)
+        return self._getChunk(length)
+
+    def getInt(self):
+        return self._unpack(_INT)[0]
+
+    def getBool(self):
+        return self._unpack(_BOOL)[0]
+
+    def getLong(self):
+        return self._unpack(_LONG)[0]
+
+    def getOptionalLong(self):
+        if self.getBool():
+            return self.getLong()
+        return None
+
+    def getString(self):
+        """ Reads a string, as a utf-8 encoded str. """
+        return self._getRaw()
+
+    def getBytes(self):
+        return self._getRaw()
+
+    def getStrings(self):
+        (length,) = self._unpack(_LENGTH)
+        return [self.getString() for i in xrange(length)]
+
+    def getInts(self):
+        (length,) = self._unpack(_LENGTH)
+        return list(self._unpack(struct.Struct('<%di' % length)))
+
+    def getTile(self):
+        """ Reads a single tile, or None. """
+        tileID = ord(self._getChunk(1))
+        if tileID == NOTILE:
+            return None
+        return Tile(tileID)
+
+    def getTiles(self):
+        return [Tile(ord(char)) for char in self._getRaw()]
+
+    def getMelds(self):
+        (length,) = self._unpack(_LENGTH)
+        melds = []
+        for i in xrange(length):
+            (meldType, tileID, side) = self._unpack(_MELD)
+            melds.append(TileCollection(MELDTYPES[meldType], Tile(tileID),
+                side))
+        return melds
@@ -0,0 +1,548 @@
+################################################################################
+# Copyright (c) 2013, Sean Manson.
+# Part of CSSE1001 Major Project (Assignment 3).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met: 
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer. 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution. 
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" suitTable.py:
+Contains the lookup table of every way that a single suit of tiles can be
+broken down into melds and a pair. Since one suit can only ever hold up to 14
+tiles over 9 ranks, every arrangement can be worked out once and then looked
+up, rather than searched for every time a hand is checked.
+The table is built the first time it is needed, and cached in a binary file
+next to this one so that it only ever has to be built once.
+
+"""
+
+#Import major libraries
+import os
+import zlib
+import tempfile
+from array import array
+
+#Table settings
+SUITLENGTH = 9 #Ranks in a numbered suit
+MAXCOPIES = 4 #Copies of each tile; the base that suits are packed in is this+1
+MAXSUITTILES = 14 #Most tiles of one suit a hand can hold
+MAXMELDS = 4 #Melds in a full hand, not including the pair
+SETTYPES = ['chi', 'pon', 'pair']
+TABLEFILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    'suitTable.dat')
+TABLEHEADER = [ord('M'), ord('J'), ord('S'), ord('T'), 2] #Magic and version
+SIZEBYTES = 4 #Bytes in each of the entry count and checksum after the header
+
+def packNumber(number):
+    """ Splits a number into SIZEBYTES bytes, lowest byte first.
+
+    packNumber(int) -> list of ints
+    
+    """
+    return [number >> (8*place) & 255 for place in range(SIZEBYTES)]
+
+def unpackNumber(data, pos):
+    """ Reads a number packed by packNumber() from data at pos.
+
+    unpackNumber(array, int) -> int
+    
+    """
+    number = 0
+    for place in range(SIZEBYTES):
+        number |= data[pos + place] << (8*place)
+    return number
+
+def packSuit(counts, start, size):
+    """ Packs the counts of the suit starting at start into a single base 5
+    number, with the lowest tile in the lowest digit.
+
+    packSuit(list, int, int) -> int
+    
+    """
+    key = 0
+    for pos in range(start + size - 1, start - 1, -1):
+        key = key*(MAXCOPIES + 1) + counts[pos]
+    return key
+
+def unpackSuit(key, size):
+    """ Turns a packed suit back into a list of counts.
+
+    unpackSuit(int, int) -> list
+    
+    """
+    counts = []
+    for pos in range(size):
+        counts.append(key%(MAXCOPIES + 1))
+        key //= MAXCOPIES + 1
+    return counts
+
+def getHonourSets(counts, start, size):
+    """ Splits an honour suit up into pons and pairs.
+    Returns a list of (type, position in suit) tuples, or None if this can't
+    be done.
+
+    getHonourSets(list, int, int) -> list of tuples
+    
+    """
+    temp = []
+    for pos in range(size):
+        number = counts[start + pos]
+        if number == 2:
+            temp.append(('pair', pos))
+        elif number == 3:
+            temp.append(('pon', pos))
+        elif number != 0:
+            return None
+    return temp
+
+def iterSuitSets(counts, start, size, pos):
+    """ Recursively generates every way of splitting the numbered suit
+    starting at start up into pons and chis, beginning at position pos in the
+    suit. The lowest tile must either be part of a pon or begin a chi, so each
+    branch decides how many pons it makes, from most to fewest, with the rest
+    of it going into chis.
+    Each arrangement is a list of (type, position in suit) tuples.
+
+    iterSuitSets(list, int, int, int) -> generator of lists of tuples
+    
+    """
+    while pos < size and counts[start + pos] == 0:
+        pos += 1
+    if pos == size:
+        yield []
+        return
+    index = start + pos
+    number = counts[index]
+    for pons in range(number//3, -1, -1):
+        chis = number - 3*pons
+        if chis and (pos + 2 >= size or counts[index + 1] < chis or
+                counts[index + 2] < chis):
+            continue
+        temp = [('chi', pos)]*chis + [('pon', pos)]*pons
+        counts[index] = 0
+        if chis:
+            counts[index + 1] -= chis
+            counts[index + 2] -= chis
+        for rest in iterSuitSets(counts, start, size, pos + 1):
+            yield temp + rest
+        counts[index] = number
+        if chis:
+            counts[index + 1] += chis
+            counts[index + 2] += chis
+
+def iterSuitSetsPair(counts, start, size):
+    """ Generates every way of splitting the numbered suit starting at start
+    up into pons, chis and exactly one pair, trying each possible pair from
+    lowest to highest.
+    Each arrangement is a list of (type, position in suit) tuples.
+
+    iterSuitSetsPair(list, int, int) -> generator of lists of tuples
+    
+    """
+    for pos in range(size):
+        if counts[start + pos] > 1:
+            counts[start + pos] -= 2
+            for rest in iterSuitSets(counts, start, size, 0):
+                yield rest + [('pair', pos)]
+            counts[start + pos] += 2
+
+def searchSuit(counts, start, size):
+    """ Works out every arrangement of the numbered suit starting at start by
+    searching through it, rather than by looking it up.
+    Arrangements are given in the order they are found.
+
+    searchSuit(list, int, int) -> tuple of tuples
+
+    """
+    counts = list(counts)
+    total = sum(counts[start:start + size])
+    if total%3 == 2: #Has a pair
+        found = iterSuitSetsPair(counts, start, size)
+    elif total%3 == 0: #Has no pair
+        found = iterSuitSets(counts, start, size, 0)
+    else: #Invalid if they have a number of tiles not div. by 3.
+        return ()
+    return tuple(tuple(arrange) for arrange in found)
+
+def mergeShantenParts(parts, otherParts):
+    """ Combines the shanten parts of two separate groups of tiles into the
+    shanten parts of both of them together.
+
+    mergeShantenParts(dict, dict) -> dict
+    
+    """
+    merged = {}
+    for (melds, pairs), partials in parts.items():
+        for (otherMelds, otherPairs), otherPartials in otherParts.items():
+            newMelds = melds + otherMelds
+            newPairs = pairs + otherPairs
+            if newMelds > MAXMELDS or newPairs > 1:
+                continue
+            newPartials = min(partials + otherPartials, MAXMELDS - newMelds)
+            if merged.get((newMelds, newPairs), -1) < newPartials:
+                merged[(newMelds, newPairs)] = newPartials
+    return merged
+
+class SuitTable(object):
+    """ A table of every arrangement of every numbered suit that can be
+    broken down into melds and up to one pair, keyed by its packed counts.
+    Also holds a small table for honour suits, which can only ever be split
+    one way.
+
+    """
+    def __init__(self, fileName=TABLEFILE):
+        """ Create a new SuitTable, loading it from fileName if it has been
+        saved there, or otherwise building it and trying to save it there.
+        Constructor: SuitTable(string)
+
+        fileName is the location of the cached table.
+        
+        """
+        self._fileName = fileName
+        self._table = {}
+        self._honourTables = {}
+        self._shantenParts = {} #Filled in as suits are seen
+        self._honourShantenParts = {}
+        if not self.load():
+            self.build()
+            self.save()
+
+    def __len__(self):
+        return len(self._table)
+
+    def getArrangements(self, counts, start, size):
+        """ Returns every arrangement of the numbered suit starting at start in
+        counts, in the same order that searchSuit() would give them.
+        Each arrangement is a tuple of (type, position in suit) tuples.
+        Returns () if the suit can't be arranged.
+
+        getArrangements(list, int, int) -> tuple of tuples
+        
+        """
+        if size != SUITLENGTH:
+            return searchSuit(counts, start, size)
+        key = 0
+        total = 0
+        for pos in range(start + size - 1, start - 1, -1):
+            number = counts[pos]
+            if number > MAXCOPIES:
+                return searchSuit(counts, start, size) #Can't be packed
+            key = key*(MAXCOPIES + 1) + number
+            total += number
+        if total > MAXSUITTILES:
+            return searchSuit(counts, start, size)
+        return self._table.get(key, ())
+
+    def getKeys(self):
+        """ Returns the packed counts of every numbered suit in the table.
+
+        getKeys() -> list of ints
+        
+        """
+        return self._table.keys()
+
+    def getHonourSets(self, counts, start, size):
+        """ Returns the only arrangement of the honour suit starting at start
+        in counts, or None if it can't be arranged.
+
+        getHonourSets(list, int, int) -> tuple of tuples
+        
+        """
+        if size not in self._honourTables:
+            self._honourTables[size] = self._buildHonourTable(size)
+        key = 0
+        for pos in range(start + size - 1, start - 1, -1):
+            number = counts[pos]
+            if number > MAXCOPIES:
+                return None
+            key = key*(MAXCOPIES + 1) + number
+        return self._honourTables[size].get(key)
+
+    def getShantenParts(self, counts, start, size, isHonour):
+        """ Finds the best ways of breaking the suit starting at start in counts
+        up into melds, partial melds and a pair, for working out shanten.
+        Returns a dictionary mapping (melds, pairs) to the most partial melds
+        that can be made alongside them, where pairs is 1 if a pair has been
+        kept aside for the hand's pair, or 0 if not.
+        Suits are worked out the first time they are seen and then stored.
+
+        getShantenParts(list, int, int, Boolean) -> dict
+        
+        """
+        key = 0
+        for pos in range(start + size - 1, start - 1, -1):
+            key = key*(MAXCOPIES + 1) + min(counts[pos], MAXCOPIES)
+        if isHonour:
+            if key not in self._honourShantenParts:
+                self._honourShantenParts[key] = self._findHonourParts(
+                    counts[start:start + size])
+            return self._honourShantenParts[key]
+        if key not in self._shantenParts:
+            self._shantenParts[key] = self._findSuitParts(key)
+        return self._shantenParts[key]
+
+    def _findHonourParts(self, counts):
+        """ Works out the shanten parts of an honour suit, where each tile can
+        only be part of a pon or a pair with copies of itself.
+
+        _findHonourParts(list) -> dict
+        
+        """
+        parts = {(0, 0): 0}
+        for number in counts:
+            if number == 0:
+                continue
+            elif number == 1:
+                tileParts = {(0, 0): 0}
+            elif number == 2:
+                tileParts = {(0, 0): 1, (0, 1): 0}
+            elif number == 3:
+                tileParts = {(1, 0): 0, (0, 1): 0, (0, 0): 1}
+            else: #A fourth copy can't help make a partial meld
+                tileParts = {(1, 0): 0, (0, 1): 0}
+            parts = mergeShantenParts(parts, tileParts)
+        return parts
+
+    def _findSuitParts(self, key):
+        """ Recursively works out the shanten parts of the numbered suit with
+        the given packed counts. The lowest tile can either make a pon, begin a
+        chi, be the pair, make a partial meld or be left over by itself; each
+        of these is tried and the rest of the suit is looked up the same way.
+
+        _findSuitParts(int) -> dict
+        
+        """
+        if key == 0:
+            return {(0, 0): 0}
+        counts = unpackSuit(key, SUITLENGTH)
+        pos = 0
+        while counts[pos] == 0:
+            pos += 1
+        number = counts[pos]
+        place = (MAXCOPIES + 1)**pos
+        nextPlace = place*(MAXCOPIES + 1)
+        lastPlace = nextPlace*(MAXCOPIES + 1)
+        hasNext = pos + 1 < SUITLENGTH and counts[pos + 1] > 0
+        hasLast = pos + 2 < SUITLENGTH and counts[pos + 2] > 0
+
+        parts = {}
+        if number >= 3: #Pon
+            self._addParts(parts, key - 3*place, 1, 0, 0)
+        if hasNext and hasLast: #Chi
+            self._addParts(parts, key - place - nextPlace - lastPlace, 1, 0, 0)
+        if number >= 2: #Pair, either the hand's pair or a partial pon
+            self._addParts(parts, key - 2*place, 0, 0, 1)
+            self._addParts(parts, key - 2*place, 0, 1, 0)
+        if hasNext: #Two in a row
+            self._addParts(parts, key - place - nextPlace, 0, 1, 0)
+        if hasLast: #Two with a gap in the middle
+            self._addParts(parts, key - place - lastPlace, 0, 1, 0)
+        self._addParts(parts, key - place, 0, 0, 0) #Left by itself
+        return parts
+
+    def _addParts(self, parts, restKey, melds, partials, pairs):
+        """ Adds the shanten parts of the suit with packed counts restKey to
+        parts, after adding the given amount of melds, partials and pairs to
+        each.
+
+        _addParts(dict, int, int, int, int) -> None
+        
+        """
+        if restKey not in self._shantenParts:
+            self._shantenParts[restKey] = self._findSuitParts(restKey)
+        restParts = self._shantenParts[restKey]
+        for (restMelds, restPairs), restPartials in restParts.items():
+            newMelds = restMelds + melds
+            newPairs = restPairs + pairs
+            if newMelds > MAXMELDS or newPairs > 1:
+                continue
+            newPartials = min(restPartials + partials, MAXMELDS - newMelds)
+            if parts.get((newMelds, newPairs), -1) < newPartials:
+                parts[(newMelds, newPairs)] = newPartials
+
+    def _buildHonourTable(self, size):
+        """ Builds the table for an honour suit of the given size, where each
+        tile must be a pon or a pair by itself.
+
+        _buildHonourTable(int) -> dict
+        
+        """
+        table = {}
+        for key in range((MAXCOPIES + 1)**size):
+            counts = unpackSuit(key, size)
+            honourSets = getHonourSets(counts, 0, size)
+            if honourSets is not None:
+                table[key] = tuple(honourSets)
+        return table
+
+    def build(self):
+        """ Works out every numbered suit that can be broken down into melds
+        and up to one pair, and every way of doing so.
+
+        build() -> None
+        
+        """
+        complete = set()
+        self._addMelds([0]*SUITLENGTH, 0, 0, complete)
+        for counts in list(complete):
+            for pos in range(SUITLENGTH):
+                if counts[pos] + 2 <= MAXCOPIES:
+                    withPair = list(counts)
+                    withPair[pos] += 2
+                    complete.add(tuple(withPair))
+        self._table = {}
+        for counts in complete:
+            arranges = searchSuit(counts, 0, SUITLENGTH)
+            if arranges:
+                self._table[packSuit(counts, 0, SUITLENGTH)] = arranges
+
+    def _addMelds(self, counts, meldNum, firstMeld, complete):
+        """ Recursively adds every combination of melds to counts, adding
+        each result to the set complete.
+        Melds 0-8 are the pons of each rank, and 9 onwards are the chis
+        starting at each rank; they are only added in increasing order so that
+        each combination is only made once.
+
+        _addMelds(list, int, int, set) -> None
+        
+        """
+        complete.add(tuple(counts))
+        if 3*(meldNum + 1) > MAXSUITTILES:
+            return
+        for meld in range(firstMeld, SUITLENGTH + SUITLENGTH - 2):
+            if meld < SUITLENGTH:
+                positions = [meld]*3
+            else:
+                positions = range(meld - SUITLENGTH, meld - SUITLENGTH + 3)
+            for pos in positions:
+                counts[pos] += 1
+            if max(counts) <= MAXCOPIES:
+                self._addMelds(counts, meldNum + 1, meld, complete)
+            for pos in positions:
+                counts[pos] -= 1
+
+    def load(self):
+        """ Loads the table from its cached file.
+        Returns whether or not it could be loaded.
+
+        load() -> Boolean
+        
+        """
+        if not os.path.exists(self._fileName):
+            return False
+        data = array('B')
+        try:
+            with open(self._fileName, 'rb') as tableFile:
+                data.fromfile(tableFile, os.path.getsize(self._fileName))
+        except (IOError, OSError, EOFError):
+            return False
+        if data[:len(TABLEHEADER)].tolist() != TABLEHEADER:
+            return False #Old or different file, so don't trust it
+        pos = len(TABLEHEADER)
+        if len(data) < pos + 2*SIZEBYTES:
+            return False
+        entryNum = unpackNumber(data, pos)
+        checksum = unpackNumber(data, pos + SIZEBYTES)
+        pos += 2*SIZEBYTES
+        if zlib.crc32(data[pos:].tostring()) & 0xffffffff != checksum:
+            return False #Cut off or changed since it was saved
+
+        table = {}
+        try:
+            while pos < len(data):
+                key = data[pos] | data[pos + 1] << 8 | data[pos + 2] << 16
+                arrangeNum = data[pos + 3]
+                pos += 4
+                arranges = []
+                for arrangeCount in range(arrangeNum):
+                    setNum = data[pos]
+                    arrange = []
+                    for setByte in data[pos + 1:pos + 1 + setNum]:
+                        arrange.append((SETTYPES[setByte >> 4], setByte & 15))
+                    arranges.append(tuple(arrange))
+                    pos += 1 + setNum
+                table[key] = tuple(arranges)
+        except IndexError:
+            return False #Cut off part way through
+        if len(table) != entryNum:
+            return False
+        self._table = table
+        return True
+
+    def save(self):
+        """ Saves the table to its cached file, so that it doesn't have to be
+        built again. The file is written under another name and then renamed
+        into place, so that anything loading it never sees half a file.
+        Returns whether or not it could be saved.
+
+        save() -> Boolean
+        
+        """
+        data = array('B')
+        for key in sorted(self._table):
+            arranges = self._table[key]
+            data.extend([key & 255, key >> 8 & 255, key >> 16 & 255,
+                len(arranges)])
+            for arrange in arranges:
+                data.append(len(arrange))
+                for setType, pos in arrange:
+                    data.append(SETTYPES.index(setType) << 4 | pos)
+        header = array('B', TABLEHEADER + packNumber(len(self._table)) +
+            packNumber(zlib.crc32(data.tostring()) & 0xffffffff))
+        tempName = None
+        try:
+            tableDir = os.path.dirname(os.path.abspath(self._fileName))
+            tempHandle, tempName = tempfile.mkstemp(dir=tableDir,
+                prefix='suitTable', suffix='.tmp')
+            with os.fdopen(tempHandle, 'wb') as tableFile:
+                header.tofile(tableFile)
+                data.tofile(tableFile)
+            try:
+                os.rename(tempName, self._fileName)
+            except OSError:
+                if os.name != 'nt':
+                    raise
+                #Windows won't rename over a file; another process may have
+                #just saved it, which is fine too
+                os.remove(self._fileName)
+                os.rename(tempName, self._fileName)
+        except (IOError, OSError):
+            if tempName is not None and os.path.exists(tempName):
+                try:
+                    os.remove(tempName)
+                except OSError:
+                    pass
+            return False #Most likely can't write here; just build it next time
+        return True
+
+
+_sharedTable = None
+
+def getSuitTable():
+    """ Returns the SuitTable shared by all hands, loading or building it if
+    this is the first time it has been asked for.
+
+    getSuitTable() -> SuitTable
+    
+    """
+    global _sharedTable
+    if _sharedTable is None:
+        _sharedTable = SuitTable()
+    return _sharedTable
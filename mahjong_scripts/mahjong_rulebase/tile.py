@@ -38,12 +38,45 @@ from selfexcept import *
 DELIMITER = ";"
 COMMENTIND = "#"
 
+#Layout of the dense tile indexes: three numbered suits, dragons, then winds
+SUITSIZES = [9, 9, 9, 3, 4]
+SUITSTARTS = [0, 9, 18, 27, 30]
+TILETYPES = 34
+
+#Next tile after each tile, by tile file and unique ID
+_nextTiles = {}
+
 class Tile(object):
     """ A general class used for tiles.
     Stores info related to a single tile, ie. suit, name etc.
-    Similar to tuples, but with more functions and methods
+    Similar to tuples, but with more functions and methods.
+
+    Tiles are interned: there is only ever one Tile for each unique ID, which
+    Tile(int) hands back every time it is asked for. Because of this a Tile's
+    IDs never change, and it can be hashed and used as a dictionary key.
 
     """
+    __slots__ = ('_suitID', '_tileID', '_uniqueID', '_index', '_name')
+    _interned = {} #Every Tile made so far, by unique ID
+
+    def __new__(cls, a):
+        """ Returns the Tile for the given ID, making it the first time it is
+        asked for.
+        
+        """
+        tile = cls._interned.get(a)
+        if tile is None:
+            tile = object.__new__(cls)
+            tile._suitID = a/10
+            tile._tileID = a%10
+            tile._uniqueID = a
+            tile._index = None
+            if (0 < tile._suitID <= len(SUITSIZES) and
+                    0 < tile._tileID <= SUITSIZES[tile._suitID - 1]):
+                tile._index = SUITSTARTS[tile._suitID - 1] + tile._tileID - 1
+            tile._name = None
+            cls._interned[a] = tile
+        return tile
     
     def __init__(self, a):
         """ Create a new Tile.
@@ -52,23 +85,33 @@ class Tile(object):
         a is a two digit number for suitID, tileID
         
         """
-        self._suitID = a/10
-        self._tileID = a%10
-        self._name = None
+        pass #Everything is set up once in __new__
 
     def __str__(self):
-        return str(self.getUniqueID())
+        return str(self._uniqueID)
 
     def __repr__(self):
         return "Tile(" + self.__str__() + ")"
 
     def __eq__(self, other):
-        return (isinstance(other, self.__class__) and
-                self.getUniqueID() == other.getUniqueID())
+        return self is other or (isinstance(other, Tile) and
+                self._uniqueID == other._uniqueID)
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __hash__(self):
+        return self._uniqueID
+
+    def __reduce__(self):
+        return (Tile, (self._uniqueID,))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
     def getSuitID(self):
         """ Gets suitID.
 
@@ -91,7 +134,16 @@ class Tile(object):
         getUniqueID() -> int
         
         """
-        return int(str(self._suitID) + str(self._tileID))
+        return self._uniqueID
+
+    def getIndex(self):
+        """ Gets the dense index of this tile, from 0 to TILETYPES-1, or None
+        if it isn't one of the standard tiles.
+
+        getIndex() -> int
+        
+        """
+        return self._index
 
     def getName(self):
         """ Returns the name of this tile.
@@ -104,21 +156,23 @@ class Tile(object):
     def getNextTile(self, tileFile):
         """ Given the file with the list of tiles, finds the next logical tile
         in the suit after this one, looping around to the first tile if there
-        is none.
+        is none. The answer is only looked up in the file once.
 
         """
-        newSuitID = self._suitID
-        newTileID = self._tileID + 1
-        tileSearcher = IOHelper(tileFile, DELIMITER, COMMENTIND)
-        tileExists = (tileSearcher.getRowByTwoID(newSuitID, newTileID))
-        if not tileExists:
-            newTileID = 1
-        uniqueID = int(str(newSuitID) + str(newTileID))
-        return Tile(uniqueID)
-        
+        key = (tileFile, self._uniqueID)
+        if key not in _nextTiles:
+            newSuitID = self._suitID
+            newTileID = self._tileID + 1
+            tileSearcher = IOHelper(tileFile, DELIMITER, COMMENTIND)
+            tileExists = (tileSearcher.getRowByTwoID(newSuitID, newTileID))
+            if not tileExists:
+                newTileID = 1
+            _nextTiles[key] = Tile(newSuitID*10 + newTileID)
+        return _nextTiles[key]
 
     def setName(self, name):
         """ Set the name of this tile.
+        As there is only one Tile per ID, this names every tile with this ID.
 
         setName(string) -> None
         
@@ -253,7 +307,7 @@ class TileCollection(object):
         
         """
         curID = self._tileMain.getTileID()
-        self._tileMain = Tile(int(str(suitID)+str(curID)))
+        self._tileMain = Tile(suitID*10 + curID)
 
     def getSuitID(self):
         """ Get the suit of the tiles in this collection. """
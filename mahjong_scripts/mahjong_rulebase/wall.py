@@ -32,6 +32,7 @@ structured and the methods and properties it contains.
 
 #Import major libraries
 import random
+from array import array
 
 #Import mahjong libraries
 from player import *
@@ -43,6 +44,39 @@ from yaku import *
 #Set default globals
 DELIMITER = ";"
 COMMENTIND = "#"
+WALLSEEDBITS = 32 #Size of the seed each wall is shuffled with
+WALLRECORDCHARS = ('0123456789abcdefghijklmnopqrstuvwxyz' +
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ') #One char per unique tile in a wall record
+DEADDRAWS = [-2, -1, -4, -3] #Where each kan draws from, from the dead end
+
+#Unique tiles and their next tiles for each tile file, shared between walls
+_uniqueTiles = {}
+_successors = {}
+
+def _getUniqueTiles(tileFileLoc):
+    """ Returns the list of every unique tile in the given tile file.
+
+    _getUniqueTiles(string) -> list of Tiles
+
+    """
+    if tileFileLoc not in _uniqueTiles:
+        tileFile = IOHelper(tileFileLoc, DELIMITER, COMMENTIND)
+        tileInfo = tileFile.getAllRows()
+        _uniqueTiles[tileFileLoc] = [Tile(tileFile.concatInt(row[0], row[1]))
+            for row in tileInfo]
+    return _uniqueTiles[tileFileLoc]
+
+def _getSuccessors(tileFileLoc):
+    """ Returns the table of the next tile after each unique tile in the given
+    tile file, which is what a dora indicator of that tile makes dora.
+
+    _getSuccessors(string) -> list of Tiles
+
+    """
+    if tileFileLoc not in _successors:
+        _successors[tileFileLoc] = [tile.getNextTile(tileFileLoc)
+            for tile in _getUniqueTiles(tileFileLoc)]
+    return _successors[tileFileLoc]
 
 class Wall(object):
     """ Info structure class.
@@ -53,21 +87,33 @@ class Wall(object):
     The dead wall tiles are the last few tiles in the list.
     Every second tile is skipped over, for the most part.
     Goes clockwise in spite of players going anticlockwise, just to confuse you.
+
+    The tiles are kept as an array of bytes, each being the index of the tile
+    in the list of unique tiles, and are never taken out of it. Which tiles
+    have been drawn is worked out from where the wall was broken, how far it
+    has been drawn from and how many dora indicators are flipped, and drawn
+    tiles are given as None.
     
     """
 
-    def __init__(self, repeat, suitnum, tileFileLoc, loadData=False):
+    def __init__(self, repeat, suitnum, tileFileLoc, loadData=False,
+            rng=None, wallSeed=None, wallRecord=None):
         """ Create a new wall.
-        Constructor: Wall(int, int, string, string)
+        Constructor: Wall(int, int, string, object, Random, int, string)
 
         repeat is the amount of each individual tile there is in the game.
         suitnum is the amount of numbered suits there are.
         tileFileLoc is the location of the tile infomation file.
-        loadData is an optional file location string containing the data that
-        this wall should load.
+        loadData is an optional SnapshotReader containing the data that this
+        wall should load.
             (Note that if loadData exists, then there is no need to have the
              other values defined properly, as they will just be loaded from
-             this file)
+             this snapshot)
+        rng is an optional random.Random to pick the seed of this wall with.
+        wallSeed is an optional seed to shuffle this wall with, as given by
+        getWallSeed() of an earlier wall.
+        wallRecord is an optional string giving the order of every tile in
+        this wall, as given by getWallRecord() of an earlier wall.
         
         """
         if loadData:
@@ -81,65 +127,111 @@ class Wall(object):
             self._doraInd = []
             self._ura = []
             self._tileFileLoc = tileFileLoc
-            self.fillWall(tileFileLoc)
+            self.fillWall(tileFileLoc, rng, wallSeed, wallRecord)
+            self._clearDoraCache()
 
     def __getitem__(self, key):
-        return self._wall[key]
+        if self.indexIsDrawn(key):
+            return None
+        return self._uniwall[self._wall[key]]
 
-    def fillWall(self, tileFileLoc):
+    def __len__(self):
+        return len(self._wall)
+
+    def fillWall(self, tileFileLoc, rng=None, wallSeed=None, wallRecord=None):
         """ Loads up the initial tiles in the wall, using self._repeat of each
         defined tile.
+        The wall is shuffled using its own seed, so that it can be made again
+        later from just that seed. If wallRecord is given, the tiles are put
+        in that order instead.
     
-        fillWall(string) -> None
+        fillWall(string, Random, int, string) -> None
 
         tileFileLoc is the location of the tile infomation file.
+        rng is the random.Random to pick the seed with, if it isn't given. If
+        neither are given, the seed is picked with the random module.
+        wallSeed is the seed to shuffle the wall with.
+        wallRecord is a string giving the order of the tiles.
         
         """
-        tileFile = IOHelper(tileFileLoc, DELIMITER, COMMENTIND)
-        
-        tileInfo = tileFile.getAllRows()
-        temp = [Tile(tileFile.concatInt(row[0], row[1])) for row in tileInfo]
+        temp = _getUniqueTiles(tileFileLoc)
 
         self._uniwall = temp #used for tenpai checking
-        self._wall = self._repeat * temp
-        random.shuffle(self._wall)
-
-    def saveData(self, saveLocation):
-        """ Save all the variables for this Wall into saveLocation. """
-        wallFile = open(saveLocation, "w")
-        infoStore = []
-        infoStore.append('self._repeat')
-        infoStore.append('self._suitnum')
-        infoStore.append('self._deadStart')
-        infoStore.append('self._deadEnd')
-        infoStore.append('self._curPos')
-        infoStore.append('self._doraInd')
-        infoStore.append('self._ura')
-        infoStore.append('self._tileFileLoc')
-        infoStore.append('self._uniwall')
-        infoStore.append('self._wall')
-        for info in infoStore:
-            wallFile.write(self._getRunnableLine(info))
-            wallFile.write('\n')
-        wallFile.close()
-
-    def _getRunnableLine(self, varName):
-        """ As for _getRunnableLine in gameScreen.py. """
-        value = eval(varName)
-        value = repr(value)
-        return varName + ' = ' + value
-
-    def loadData(self, saveLocation):
-        """ Load all the variables for this Wall from saveLocation. """
-        wallFile = open(saveLocation, "rU")
-        for line in wallFile:
-            exec(line)
-        wallFile.close()
+        if wallRecord is not None:
+            self._wallSeed = None
+            self._wall = array('B')
+            for char in wallRecord:
+                tileIndex = WALLRECORDCHARS.find(char)
+                if not 0 <= tileIndex < len(temp):
+                    raise GameRunningException('Invalid wall record')
+                self._wall.append(tileIndex)
+            if len(self._wall) != self._repeat * len(temp):
+                raise GameRunningException('Invalid wall record')
+        else:
+            if wallSeed is None:
+                if rng is None:
+                    rng = random
+                wallSeed = rng.getrandbits(WALLSEEDBITS)
+            self._wallSeed = wallSeed
+            self._wall = self._repeat * array('B', range(len(temp)))
+            random.Random(wallSeed).shuffle(self._wall)
+
+    def saveData(self, writer):
+        """ Write all the variables for this Wall into the given
+        SnapshotWriter.
+
+        saveData(SnapshotWriter) -> None
+
+        """
+        writer.addInt(self._repeat)
+        writer.addInt(self._suitnum)
+        writer.addInt(self._deadStart)
+        writer.addInt(self._deadEnd)
+        writer.addInt(self._curPos)
+        writer.addInts(self._doraInd)
+        writer.addInts(self._ura)
+        writer.addString(self._tileFileLoc)
+        writer.addBytes(self._wall)
+        writer.addOptionalLong(self._wallSeed)
+
+    def loadData(self, reader):
+        """ Read all the variables for this Wall from the given
+        SnapshotReader, in the order saveData wrote them.
+
+        loadData(SnapshotReader) -> None
+
+        """
+        self._repeat = reader.getInt()
+        self._suitnum = reader.getInt()
+        self._deadStart = reader.getInt()
+        self._deadEnd = reader.getInt()
+        self._curPos = reader.getInt()
+        self._doraInd = reader.getInts()
+        self._ura = reader.getInts()
+        self._tileFileLoc = reader.getString()
+        self._wall = array('B', reader.getBytes())
+        self._wallSeed = reader.getOptionalLong()
+        self._uniwall = _getUniqueTiles(self._tileFileLoc)
+        self._clearDoraCache()
 
     def getUnique(self):
         """ Return all unique tiles. """
         return self._uniwall
 
+    def getWallSeed(self):
+        """ Returns the seed this wall was shuffled with, or None if it was
+        made from a wall record. """
+        return self._wallSeed
+
+    def getWallRecord(self):
+        """ Returns the starting order of the tiles in this wall, as a string
+        with one char per tile. Giving this to a new Wall makes the same wall.
+
+        getWallRecord() -> string
+
+        """
+        return ''.join([WALLRECORDCHARS[tileIndex] for tileIndex in self._wall])
+
     def setDealerBreak(self, diedist, breakdist):
         """ Given the distance that the dice roll around the wall, work out
         the start position for the break and the dead wall and get it ready
@@ -166,6 +258,66 @@ class Wall(object):
         doraIndPos = self._deadEnd - 6 - 2*len(self._doraInd)
         self._doraInd.append(doraIndPos)
         self._ura.append(doraIndPos+1)
+        self._clearDoraCache()
+
+    def _clearDoraCache(self):
+        """ Forgets the dora worked out so far, as the indicators changed. """
+        self._doraCache = None
+        self._uraCache = None
+        self._doraCounts = None
+        self._uraCounts = None
+
+    def _getDora(self, indicators):
+        """ Returns the dora given by the list of indicator indexes. """
+        successors = _getSuccessors(self._tileFileLoc)
+        return [successors[self._wall[index]] for index in indicators]
+
+    def _getCounts(self, doraList):
+        """ Returns how many times each dense tile index is in doraList. """
+        counts = [0]*TILETYPES
+        for tile in doraList:
+            if tile.getIndex() is not None:
+                counts[tile.getIndex()] += 1
+        return counts
+
+    def getDoraCounts(self):
+        """ Returns how many times each tile is dora, as a list indexed by the
+        dense tile index.
+
+        getDoraCounts() -> list of ints
+
+        """
+        if self._doraCounts is None:
+            self._doraCounts = self._getCounts(self.getDoraList())
+        return self._doraCounts
+
+    def getUraCounts(self):
+        """ Returns how many times each tile is ura dora, as a list indexed by
+        the dense tile index.
+
+        getUraCounts() -> list of ints
+
+        """
+        if self._uraCounts is None:
+            self._uraCounts = self._getCounts(self.getUraList())
+        return self._uraCounts
+
+    def countDora(self, tiles):
+        """ Returns the amount of dora in the given tiles, counting a tile once
+        for every indicator that makes it dora.
+
+        countDora(list of Tiles) -> int
+
+        """
+        counts = self.getDoraCounts()
+        return sum([counts[tile.getIndex()] for tile in tiles
+            if tile.getIndex() is not None])
+
+    def countUra(self, tiles):
+        """ As for countDora, but with ura dora. """
+        counts = self.getUraCounts()
+        return sum([counts[tile.getIndex()] for tile in tiles
+            if tile.getIndex() is not None])
 
     def deadWallDraw(self):
         """ Draws a tile from the dead wall, flipping up a new indicator and
@@ -183,13 +335,30 @@ class Wall(object):
             tileToDraw = self._deadEnd-3
         else:
             return False
-        tempTile = self._wall[tileToDraw]
-        self._wall[tileToDraw] = None
+        tempTile = self._uniwall[self._wall[tileToDraw]]
         self._deadStart -= 1
         if self._deadStart < 0:
             self._deadStart += len(self._wall)
         return tempTile
 
+    def indexIsDrawn(self, index):
+        """ Returns whether the tile at the given index has been drawn.
+
+        indexIsDrawn(int) -> Boolean
+
+        """
+        if not self._doraInd: #Nothing is drawn before the wall is broken
+            return False
+        wallLen = len(self._wall)
+        index %= wallLen
+        drawnNum = (self._curPos - self._deadEnd)%wallLen
+        if (index - self._deadEnd)%wallLen < drawnNum:
+            return True #Drawn from the live wall
+        for offset in DEADDRAWS[:len(self._doraInd) - 1]: #One per kan
+            if index == (self._deadEnd + offset)%wallLen:
+                return True
+        return False
+
     def indexIsDoraInd(self, index):
         """ Returns True if the given index is a dora indicator, False
         otherwise.
@@ -203,33 +372,39 @@ class Wall(object):
     #GETTER FUNCTIONS
     def getDoraList(self):
         """ Returns the list of actual dora. """
+        if self._doraCache is None:
+            self._doraCache = self._getDora(self._doraInd)
+        return list(self._doraCache)
+
+    def getDoraIndList(self):
+        """ Returns the list of dora indicators that have been flipped up. """
         temp = []
         for doraInd in self._doraInd:
-            doraIndTile = self._wall[doraInd]
-            temp.append(doraIndTile.getNextTile(self._tileFileLoc))
+            temp.append(self._uniwall[self._wall[doraInd]])
         return temp
 
     def getUraList(self):
         """ Returns the list of actual ura dora. """
-        temp = []
-        for doraInd in self._ura:
-            doraIndTile = self._wall[doraInd]
-            temp.append(doraIndTile.getNextTile(self._tileFileLoc))
-        return temp
+        if self._uraCache is None:
+            self._uraCache = self._getDora(self._ura)
+        return list(self._uraCache)
             
     def getWholeWall(self):
-        """ Returns all tiles in the wall.
+        """ Returns all tiles in the wall, with None for drawn tiles.
     
         getWholeWall() -> list
         
         """
-        return self._wall
+        return [self[index] for index in xrange(len(self._wall))]
 
     def getDeadWall(self):
         """ Returns the dead wall, accounting for the final corner. """
         if self._deadStart > self._deadEnd:
-            return self._wall[self._deadStart:] + self._wall[:self._deadEnd]
-        return self._wall[self._deadStart:self._deadEnd]
+            indexes = range(self._deadStart, len(self._wall))
+            indexes += range(self._deadEnd)
+        else:
+            indexes = range(self._deadStart, self._deadEnd)
+        return [self[index] for index in indexes]
 
     def getDeadStart(self):
         return self._deadStart
@@ -287,8 +462,7 @@ class Wall(object):
         drawFromWall() -> Tile
         
         """
-        tempTile = self._wall[self._curPos]
-        self._wall[self._curPos] = None
+        tempTile = self._uniwall[self._wall[self._curPos]]
         self._curPos += 1
         if self._curPos >= len(self._wall):
             self._curPos = 0
@@ -36,6 +36,7 @@ from selfio import *
 #Set default globals
 DELIMITER = ";"
 COMMENTIND = "#"
+_registries = {} #Every YakuRegistry made so far, by yaku file
 
 class Yaku(object):
     """ A general class used for yaku.
@@ -43,8 +44,19 @@ class Yaku(object):
     Stores info related to yaku for scoring, such as their han value,
     descriptions and otehr useful info.
 
+    Yaku are shared: each yaku file is only read once, into a YakuRegistry,
+    and Yaku(string, string) hands back that registry's Yaku every time. A
+    Yaku never changes once it has been made.
+
     """
-    
+    __slots__ = ('_yakuID', '_yakuFile', '_num', '_name', '_scoreClosed',
+        '_scoreOpen', '_soundFile', '_invalid', '_invalidYaku',
+        '_invalidMask', '_desc')
+
+    def __new__(cls, yakuID, yakuFile):
+        """ Returns the Yaku for the given ID from the given yakuFile. """
+        return getYakuRegistry(yakuFile).getYaku(yakuID)
+
     def __init__(self, yakuID, yakuFile):
         """ Creates a new yaku from the given yakuFile.
         Constructor: Yaku(string, string)
@@ -53,23 +65,37 @@ class Yaku(object):
         yakuFile is the location of said file.
         
         """
-        self._yakuID = yakuID
-        loadInfo = IOHelper(yakuFile, DELIMITER, COMMENTIND)
-        rowInfo = loadInfo.getRowByOneID(yakuID)
+        pass #Already set up by the registry
+
+    @classmethod
+    def _make(cls, yakuID, yakuFile, num, rowInfo):
+        """ Makes a brand new Yaku from a row of the yaku file, or an unknown
+        Yaku if rowInfo is False. Only meant to be used by YakuRegistry.
+
+        _make(string, string, int, list) -> Yaku
+        
+        """
+        yaku = object.__new__(cls)
+        yaku._yakuID = yakuID
+        yaku._yakuFile = yakuFile
+        yaku._num = num
+        yaku._soundFile = None
+        yaku._invalidYaku = ()
+        yaku._invalidMask = 0
         if rowInfo:
-            self._name = rowInfo[1]
-            self._scoreClosed = int(rowInfo[2])
-            self._scoreOpen = int(rowInfo[3])
-            self._desc = rowInfo[5]
+            yaku._name = rowInfo[1]
+            yaku._scoreClosed = int(rowInfo[2])
+            yaku._scoreOpen = int(rowInfo[3])
+            yaku._desc = rowInfo[5]
 
-            self._invalid = rowInfo[4].split(',') #these are separated by commas
+            yaku._invalid = tuple(rowInfo[4].split(',')) #separated by commas
         else:
-            self._name = "Unknown"
-            self._scoreOpen = None
-            self._scoreClosed = None
-            self._soundFile = None
-            self._invalid = None
-            self._desc = None
+            yaku._name = "Unknown"
+            yaku._scoreOpen = None
+            yaku._scoreClosed = None
+            yaku._invalid = None
+            yaku._desc = None
+        return yaku
             
     def __str__(self):
         return self._name
@@ -78,12 +104,32 @@ class Yaku(object):
         return "Yaku(" + self.__str__() + ")"
 
     def __eq__(self, other):
-        return (isinstance(other, self.__class__) and
+        return self is other or (isinstance(other, self.__class__) and
                 self._yakuID == other._yakuID)
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __hash__(self):
+        return hash(self._yakuID)
+
+    def __reduce__(self):
+        return (Yaku, (self._yakuID, self._yakuFile))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def getID(self):
+        return self._yakuID
+
+    def getNum(self):
+        """ The integer ID of this yaku; its position in the yaku file, or
+        None if the yaku isn't in the file. """
+        return self._num
+
     def getName(self):
         return self._name
 
@@ -97,7 +143,97 @@ class Yaku(object):
         return self._soundFile
 
     def getInvalid(self):
-        return self._invalid
+        if self._invalid is None:
+            return None
+        return list(self._invalid)
+
+    def getInvalidYaku(self):
+        """ A tuple of every Yaku in the file that this yaku invalidates. """
+        return self._invalidYaku
+
+    def getInvalidMask(self):
+        """ The yaku this yaku invalidates, as a bitmask of their integer
+        IDs. """
+        return self._invalidMask
 
     def getDesc(self):
         return self._desc
+
+
+class YakuRegistry(object):
+    """ Every yaku in a yaku file, read once and shared between everything
+    that uses them. Each yaku is given an integer ID, its position in the
+    file, and the yaku that each one invalidates are worked out up front.
+
+    """
+    def __init__(self, yakuFile):
+        """ Reads every yaku in the given yakuFile.
+        Constructor: YakuRegistry(string)
+        
+        """
+        self._yakuFile = yakuFile
+        self._yakuList = []
+        self._yakuByID = {}
+        loadInfo = IOHelper(yakuFile, DELIMITER, COMMENTIND)
+        for rowInfo in loadInfo.getAllRows():
+            if rowInfo[0] in self._yakuByID: #Earlier rows win
+                continue
+            yaku = Yaku._make(rowInfo[0], yakuFile, len(self._yakuList),
+                rowInfo)
+            self._yakuList.append(yaku)
+            self._yakuByID[rowInfo[0]] = yaku
+        self._yakuList = tuple(self._yakuList)
+
+        #Work out the invalidation graph now that every yaku exists
+        for yaku in self._yakuList:
+            invalidYaku = []
+            for invalidID in yaku._invalid:
+                if invalidID in self._yakuByID:
+                    invalidYaku.append(self._yakuByID[invalidID])
+            yaku._invalidYaku = tuple(invalidYaku)
+            for invalid in invalidYaku:
+                yaku._invalidMask |= 1 << invalid.getNum()
+
+    def __repr__(self):
+        return "YakuRegistry(" + self._yakuFile + ")"
+
+    def getYakuFile(self):
+        return self._yakuFile
+
+    def getYaku(self, yakuID):
+        """ Returns the Yaku with the given ID. Yaku not in the file are
+        unknown, and are made the first time they are asked for.
+
+        getYaku(string) -> Yaku
+        
+        """
+        yaku = self._yakuByID.get(yakuID)
+        if yaku is None:
+            yaku = Yaku._make(yakuID, self._yakuFile, None, False)
+            self._yakuByID[yakuID] = yaku
+        return yaku
+
+    def getYakuByNum(self, num):
+        """ Returns the Yaku with the given integer ID. """
+        return self._yakuList[num]
+
+    def getAllYaku(self):
+        """ Returns a tuple of every Yaku in the file, in order. """
+        return self._yakuList
+
+    def getYakuCount(self):
+        return len(self._yakuList)
+
+
+def getYakuRegistry(yakuFile):
+    """ Returns the YakuRegistry for the given yaku file, reading the file the
+    first time it is asked for.
+
+    getYakuRegistry(string) -> YakuRegistry
+    
+    """
+    registry = _registries.get(yakuFile)
+    if registry is None:
+        registry = YakuRegistry(yakuFile)
+        _registries[yakuFile] = registry
+    return registry
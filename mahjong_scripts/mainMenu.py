@@ -78,10 +78,14 @@ class MainMenu(MenuScreen):
 
     def buttLoadGame(self):
         """ If a save file exists, load the previous game, else popup an error.
+        A save in the old text format gets its own error, as it can't be
+        loaded.
 
         """
         if os.path.isfile(mahjongGlobals.SAVEGAMELOC):
             self.changeScreen('GameScreen', [True])
+        elif os.path.isfile(mahjongGlobals.OLDSAVEGAMELOC):
+            self.popupDialog("WindowOldSaveError")
         else:
             self.popupDialog("WindowNoSaveError")
 
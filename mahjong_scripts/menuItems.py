@@ -640,8 +640,17 @@ class MenuScreen(object):
         to this screen on creation.
 
         """
+        self.leaveScreen()
         self._master.changeScreen(screenTo, values)
 
+    def leaveScreen(self):
+        """ Tidies up before this screen stops being shown, either for
+        another screen or because the program is closing. Should be used by
+        subclasses that have anything left open.
+
+        """
+        pass
+
     def setVolumes(self, newVolumes):
         """ Sets the volumes in master to the 3-tuple of volumes given. """
         self._master.setButtonVolume(newVolumes[0])
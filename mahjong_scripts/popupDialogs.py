@@ -349,6 +349,47 @@ class WindowNoSaveError(Window):
         self._curScreen.destroyDialog()
 
 
+class WindowOldSaveError(Window):
+    """ Error window for attempting to load a save game made by an older
+    version, whose text save format can no longer be loaded. Has no other
+    functionality beyond being an error message.
+
+    """
+    def __init__(self, curRoot, curScreen):
+        """ Create a new WindowOldSaveError.
+        Constructor: WindowOldSaveError(Tk, MenuScreen)
+
+        curRoot refers to the root Tk class which should be running in the
+        background in this process.
+        curScreen refers to the MenuScreen that opened up this popup.
+
+        """
+        Window.__init__(self, curRoot, curScreen)
+        self._root.title("Error")
+        self._root.resizable(False, False)
+        Label(self._root, bg=CLR_MAINBG, fg=CLR_LABEL, font=FNT_TITLEFONT,
+            text="Old save format:").pack(side=TOP, anchor=W, pady=10)
+        Frame(self._root,height=1,bg=CLR_ENTRYHL).pack(side=TOP, fill=X,
+            padx=5, pady=5)
+        Label(self._root, bg=CLR_MAINBG, justify=LEFT,
+            text="The saved game was made by an older version of this game,\
+ and its save format\ncan no longer be loaded. Please start a new game and\
+ save it to replace it.").pack(side=TOP, anchor=W, padx=5)
+        Frame(self._root,height=1,bg=CLR_ENTRYHL).pack(side=TOP, fill=X,
+            padx=5, pady=5)
+        self._buttonframe = Frame(self._root, bg=CLR_MAINBG)
+        self._buttonframe.pack(side=TOP, fill=X, padx=5, pady=5)
+        buttResume = Button(self._buttonframe,text="Okay",bg=CLR_BUTTBG,
+            activebackground=CLR_BUTTPRESS,padx=8,
+            command=self._resumeGame)
+        buttResume.pack(side=RIGHT)
+
+    def _resumeGame(self):
+        """ Cancel and close this window. """
+        self._root.destroy()
+        self._curScreen.destroyDialog()
+
+
 class WindowVolume(Window):
     """ Volume changer window, which allows users to edit the volumes defined
     in the main game file.
@@ -229,6 +229,7 @@ class RiichiMahjongApp(object):
                 if event.type == VIDEORESIZE:
                     self.onResize(event)
                 if event.type == QUIT:
+                    self.curScreen.leaveScreen()
                     pygame.quit()
                     sys.exit()
             self.curScreen.update() #Update the current screen's logic
@@ -276,5 +277,6 @@ class RiichiMahjongApp(object):
 
     def onQuit(self):
         """ When quitting, be sure to exit all game elements cleanly. """
+        self.curScreen.leaveScreen()
         pygame.quit()
         sys.exit()
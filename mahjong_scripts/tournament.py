@@ -0,0 +1,313 @@
+################################################################################
+# Copyright (c) 2013, Sean Manson.
+# Part of CSSE1001 Major Project (Assignment 3).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met: 
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer. 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution. 
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" tournament.py:
+Command line tournament runner, which plays the AI players against each other
+using the GameEngine, with no screen and no waiting. Games are spread across a
+pool of processes, and each game is given its own seed, so any game can be
+played again exactly by giving the same seed.
+
+The result of every game is written to the output file as soon as it finishes,
+and a summary of how each AI did is printed at the end.
+
+Run from the root game directory, e.g:
+    python mahjong_scripts/tournament.py -n 1000 GeoffAI AttackAI DefendAI NoneAI
+
+"""
+
+#Import major libraries
+import sys
+import argparse
+import multiprocessing
+from cStringIO import StringIO
+
+#Import other mahjong modules
+import mahjongGlobals
+from gameEngine import *
+from gameRecord import *
+
+class GameRecorder(object):
+    """ Listens to a GameEngine, keeping track of each player's wins, deal-ins
+    and the points they won them with.
+
+    """
+    def __init__(self, engine):
+        """ Create a new GameRecorder, listening to the given engine.
+        Constructor: GameRecorder(GameEngine)
+
+        """
+        self._engine = engine
+        self._rounds = 0
+        self._wins = [0, 0, 0, 0]
+        self._dealIns = [0, 0, 0, 0]
+        self._winValues = [0, 0, 0, 0]
+        self._lastWinner = None
+        engine.addListener(self._gameEvent)
+
+    def _gameEvent(self, eventType, eventInfo):
+        """ Records the events we care about. """
+        if eventType == 'tsumo':
+            self._lastWinner = eventInfo
+        elif eventType == 'ron':
+            self._lastWinner = eventInfo[0]
+            self._dealIns[eventInfo[1]] += 1
+        elif eventType == 'roundend':
+            self._rounds += 1
+            if self._lastWinner is not None:
+                winner = self._engine.getPlayer(self._lastWinner)
+                self._wins[self._lastWinner] += 1
+                self._winValues[self._lastWinner] += winner.getScoreDiff()
+            self._lastWinner = None
+
+    def getRounds(self):
+        return self._rounds
+
+    def getWins(self, playerID):
+        return self._wins[playerID]
+
+    def getDealIns(self, playerID):
+        return self._dealIns[playerID]
+
+    def getWinValue(self, playerID):
+        """ Returns the total points the player gained from their wins. """
+        return self._winValues[playerID]
+
+def playGame(gameInfo):
+    """ Plays a single game between four AI, returning how each did.
+    The AI are seated in turn around the table from a starting seat which
+    changes each game, so that no AI always sits in the same place.
+
+    playGame(tuple) -> tuple
+
+    gameInfo is (gameNum, seed, aiNames, startingScore, isJustEastRound,
+    isRecording).
+
+    Returns (gameNum, seed, rounds, results, gameRecord), with results being a
+    list with a tuple for each entry in aiNames of:
+        (score, placement, wins, deal-ins, total win value)
+    and gameRecord being the game's record as a string if isRecording, or
+    None if not.
+
+    """
+    (gameNum, seed, aiNames, startingScore, isJustEastRound,
+        isRecording) = gameInfo
+    seating = [(gameNum + i)%4 for i in range(4)] #Entrant in each seat
+    playerNames = ['Player ' + str(entrant + 1) for entrant in seating]
+    engine = GameEngine(playerNames, [aiNames[entrant] for entrant in seating],
+        startingScore, isJustEastRound, seed=seed)
+    recorder = GameRecorder(engine)
+    if isRecording:
+        recordFile = StringIO()
+        GameRecordWriter(engine, recordFile)
+    engine.run()
+
+    #Highest score comes first, with ties going to the earlier seat
+    order = sorted(range(4), key=lambda seat: (
+        -engine.getPlayer(seat).getScore(), seat))
+    results = [None]*4
+    for seat, entrant in enumerate(seating):
+        results[entrant] = (engine.getPlayer(seat).getScore(),
+            order.index(seat) + 1, recorder.getWins(seat),
+            recorder.getDealIns(seat), recorder.getWinValue(seat))
+    gameRecord = None
+    if isRecording:
+        gameRecord = recordFile.getvalue()
+    return (gameNum, seed, recorder.getRounds(), results, gameRecord)
+
+class TournamentStats(object):
+    """ Keeps a running total of how each entrant of a tournament is doing. """
+    def __init__(self, aiNames):
+        """ Create a new TournamentStats for the given entrants.
+        Constructor: TournamentStats(list of strings)
+
+        """
+        self._aiNames = list(aiNames)
+        self._games = 0
+        self._rounds = 0
+        self._placements = [[0, 0, 0, 0] for name in aiNames]
+        self._scores = [0, 0, 0, 0]
+        self._wins = [0, 0, 0, 0]
+        self._dealIns = [0, 0, 0, 0]
+        self._winValues = [0, 0, 0, 0]
+
+    def addGame(self, gameResult):
+        """ Adds a finished game, as returned by playGame(). """
+        (gameNum, seed, rounds, results, gameRecord) = gameResult
+        self._games += 1
+        self._rounds += rounds
+        for entrant, result in enumerate(results):
+            (score, placement, wins, dealIns, winValue) = result
+            self._placements[entrant][placement - 1] += 1
+            self._scores[entrant] += score
+            self._wins[entrant] += wins
+            self._dealIns[entrant] += dealIns
+            self._winValues[entrant] += winValue
+
+    def getGames(self):
+        return self._games
+
+    def getSummary(self):
+        """ Returns a table of how each entrant did, as a string.
+
+        getSummary() -> string
+
+        """
+        games = max(self._games, 1)
+        rounds = max(self._rounds, 1)
+        lines = ['%d games, %d rounds' % (self._games, self._rounds)]
+        lines.append('%-3s %-12s %6s %23s %9s %7s %8s %9s' % ('', 'AI',
+            'Place', '1st/2nd/3rd/4th', 'Score', 'Win%', 'DealIn%',
+            'WinValue'))
+        for entrant, name in enumerate(self._aiNames):
+            placements = self._placements[entrant]
+            avgPlace = sum((i + 1)*num for i, num in enumerate(placements))
+            lines.append('%-3d %-12s %6.3f %23s %9.1f %6.2f%% %7.2f%% %9.1f'
+                % (entrant + 1, name, float(avgPlace)/games,
+                '/'.join(str(num) for num in placements),
+                float(self._scores[entrant])/games,
+                100.0*self._wins[entrant]/rounds,
+                100.0*self._dealIns[entrant]/rounds,
+                float(self._winValues[entrant])/max(self._wins[entrant], 1)))
+        return '\n'.join(lines)
+
+def getResultLine(gameResult):
+    """ Converts a finished game into a line for the output file.
+
+    getResultLine(tuple) -> string
+
+    """
+    (gameNum, seed, rounds, results, gameRecord) = gameResult
+    line = [gameNum, seed, rounds]
+    for result in results:
+        line += list(result)
+    return mahjongGlobals.DELIMITER.join(str(value) for value in line)
+
+def setupProcess(cacheSize):
+    """ Sets up a process to play games in, giving its shared HandCache
+    the given size if it isn't None.
+
+    setupProcess(int) -> None
+
+    """
+    if cacheSize is not None:
+        getHandCache().setMaxSize(cacheSize)
+
+def runTournament(aiNames, gameNum, outFile, seed=0, processes=None,
+        startingScore=25000, isJustEastRound=True, chunksize=8,
+        recordFile=None, cacheSize=None):
+    """ Plays gameNum games between the given AI, writing each game to outFile
+    as it finishes and returning the overall stats.
+
+    runTournament(list of strings, int, file, int, int, int, Boolean, int,
+        file, int) -> TournamentStats
+
+    aiNames is the four AI names from AILIST to play against each other.
+    outFile is an open file to write the game results to.
+    seed is the seed for the first game; each game after has the next seed.
+    processes is the number of processes to play games in, or None to use
+    every CPU. If 1, all games are played in this process.
+    recordFile is an open file to write the record of every game to, if any.
+    cacheSize is how many entries the HandCache of each process can hold, or
+    None to leave it at its default size.
+
+    """
+    for name in aiNames:
+        if name not in mahjongGlobals.AILIST:
+            raise GameRunningException('Unknown AI ' + repr(name))
+    stats = TournamentStats(aiNames)
+    games = [(i, seed + i, list(aiNames), startingScore, isJustEastRound,
+        recordFile is not None) for i in range(gameNum)]
+
+    outFile.write(mahjongGlobals.COMMENTIND + ' ' +
+        mahjongGlobals.DELIMITER.join(aiNames) + '\n')
+    outFile.write(mahjongGlobals.COMMENTIND + ' game;seed;rounds;' +
+        'then per AI: score;placement;wins;dealins;winvalue\n')
+    if processes == 1:
+        setupProcess(cacheSize)
+        pool = None
+        results = (playGame(game) for game in games)
+    else:
+        getSuitTable() #Build it once here, not once in every worker
+        pool = multiprocessing.Pool(processes, setupProcess, (cacheSize,))
+        results = pool.imap_unordered(playGame, games, chunksize)
+    try:
+        for gameResult in results:
+            stats.addGame(gameResult)
+            outFile.write(getResultLine(gameResult) + '\n')
+            outFile.flush()
+            if recordFile is not None:
+                recordFile.write(gameResult[-1])
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return stats
+
+def main(argv):
+    """ Runs a tournament using the given command line arguments.
+
+    main(list of strings) -> int
+
+    """
+    parser = argparse.ArgumentParser(description='Play the AI players ' +
+        'against each other with no screen.')
+    parser.add_argument('ai', nargs=4, choices=mahjongGlobals.AILIST,
+        help='the four AI to play against each other')
+    parser.add_argument('-n', '--games', type=int, default=100,
+        help='how many games to play (default 100)')
+    parser.add_argument('-s', '--seed', type=int, default=0,
+        help='seed of the first game; each game after uses the next seed')
+    parser.add_argument('-p', '--processes', type=int, default=None,
+        help='how many processes to play games in (default: one per CPU)')
+    parser.add_argument('-o', '--output', default='tournament.txt',
+        help='file to write each game result to (default tournament.txt)')
+    parser.add_argument('-r', '--records', default=None,
+        help='file to add the record of every game to (default: none)')
+    parser.add_argument('--score', type=int, default=25000,
+        help='starting score of each player (default 25000)')
+    parser.add_argument('--south', action='store_true',
+        help='play both East and South rounds, not just East')
+    parser.add_argument('--cachesize', type=int, default=None,
+        help='entries in the hand cache of each process (default ' +
+        str(DEFAULTCACHESIZE) + ')')
+    args = parser.parse_args(argv)
+
+    outFile = open(args.output, 'w')
+    recordFile = None
+    if args.records:
+        recordFile = open(args.records, 'ab')
+    try:
+        stats = runTournament(args.ai, args.games, outFile, args.seed,
+            args.processes, args.score, not args.south,
+            recordFile=recordFile, cacheSize=args.cachesize)
+    finally:
+        outFile.close()
+        if recordFile is not None:
+            recordFile.close()
+    print stats.getSummary()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))